@@ -10,6 +10,18 @@ class FieldMetrics(BaseModel):
     f1_score: float
 
 
+class LatencyMetrics(BaseModel):
+    """Upload size and latency of the predictions."""
+
+    mean_upload_kb: float
+    mean_encode_ms: float
+    median_latency_ms: float
+    p95_latency_ms: float
+    text_share: float = (
+        0  # Predictions made from the document text rather than its image
+    )
+
+
 class Metrics(BaseModel):
     """Overall and per-field evaluation metrics."""
 
@@ -17,3 +29,4 @@ class Metrics(BaseModel):
     overall_recall: float
     overall_f1_score: float
     field_metrics: list[FieldMetrics]
+    latency: LatencyMetrics | None = None  # If the parser measured its predictions
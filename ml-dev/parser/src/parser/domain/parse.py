@@ -1,4 +1,5 @@
 from datetime import datetime, date
+from enum import StrEnum
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, Field
@@ -26,7 +27,24 @@ class Annotation(BaseModel):
     data: ParsedData
 
 
+class InputType(StrEnum):
+    """What was sent to the model: the embedded text of the document, or its image."""
+
+    TEXT = "text"
+    IMAGE = "image"
+
+
+class ParseStats(BaseModel):
+    """Cost of a prediction: what was uploaded to the model and how long it took."""
+
+    upload_bytes: int
+    encode_ms: float
+    latency_ms: float  # End to end, encoding included
+
+
 class Prediction(BaseModel):
     id_: UUID = Field(default_factory=uuid4)
     model_name: str
     data: ParsedData
+    input_type: InputType = InputType.IMAGE
+    stats: ParseStats | None = None
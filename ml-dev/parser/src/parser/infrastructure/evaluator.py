@@ -1,9 +1,9 @@
 from difflib import SequenceMatcher
+import statistics
 
-
-from parser.domain.parse import Annotation, Prediction, ParsedData
+from parser.domain.parse import Annotation, InputType, Prediction, ParsedData
 from parser.service.ports.evaluator import IEvaluationService
-from parser.domain.metrics import Metrics, FieldMetrics
+from parser.domain.metrics import Metrics, FieldMetrics, LatencyMetrics
 
 
 class Evaluator(IEvaluationService):
@@ -74,6 +74,30 @@ class Evaluator(IEvaluationService):
             f1_score=f1_score,
         )
 
+    @staticmethod
+    def _calculate_latency_metrics(
+        predictions: list[Prediction],
+    ) -> LatencyMetrics | None:
+        """Aggregate the parse stats, if every prediction has them."""
+        stats = [prediction.stats for prediction in predictions if prediction.stats]
+        if not stats or len(stats) < len(predictions):
+            return None
+        latencies = [stat.latency_ms for stat in stats]
+        return LatencyMetrics(
+            mean_upload_kb=statistics.mean(stat.upload_bytes for stat in stats) / 1024,
+            mean_encode_ms=statistics.mean(stat.encode_ms for stat in stats),
+            median_latency_ms=statistics.median(latencies),
+            p95_latency_ms=(
+                statistics.quantiles(latencies, n=20)[-1]
+                if len(latencies) > 1
+                else latencies[0]
+            ),
+            text_share=sum(
+                prediction.input_type == InputType.TEXT for prediction in predictions
+            )
+            / len(predictions),
+        )
+
     @classmethod
     def evaluate_parser(
         cls, annotations: list[Annotation], predictions: list[Prediction]
@@ -100,4 +124,5 @@ class Evaluator(IEvaluationService):
             overall_recall=overall_recall,
             overall_f1_score=overall_f1,
             field_metrics=field_metrics,
+            latency=cls._calculate_latency_metrics(predictions),
         )
@@ -0,0 +1,39 @@
+from io import BytesIO
+
+from PIL import Image
+from pydantic import BaseModel
+
+
+LOSSY_FORMATS = ("JPEG", "WEBP")
+
+
+class ImageEncoding(BaseModel, frozen=True):
+    """How a document image is encoded before being uploaded to the model.
+    Mirrors the image settings of the ML server."""
+
+    max_dimension: int | None = None  # Longest side in pixels
+    grayscale: bool = False
+    format: str = "PNG"  # PNG, JPEG or WEBP
+    quality: int = 85  # JPEG and WEBP only
+
+    @property
+    def mime_type(self) -> str:
+        return f"image/{self.format.lower()}"
+
+
+DEFAULT_ENCODING = ImageEncoding()
+
+
+def encode_image(image: Image.Image, encoding: ImageEncoding) -> bytes:
+    if encoding.max_dimension and max(image.size) > encoding.max_dimension:
+        image = image.copy()
+        image.thumbnail(
+            (encoding.max_dimension, encoding.max_dimension), Image.Resampling.LANCZOS
+        )
+    image = image.convert("L" if encoding.grayscale else "RGB")
+    buf = BytesIO()
+    if encoding.format in LOSSY_FORMATS:
+        image.save(buf, format=encoding.format, quality=encoding.quality)
+    else:
+        image.save(buf, format=encoding.format)
+    return buf.getvalue()
@@ -1,18 +1,22 @@
 from datetime import datetime
-import io
+import time
 from PIL import Image
 
 from google import genai
 from google.genai import types
 import tqdm
 
-from parser.domain.parse import Prediction, ParsedData
+from parser.domain.parse import InputType, Prediction, ParsedData, ParseStats
+from parser.infrastructure.image import DEFAULT_ENCODING, ImageEncoding, encode_image
 from parser.infrastructure.schemas.parser import ParsedInvoice
+from parser.infrastructure.text_layer import has_text_layer
 from parser.service.ports.parser import IParser
 
 
 class MockParser(IParser):
-    def parse(self, images: list[Image.Image]) -> list[Prediction]:
+    def parse(
+        self, images: list[Image.Image], texts: list[str | None] | None = None
+    ) -> list[Prediction]:
         return [
             Prediction(
                 model_name="mock",
@@ -34,42 +38,73 @@ class MockParser(IParser):
 
 
 class GeminiParser(IParser):
-    def __init__(self, api_key: str, model_name: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        model_name: str,
+        image_encoding: ImageEncoding = DEFAULT_ENCODING,
+        text_layer_min_chars: int | None = None,
+    ) -> None:
+        """When `text_layer_min_chars` is set, documents whose embedded text holds at
+        least as many characters are parsed from the text, as on the ML server."""
         self.api_key = api_key
         self.client = genai.Client(api_key=self.api_key)
         self.model_name = model_name
+        self.image_encoding = image_encoding
+        self.text_layer_min_chars = text_layer_min_chars
         self.instructions = """You are an invoice parser.
         Given an image of an invoice, extract the relevant fields and return them in a structured JSON format as specified.
         """
+        self.text_instructions = """You are an invoice parser.
+        Given the text of an invoice, laid out as on the page, extract the relevant fields and return them in a structured JSON format as specified.
+        """
 
-    def parse(self, images: list[Image.Image]) -> list[Prediction]:
+    def parse(
+        self, images: list[Image.Image], texts: list[str | None] | None = None
+    ) -> list[Prediction]:
         predictions = []
-        for image in tqdm.tqdm(
-            images,
+        for image, text in tqdm.tqdm(
+            zip(images, texts or [None] * len(images), strict=True),
             desc="Parsing images with Gemini",
             total=len(images),
         ):
-            buf = io.BytesIO()
-            image.save(buf, format="PNG")
-            img_bytes = buf.getvalue()
-
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=[
+            start = time.perf_counter()
+            if (
+                text is not None
+                and self.text_layer_min_chars is not None
+                and has_text_layer(text, min_chars=self.text_layer_min_chars)
+            ):
+                input_type = InputType.TEXT
+                payload = text.encode()
+                contents = [text, self.text_instructions]
+            else:
+                input_type = InputType.IMAGE
+                payload = encode_image(image, encoding=self.image_encoding)
+                contents = [
                     types.Part.from_bytes(
-                        data=img_bytes,
-                        mime_type="image/png",
+                        data=payload,
+                        mime_type=self.image_encoding.mime_type,
                     ),
                     self.instructions,
-                ],
+                ]
+            encode_ms = (time.perf_counter() - start) * 1000
+
+            response = self.client.models.generate_content(
+                model=self.model_name,
+                contents=contents,
                 config={
                     "response_mime_type": "application/json",
                     "response_schema": ParsedInvoice.model_json_schema(),
                 },
             )
-            predictions.append(
-                ParsedInvoice.model_validate(response.parsed).to_prediction(
-                    model_name=self.model_name
-                )
+            prediction = ParsedInvoice.model_validate(response.parsed).to_prediction(
+                model_name=self.model_name
+            )
+            prediction.input_type = input_type
+            prediction.stats = ParseStats(
+                upload_bytes=len(payload),
+                encode_ms=encode_ms,
+                latency_ms=(time.perf_counter() - start) * 1000,
             )
+            predictions.append(prediction)
         return predictions
@@ -1,6 +1,6 @@
 from io import BytesIO
 import json
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 
 from PIL import Image
 import boto3
@@ -9,6 +9,7 @@ import tqdm
 
 from parser.domain.parse import Annotation, Prediction
 from parser.infrastructure.schemas.storage import AnnotationStorageSchema
+from parser.infrastructure.text_layer import extract_text
 from parser.service.ports.storage import IStorageService
 
 
@@ -35,6 +36,12 @@ class LocalStorageService(IStorageService):
         with open(image_uri, "rb") as f:
             return Image.open(f)
 
+    def get_document_text(self, image_uri: str) -> str | None:
+        pdf_path = Path(image_uri).with_suffix(".pdf")
+        if not pdf_path.exists():
+            return None
+        return extract_text(pdf_path.read_bytes())
+
     def save_predictions(
         self,
         evaluation_uri: str,
@@ -85,6 +92,17 @@ class S3StorageService(IStorageService):
         )["Body"].read()
         return Image.open(BytesIO(img_data))
 
+    def get_document_text(self, image_uri: str) -> str | None:
+        key = PurePosixPath(self._get_key_from_s3_uri(image_uri)).with_suffix(".pdf")
+        try:
+            pdf_data = self.client.get_object(
+                Bucket=self.bucket_name,
+                Key=str(key),
+            )["Body"].read()
+        except self.client.exceptions.NoSuchKey:
+            return None
+        return extract_text(pdf_data)
+
     def _get_key_from_s3_uri(self, s3_uri: str) -> str:
         # Assuming s3_uri is in the format 's3://bucket_name/key'
         return s3_uri.split(self.bucket_name + "/")[-1]
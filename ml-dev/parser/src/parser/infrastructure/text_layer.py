@@ -0,0 +1,18 @@
+import subprocess
+
+
+def extract_text(pdf_bytes: bytes) -> str:
+    """Embedded text of the first page of the PDF, laid out as on the page, as sent by
+    the ML server. Empty for scanned documents. Requires poppler's `pdftotext`."""
+    result = subprocess.run(
+        ["pdftotext", "-layout", "-enc", "UTF-8", "-f", "1", "-l", "1", "-", "-"],
+        input=pdf_bytes,
+        capture_output=True,
+        check=True,
+    )
+    return result.stdout.decode("utf-8", errors="replace")
+
+
+def has_text_layer(text: str, min_chars: int) -> bool:
+    """Whether the text holds at least `min_chars` visible characters."""
+    return len("".join(text.split())) >= min_chars
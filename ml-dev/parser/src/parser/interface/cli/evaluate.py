@@ -1,5 +1,7 @@
 from typer import Typer
 
+from parser.domain.metrics import Metrics
+from parser.infrastructure.image import ImageEncoding
 from parser.service.evaluate import EvaluationService
 from parser.settings import get_settings
 from parser.interface import dependencies
@@ -10,14 +12,93 @@ app = Typer()
 
 
 @app.command()
-def evaluate(model: dependencies.EvaluationModel) -> None:
+def evaluate(
+    model: dependencies.EvaluationModel,
+    max_dimension: int | None = None,
+    grayscale: bool = False,
+    image_format: str = "PNG",
+    quality: int = 85,
+    text_layer: bool = False,
+) -> None:
     metrics = EvaluationService.evaluate_model(
         evaluation_uri=settings.evaluation_uri,
         dataset_uri=settings.benchmark.benchmark_dataset_s3_path,
-        parser=dependencies.get_parser(model=model),
+        parser=dependencies.get_parser(
+            model=model,
+            image_encoding=ImageEncoding(
+                max_dimension=max_dimension,
+                grayscale=grayscale,
+                format=image_format.upper(),
+                quality=quality,
+            ),
+            use_text_layer=text_layer,
+        ),
         storage_service=dependencies.get_storage_service(
             s3_bucket_name=settings.s3_bucket_name
         ),
         evaluation_service=dependencies.get_evaluation_service(),
+        load_text_layer=text_layer,
     )
     print("Metrics: ", metrics.model_dump())
+
+
+@app.command("compare-images")
+def compare_images(
+    model: dependencies.EvaluationModel = dependencies.EvaluationModel.GEMINI_2_5_FLASH,
+    encodings: list[str] | None = None,
+) -> None:
+    """Compare the image settings on accuracy, upload size and latency. All the settings
+    of `dependencies.IMAGE_ENCODINGS` are compared by default."""
+    encodings = encodings or list(dependencies.IMAGE_ENCODINGS)
+    metrics = EvaluationService.compare_models(
+        dataset_uri=settings.benchmark.benchmark_dataset_s3_path,
+        parsers={
+            name: dependencies.get_parser(
+                model=model, image_encoding=dependencies.IMAGE_ENCODINGS[name]
+            )
+            for name in encodings
+        },
+        storage_service=dependencies.get_storage_service(
+            s3_bucket_name=settings.s3_bucket_name
+        ),
+        evaluation_service=dependencies.get_evaluation_service(),
+    )
+    print_comparison(metrics)
+
+
+@app.command("compare-inputs")
+def compare_inputs(
+    model: dependencies.EvaluationModel = dependencies.EvaluationModel.GEMINI_2_5_FLASH,
+) -> None:
+    """Compare parsing the documents from their embedded text with parsing them from
+    their image, on the documents having a source PDF with a text layer."""
+    metrics = EvaluationService.compare_models(
+        dataset_uri=settings.benchmark.benchmark_dataset_s3_path,
+        parsers={
+            "image": dependencies.get_parser(model=model),
+            "text": dependencies.get_parser(model=model, use_text_layer=True),
+        },
+        storage_service=dependencies.get_storage_service(
+            s3_bucket_name=settings.s3_bucket_name
+        ),
+        evaluation_service=dependencies.get_evaluation_service(),
+        text_layer_only=True,
+    )
+    print_comparison(metrics)
+
+
+def print_comparison(metrics: dict[str, Metrics]) -> None:
+    print("| Setting | F1 Score | Upload (kB) | Encode (ms) | p50 | p95 | Text |")
+    print("|---------|----------|-------------|-------------|-----|-----|------|")
+    for name, setting_metrics in metrics.items():
+        latency = setting_metrics.latency
+        if latency is None:
+            f1_score = setting_metrics.overall_f1_score
+            print(f"| {name} | {f1_score:.4f} | - | - | - | - | - |")
+            continue
+        print(
+            f"| {name} | {setting_metrics.overall_f1_score:.4f} "
+            f"| {latency.mean_upload_kb:.0f} | {latency.mean_encode_ms:.1f} "
+            f"| {latency.median_latency_ms:.0f} | {latency.p95_latency_ms:.0f} "
+            f"| {latency.text_share:.0%} |"
+        )
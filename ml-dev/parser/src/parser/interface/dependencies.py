@@ -2,6 +2,7 @@ from enum import Enum
 
 from parser.infrastructure.annotation import LabelStudioAnnotator
 from parser.infrastructure.evaluator import Evaluator
+from parser.infrastructure.image import DEFAULT_ENCODING, ImageEncoding
 from parser.infrastructure.parser import GeminiParser, MockParser
 from parser.infrastructure.storage import S3StorageService
 from parser.service.ports.annotation import IAnnotator
@@ -37,11 +38,30 @@ def get_storage_service(s3_bucket_name: str) -> IStorageService:
     )
 
 
-def get_parser(model: EvaluationModel) -> IParser:
+# Image settings compared by `parser-cli eval compare-images`
+IMAGE_ENCODINGS = {
+    "png": ImageEncoding(),
+    "png-gray": ImageEncoding(grayscale=True),
+    "jpeg-85": ImageEncoding(format="JPEG", quality=85),
+    "jpeg-85-gray": ImageEncoding(format="JPEG", quality=85, grayscale=True),
+    "jpeg-75-1024": ImageEncoding(format="JPEG", quality=75, max_dimension=1024),
+    "webp-80": ImageEncoding(format="WEBP", quality=80),
+}
+
+
+def get_parser(
+    model: EvaluationModel,
+    image_encoding: ImageEncoding = DEFAULT_ENCODING,
+    use_text_layer: bool = False,
+) -> IParser:
     if model == EvaluationModel.GEMINI_2_5_FLASH:
         return GeminiParser(
             api_key=settings.gemini_api_key,
             model_name=settings.model_name,
+            image_encoding=image_encoding,
+            text_layer_min_chars=settings.text_layer_min_chars
+            if use_text_layer
+            else None,
         )
     elif model == EvaluationModel.MOCK:
         return MockParser()
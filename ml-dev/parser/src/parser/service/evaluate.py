@@ -1,4 +1,7 @@
+from PIL import Image
+
 from parser.domain.metrics import Metrics
+from parser.domain.parse import Annotation
 from parser.service.ports.evaluator import IEvaluationService
 from parser.service.ports.parser import IParser
 from parser.service.ports.storage import IStorageService
@@ -12,18 +15,17 @@ class EvaluationService:
         parser: IParser,
         storage_service: IStorageService,
         evaluation_service: IEvaluationService,
+        load_text_layer: bool = False,
     ) -> Metrics:
-        print(f"Loading annotated data from {dataset_uri}...")
-        annotations = storage_service.load_dataset(dataset_uri=dataset_uri)
-        print(f"Loaded {len(annotations)} annotations.")
-        print("Loading document images from storage...")
-        images = [
-            storage_service.get_document_image(image_uri=annotation.image_uri)
-            for annotation in annotations
-        ]
-        print(f"Loaded {len(images)} document images.")
+        """If `load_text_layer`, the embedded text of the documents having one is passed
+        to the parser along with their image."""
+        annotations, images, texts = EvaluationService._load_benchmark(
+            dataset_uri=dataset_uri,
+            storage_service=storage_service,
+            load_text_layer=load_text_layer,
+        )
         print("Parsing document images with parser...")
-        predictions = parser.parse(images=images)
+        predictions = parser.parse(images=images, texts=texts)
         print(f"Parsed {len(predictions)} documents.")
         print("Evaluating parser predictions...")
         metrics = evaluation_service.evaluate_parser(
@@ -37,3 +39,59 @@ class EvaluationService:
         )
         print("Evaluation complete.")
         return metrics
+
+    @staticmethod
+    def compare_models(
+        dataset_uri: str,
+        parsers: dict[str, IParser],
+        storage_service: IStorageService,
+        evaluation_service: IEvaluationService,
+        text_layer_only: bool = False,
+    ) -> dict[str, Metrics]:
+        """Evaluate each parser on the same benchmark, loaded once, e.g. to weigh the
+        accuracy of parser settings against their latency.
+        If `text_layer_only`, only the documents with an embedded text are evaluated,
+        their text being passed to the parsers along with their image."""
+        annotations, images, texts = EvaluationService._load_benchmark(
+            dataset_uri=dataset_uri,
+            storage_service=storage_service,
+            load_text_layer=text_layer_only,
+        )
+        if text_layer_only and texts:
+            kept = [i for i, text in enumerate(texts) if text and text.strip()]
+            annotations = [annotations[i] for i in kept]
+            images = [images[i] for i in kept]
+            texts = [texts[i] for i in kept]
+            print(f"Kept {len(kept)} documents with a text layer.")
+        metrics = {}
+        for name, parser in parsers.items():
+            print(f"Parsing document images with parser {name}...")
+            predictions = parser.parse(images=images, texts=texts)
+            metrics[name] = evaluation_service.evaluate_parser(
+                annotations=annotations, predictions=predictions
+            )
+        print("Comparison complete.")
+        return metrics
+
+    @staticmethod
+    def _load_benchmark(
+        dataset_uri: str, storage_service: IStorageService, load_text_layer: bool
+    ) -> tuple[list[Annotation], list[Image.Image], list[str | None] | None]:
+        print(f"Loading annotated data from {dataset_uri}...")
+        annotations = storage_service.load_dataset(dataset_uri=dataset_uri)
+        print(f"Loaded {len(annotations)} annotations.")
+        print("Loading document images from storage...")
+        images = [
+            storage_service.get_document_image(image_uri=annotation.image_uri)
+            for annotation in annotations
+        ]
+        print(f"Loaded {len(images)} document images.")
+        if not load_text_layer:
+            return annotations, images, None
+        print("Loading document texts from storage...")
+        texts = [
+            storage_service.get_document_text(image_uri=annotation.image_uri)
+            for annotation in annotations
+        ]
+        print(f"Loaded {sum(text is not None for text in texts)} document texts.")
+        return annotations, images, texts
@@ -6,5 +6,9 @@ from parser.domain.parse import Prediction
 
 class IParser(ABC):
     @abstractmethod
-    def parse(self, images: list[Image.Image]) -> list[Prediction]:
+    def parse(
+        self, images: list[Image.Image], texts: list[str | None] | None = None
+    ) -> list[Prediction]:
+        """Parse the document images. `texts` holds the embedded text of the documents
+        having one, which parsers may use instead of the image."""
         raise NotImplementedError
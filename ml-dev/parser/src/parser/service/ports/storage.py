@@ -19,6 +19,12 @@ class IStorageService(ABC):
     def get_document_image(self, image_uri: str):
         raise NotImplementedError
 
+    @abstractmethod
+    def get_document_text(self, image_uri: str) -> str | None:
+        """Embedded text of the source PDF of the document, stored next to its image
+        with the `.pdf` extension. None if the document has no such PDF."""
+        raise NotImplementedError
+
     @abstractmethod
     def save_predictions(
         self,
@@ -40,6 +40,8 @@ class Settings(BaseSettings):
     # Gemini
     gemini_api_key: str = ""
     model_name: str = "gemini-2.5-flash"
+    # Same threshold as the ML server to parse documents from their embedded text
+    text_layer_min_chars: int = 100
 
     @property
     def evaluation_uri(self) -> str:
@@ -1,7 +1,13 @@
 from datetime import datetime
 
 import pytest
-from parser.domain.parse import Annotation, ParsedData, Prediction
+from parser.domain.parse import (
+    Annotation,
+    InputType,
+    ParsedData,
+    ParseStats,
+    Prediction,
+)
 from parser.infrastructure.evaluator import Evaluator
 
 
@@ -150,3 +156,32 @@ def test_compare_strings():
     assert Evaluator._calculate_str("Paris", "Paric")
     assert Evaluator._calculate_str("Bourges", "Bourgef")
     assert not Evaluator._calculate_str("New York", "Naw Fork")
+
+
+def test_latency_metrics():
+    measured_predictions = [
+        prediction.model_copy(
+            update={
+                "stats": ParseStats(
+                    upload_bytes=1024 * (i + 1), encode_ms=2, latency_ms=100 * (i + 1)
+                ),
+                "input_type": InputType.TEXT if i == 0 else InputType.IMAGE,
+            }
+        )
+        for i, prediction in enumerate(predictions)
+    ]
+    metrics = Evaluator.evaluate_parser(
+        annotations=annotations, predictions=measured_predictions
+    )
+    assert metrics.latency
+    assert metrics.latency.mean_upload_kb == pytest.approx(2)
+    assert metrics.latency.mean_encode_ms == pytest.approx(2)
+    assert metrics.latency.median_latency_ms == pytest.approx(200)
+    assert metrics.latency.p95_latency_ms >= 200
+    assert metrics.latency.text_share == pytest.approx(1 / 3)
+
+    # Not every prediction measured
+    metrics = Evaluator.evaluate_parser(
+        annotations=annotations, predictions=measured_predictions[:2] + predictions[2:]
+    )
+    assert metrics.latency is None
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from datetime import date
 from enum import StrEnum
+from typing import BinaryIO
 
 
 class Currency(StrEnum):
@@ -37,7 +38,33 @@ class ParsedData:
     client: ParsedClientData
 
 
+class InputType(StrEnum):
+    """What was sent to the model: the embedded text of the document, or images of its
+    pages."""
+
+    TEXT = "text"
+    IMAGE = "image"
+
+
 @dataclass
 class ParserPrediction:
     model_name: str
     data: ParsedData
+    input_type: InputType = InputType.IMAGE
+
+
+@dataclass
+class Document:
+    filename: str
+    file: BinaryIO
+    content_type: str
+
+
+@dataclass
+class BatchItemResult:
+    """Outcome of one document of a batch: its prediction, or the error that prevented it."""
+
+    filename: str
+    status_code: int
+    prediction: ParserPrediction | None = None
+    error: str | None = None
@@ -0,0 +1,38 @@
+from dataclasses import dataclass
+from io import BytesIO
+
+from PIL import Image
+
+LOSSY_FORMATS = ("JPEG", "WEBP")
+
+
+@dataclass(frozen=True)
+class ImageEncoding:
+    """How a rendered page is encoded before being uploaded to the model."""
+
+    max_dimension: int | None = None  # Longest side in pixels, larger pages are downscaled
+    grayscale: bool = False
+    format: str = "PNG"  # PNG, JPEG or WEBP
+    quality: int = 85  # JPEG and WEBP only
+
+    @property
+    def mime_type(self) -> str:
+        return f"image/{self.format.lower()}"
+
+
+DEFAULT_ENCODING = ImageEncoding()
+
+
+def encode_image(image: Image.Image, encoding: ImageEncoding) -> bytes:
+    if encoding.max_dimension and max(image.size) > encoding.max_dimension:
+        image = image.copy()
+        image.thumbnail((encoding.max_dimension, encoding.max_dimension), Image.Resampling.LANCZOS)
+    # JPEG has no alpha channel nor palette
+    image = image.convert("L" if encoding.grayscale else "RGB")
+    with BytesIO() as buffered:
+        if encoding.format in LOSSY_FORMATS:
+            image.save(buffered, format=encoding.format, quality=encoding.quality)
+        else:
+            # No `optimize`: it triples the encoding time for a few percent of the size
+            image.save(buffered, format=encoding.format)
+        return buffered.getvalue()
@@ -1,20 +1,29 @@
-import base64
+import asyncio
+import hashlib
+import random
+import time
+from concurrent.futures import Executor, Future
 from datetime import date
+from functools import partial
 from io import BytesIO
-from typing import BinaryIO
+from threading import Lock
+from typing import Any, BinaryIO
 
 import pdf2image
 from google import genai
-from google.genai import types
+from google.genai import errors, types
 
-from ml_server.domain.parser import Currency, ParserPrediction
+from ml_server.domain.parser import Currency, InputType, ParserPrediction
+from ml_server.infrastructure.image import DEFAULT_ENCODING, ImageEncoding, encode_image
+from ml_server.infrastructure.rate_limiter import TokenBucketRateLimiter
 from ml_server.infrastructure.schemas.parser import (
     ParsedClientDataSchema,
     ParsedDataSchema,
     ParsedInvoiceDataSchema,
 )
-from ml_server.services.exceptions import ParserException
-from ml_server.services.ports.parser import IParser
+from ml_server.infrastructure.text_layer import extract_text, has_text_layer
+from ml_server.services.exceptions import ParserException, ServiceUnavailableException
+from ml_server.services.ports.parser import IAsyncParser, IParser
 from ml_server.utils.logger import get_logger
 
 LOGGER = get_logger()
@@ -52,48 +61,257 @@ If a feature is missing, or if you're not certain, set it to null.
 """
 
 
-class GeminiParser(IParser):
-    def __init__(self, api_key: str, model_name: str) -> None:
-        self.client = genai.Client(api_key=api_key)
+# Generated once: building the JSON schema takes milliseconds of CPU per request
+RESPONSE_SCHEMA = ParsedDataSchema.model_json_schema()
+# Quota exceeded or model overloaded
+RETRIED_STATUS_CODES = (429, 503)
+
+
+class BaseGeminiParser:
+    def __init__(
+        self,
+        client: genai.Client,
+        model_name: str,
+        dpi: int = 200,
+        first_page: int = 1,
+        last_page: int | None = 1,
+        image_encoding: ImageEncoding = DEFAULT_ENCODING,
+        text_layer_min_chars: int | None = None,
+        executor: Executor | None = None,
+        rate_limiter: TokenBucketRateLimiter | None = None,
+        tokens_per_request: int = 2000,
+        max_retries: int = 0,
+        retry_backoff: float = 1.0,
+    ) -> None:
+        """Pages from `first_page` to `last_page` (to the end if None) are rasterized at `dpi`,
+        then encoded with `image_encoding`. When `text_layer_min_chars` is set, documents whose
+        embedded text holds at least as many characters are sent as text instead: no page is
+        rendered, and the upload is a fraction of the images. Scanned documents still go
+        through the images.
+        Rasterization runs in `executor` if any, e.g. a process pool, to keep it off the
+        server threads.
+        The client, and therefore its connections to the model endpoint, is meant to be shared
+        across requests, see the app lifespan.
+        Model calls reserve `tokens_per_request` from the rate limiter, if any, and are retried
+        up to `max_retries` times when the model answers 429 or 503."""
+        self.client = client
         self.model_name = model_name
+        self.dpi = dpi
+        self.first_page = first_page
+        self.last_page = last_page
+        self.image_encoding = image_encoding
+        self.text_layer_min_chars = text_layer_min_chars
+        self.executor = executor
+        self.rate_limiter = rate_limiter
+        self.tokens_per_request = tokens_per_request
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
         self.instructions = """You are an invoice parser.
         Given an image of an invoice, extract the relevant fields and return them in a 
         structured JSON format as specified.
         """
+        self.text_instructions = """You are an invoice parser.
+        Given the text of an invoice, laid out as on the page, extract the relevant fields and
+        return them in a structured JSON format as specified.
+        """
 
-    @staticmethod
-    def _process_file(file: BinaryIO) -> str:
-        try:
-            pdf_bytes = file.read()
-
-            # Convert first page of PDF to image with explicit parameters
-            images = pdf2image.convert_from_bytes(pdf_bytes)
-
-            # Convert first page image to base64 string
-            with BytesIO() as buffered:
-                images[0].save(buffered, format="PNG", optimize=True)
-                str_img = base64.b64encode(buffered.getvalue()).decode("utf-8")
-            return str_img
-
-        except Exception as e:
-            raise ParserException(f"Failed to process PDF file: {str(e)}") from e
-
-    def parse(self, file: BinaryIO) -> ParserPrediction:
-        str_img = self._process_file(file)
-        response = self.client.models.generate_content(
-            model=self.model_name,
-            contents=[
-                types.Part.from_bytes(
-                    data=base64.b64decode(str_img),
-                    mime_type="image/png",
+    def _request(self, content: str | list[bytes]) -> dict[str, Any]:
+        """Request for the document text, or for the images of its pages."""
+        if isinstance(content, str):
+            contents = [content, self.text_instructions]
+        else:
+            contents = [
+                *(
+                    types.Part.from_bytes(data=image, mime_type=self.image_encoding.mime_type)
+                    for image in content
                 ),
                 self.instructions,
-            ],
-            config={
+            ]
+        return {
+            "model": self.model_name,
+            "contents": contents,
+            "config": {
                 "response_mime_type": "application/json",
-                "response_schema": ParsedDataSchema.model_json_schema(),
+                "response_schema": RESPONSE_SCHEMA,
             },
+        }
+
+    def _prepare_args(self) -> tuple[int, int, int | None, ImageEncoding, int | None]:
+        return (
+            self.dpi,
+            self.first_page,
+            self.last_page,
+            self.image_encoding,
+            self.text_layer_min_chars,
         )
+
+    def _to_prediction(
+        self, response: types.GenerateContentResponse, content: str | list[bytes]
+    ) -> ParserPrediction:
+        input_type = InputType.TEXT if isinstance(content, str) else InputType.IMAGE
         return ParsedDataSchema.model_validate(response.parsed).to_prediction(
-            model_name=self.model_name
+            model_name=self.model_name, input_type=input_type
+        )
+
+    def _record_usage(self, response: types.GenerateContentResponse) -> None:
+        """Correct the tokens reserved for the call with the tokens actually used."""
+        if self.rate_limiter and response.usage_metadata:
+            used_tokens = response.usage_metadata.total_token_count or self.tokens_per_request
+            self.rate_limiter.record(tokens=used_tokens - self.tokens_per_request)
+
+    def _retry_delay(self, error: errors.APIError, attempt: int) -> float:
+        """Delay before retrying the failed model call. Raise if the call is not retried."""
+        if error.code not in RETRIED_STATUS_CODES:
+            raise ParserException(f"The model call failed: {error.message}", status_code=502)
+        if attempt >= self.max_retries:
+            raise ServiceUnavailableException("The model is unavailable. Please try again later.")
+        LOGGER.warning(f"Model call attempt {attempt + 1} failed with status {error.code}.")
+        # Full jitter: spread the retries of concurrent requests over the backoff window
+        return random.uniform(0, self.retry_backoff * 2**attempt)
+
+
+class GeminiParser(BaseGeminiParser, IParser):
+    def _process_file(self, file: BinaryIO) -> str | list[bytes]:
+        process = partial(prepare_document, file.read(), *self._prepare_args())
+        if self.executor is None:
+            return process()
+        return self.executor.submit(process).result()
+
+    def _generate(self, content: str | list[bytes]) -> types.GenerateContentResponse:
+        request = self._request(content)
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire(tokens=self.tokens_per_request)
+            try:
+                response = self.client.models.generate_content(**request)
+            except errors.APIError as e:
+                time.sleep(self._retry_delay(e, attempt=attempt))
+                attempt += 1
+                continue
+            self._record_usage(response)
+            return response
+
+    def parse(self, file: BinaryIO) -> ParserPrediction:
+        content = self._process_file(file)
+        return self._to_prediction(self._generate(content), content=content)
+
+
+class AsyncGeminiParser(BaseGeminiParser, IAsyncParser):
+    """Same as `GeminiParser` on the async client: no thread is held while the model
+    answers."""
+
+    async def _process_file(self, file: BinaryIO) -> str | list[bytes]:
+        pdf_bytes = await asyncio.to_thread(file.read)
+        process = partial(prepare_document, pdf_bytes, *self._prepare_args())
+        if self.executor is None:
+            return await asyncio.to_thread(process)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, process)
+
+    async def _generate(self, content: str | list[bytes]) -> types.GenerateContentResponse:
+        request = self._request(content)
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                await self.rate_limiter.acquire_async(tokens=self.tokens_per_request)
+            try:
+                response = await self.client.aio.models.generate_content(**request)
+            except errors.APIError as e:
+                await asyncio.sleep(self._retry_delay(e, attempt=attempt))
+                attempt += 1
+                continue
+            self._record_usage(response)
+            return response
+
+    async def parse(self, file: BinaryIO) -> ParserPrediction:
+        content = await self._process_file(file)
+        return self._to_prediction(await self._generate(content), content=content)
+
+
+class CoalescingParser(IParser):
+    """Parse identical documents requested concurrently once, all callers sharing the
+    result. Documents are identified by the SHA-256 of their content."""
+
+    def __init__(self, parser: IParser) -> None:
+        self.parser = parser
+        self._pending: dict[str, Future[ParserPrediction]] = {}
+        self._lock = Lock()
+
+    def parse(self, file: BinaryIO) -> ParserPrediction:
+        content, content_hash = _read_content(file)
+        with self._lock:
+            future = self._pending.get(content_hash)
+            is_leader = future is None
+            if future is None:
+                future = self._pending[content_hash] = Future()
+        if not is_leader:
+            return future.result()
+        try:
+            prediction = self.parser.parse(BytesIO(content))
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._pending[content_hash]
+        future.set_result(prediction)
+        return prediction
+
+
+class AsyncCoalescingParser(IAsyncParser):
+    """Same as `CoalescingParser` for async parsers."""
+
+    def __init__(self, parser: IAsyncParser) -> None:
+        self.parser = parser
+        self._pending: dict[str, asyncio.Task[ParserPrediction]] = {}
+
+    async def parse(self, file: BinaryIO) -> ParserPrediction:
+        content, content_hash = await asyncio.to_thread(_read_content, file)
+        task = self._pending.get(content_hash)
+        if task is None:
+            task = asyncio.create_task(self.parser.parse(BytesIO(content)))
+            self._pending[content_hash] = task
+            task.add_done_callback(lambda _: self._pending.pop(content_hash, None))
+        # A caller going away does not cancel the parse for the others
+        return await asyncio.shield(task)
+
+
+def _read_content(file: BinaryIO) -> tuple[bytes, str]:
+    content = file.read()
+    return content, hashlib.sha256(content).hexdigest()
+
+
+def prepare_document(
+    pdf_bytes: bytes,
+    dpi: int,
+    first_page: int,
+    last_page: int | None,
+    encoding: ImageEncoding = DEFAULT_ENCODING,
+    text_layer_min_chars: int | None = None,
+) -> str | list[bytes]:
+    """Content sent to the model for the PDF pages in the range: their embedded text if it
+    holds at least `text_layer_min_chars` characters, images of the pages otherwise.
+    Defined at module level to be run in a process pool."""
+    if text_layer_min_chars is not None:
+        text = extract_text(pdf_bytes, first_page=first_page, last_page=last_page)
+        if has_text_layer(text, min_chars=text_layer_min_chars):
+            return text
+    return rasterize(pdf_bytes, dpi, first_page, last_page, encoding)
+
+
+def rasterize(
+    pdf_bytes: bytes,
+    dpi: int,
+    first_page: int,
+    last_page: int | None,
+    encoding: ImageEncoding = DEFAULT_ENCODING,
+) -> list[bytes]:
+    """Encoded images of the PDF pages in the range. Only these pages are rendered by poppler.
+    Defined at module level to be run in a process pool."""
+    try:
+        images = pdf2image.convert_from_bytes(
+            pdf_bytes, dpi=dpi, first_page=first_page, last_page=last_page
         )
+        return [encode_image(image, encoding=encoding) for image in images]
+    except Exception as e:
+        raise ParserException(f"Failed to process PDF file: {str(e)}") from e
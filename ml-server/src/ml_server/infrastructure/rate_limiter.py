@@ -0,0 +1,59 @@
+import asyncio
+import time
+from threading import Lock
+
+from ml_server.services.exceptions import ServiceUnavailableException
+
+
+class TokenBucketRateLimiter:
+    """Keep the calls to a model within its requests and tokens per minute quota.
+
+    Both buckets hold up to a minute of quota and refill continuously. A call reserves one
+    request and its estimated tokens, then waits until the buckets cover the reservation, so
+    concurrent callers are served in order. Calls that would wait longer than `max_wait`
+    seconds are rejected instead. Thread-safe, shared by the sync and async parsers.
+    """
+
+    def __init__(self, rpm: int, tpm: int, max_wait: float) -> None:
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_wait = max_wait
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._updated_at = time.monotonic()
+        self._lock = Lock()
+
+    def acquire(self, tokens: int) -> None:
+        delay = self._reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, tokens: int) -> None:
+        delay = self._reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record(self, tokens: int) -> None:
+        """Account for tokens used beyond the reservation, or give back unused ones."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens - tokens, self.tpm)
+
+    def _reserve(self, tokens: int) -> float:
+        with self._lock:
+            self._refill()
+            requests, remaining_tokens = self._requests - 1, self._tokens - tokens
+            delay = max(0.0, -requests * 60 / self.rpm, -remaining_tokens * 60 / self.tpm)
+            if delay > self.max_wait:
+                raise ServiceUnavailableException(
+                    "The model quota is exhausted. Please try again later."
+                )
+            self._requests, self._tokens = requests, remaining_tokens
+            return delay
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._requests = min(self._requests + elapsed * self.rpm / 60, self.rpm)
+        self._tokens = min(self._tokens + elapsed * self.tpm / 60, self.tpm)
+        self._updated_at = now
@@ -5,6 +5,7 @@ from pydantic import BaseModel, BeforeValidator, ValidationInfo, field_validator
 
 from ml_server.domain.parser import (
     Currency,
+    InputType,
     ParsedClientData,
     ParsedData,
     ParsedInvoiceData,
@@ -65,9 +66,12 @@ class ParsedDataSchema(BaseModel):
     invoice: ParsedInvoiceDataSchema
     client: ParsedClientDataSchema
 
-    def to_prediction(self, model_name: str) -> ParserPrediction:
+    def to_prediction(
+        self, model_name: str, input_type: InputType = InputType.IMAGE
+    ) -> ParserPrediction:
         return ParserPrediction(
             model_name=model_name,
+            input_type=input_type,
             data=ParsedData(
                 invoice=ParsedInvoiceData(
                     gross_amount=self.invoice.gross_amount,
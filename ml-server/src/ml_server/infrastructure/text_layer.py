@@ -0,0 +1,30 @@
+import subprocess
+
+from ml_server.services.exceptions import ParserException
+
+PDFTOTEXT_TIMEOUT = 30  # Seconds
+
+
+def extract_text(pdf_bytes: bytes, first_page: int, last_page: int | None) -> str:
+    """Embedded text of the PDF pages in the range, laid out as on the page. Empty for scanned
+    documents. Uses poppler's `pdftotext`, installed along `pdftoppm` for the rasterization."""
+    command = ["pdftotext", "-layout", "-enc", "UTF-8", "-f", str(first_page)]
+    if last_page is not None:
+        command += ["-l", str(last_page)]
+    try:
+        result = subprocess.run(
+            [*command, "-", "-"],
+            input=pdf_bytes,
+            capture_output=True,
+            check=True,
+            timeout=PDFTOTEXT_TIMEOUT,
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        raise ParserException(f"Failed to extract the PDF text: {str(e)}") from e
+    return result.stdout.decode("utf-8", errors="replace")
+
+
+def has_text_layer(text: str, min_chars: int) -> bool:
+    """Whether the extracted text holds at least `min_chars` visible characters. Scanned
+    documents have none, or a few from stamps or headers."""
+    return len("".join(text.split())) >= min_chars
@@ -1,16 +1,33 @@
+import multiprocessing
 import sys
 import time
 import traceback
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from typing import Annotated
 
 from fastapi import Depends, FastAPI, Request, UploadFile
-from fastapi.responses import JSONResponse
-
-from ml_server.interfaces.dependencies.parser import get_parser
-from ml_server.interfaces.schemas.parser import ParsedDataInterface
+from fastapi.responses import JSONResponse, PlainTextResponse
+from google import genai
+
+from ml_server.domain.parser import Document
+from ml_server.interfaces.dependencies.parser import (
+    create_async_parser,
+    create_parser,
+    create_rate_limiter,
+    get_async_parser,
+    get_parse_limiter,
+    get_parser,
+)
+from ml_server.interfaces.schemas.parser import (
+    BatchItemInterface,
+    BatchParsedDataInterface,
+    ParsedDataInterface,
+)
 from ml_server.services.exceptions import CustomException
+from ml_server.services.limiter import ConcurrencyLimiter
 from ml_server.services.parser import ParserService
-from ml_server.services.ports.parser import IParser
+from ml_server.services.ports.parser import IAsyncParser, IParser
 from ml_server.settings import get_settings
 from ml_server.utils.logger import get_logger
 
@@ -18,7 +35,39 @@ logger = get_logger()
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Rasterization is CPU bound: run in processes, not in the request threads. Spawned, as
+    # forking the threads of the server could copy locks held by them, e.g. the logger's
+    app.state.rasterize_executor = ProcessPoolExecutor(
+        max_workers=settings.rasterize_workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    # A single client per worker, keeping its connections to the model endpoint open
+    app.state.gemini_client = genai.Client(api_key=settings.gemini_api_key)
+    # Calls of the sync and async parsers count against the same model quota
+    app.state.rate_limiter = create_rate_limiter()
+    app.state.parser = create_parser(
+        client=app.state.gemini_client,
+        executor=app.state.rasterize_executor,
+        rate_limiter=app.state.rate_limiter,
+    )
+    app.state.async_parser = create_async_parser(
+        client=app.state.gemini_client,
+        executor=app.state.rasterize_executor,
+        rate_limiter=app.state.rate_limiter,
+    )
+    app.state.parse_limiter = ConcurrencyLimiter(
+        max_in_flight=settings.parser_max_in_flight, max_queued=settings.parser_max_queued
+    )
+    yield
+    await app.state.gemini_client.aio.aclose()
+    app.state.gemini_client.close()
+    app.state.rasterize_executor.shutdown()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Invoice Reader ML Server",
     description="A FastAPI server for managing Machine Learning and AI features.",
     version="0.1.0",
@@ -74,16 +123,63 @@ async def health_check():
     return {"status": "healthy", "service": "ml-server"}
 
 
+@app.get("/metrics")
+async def metrics(
+    limiter: Annotated[ConcurrencyLimiter, Depends(get_parse_limiter)],
+) -> PlainTextResponse:
+    """Load of the parser, in the Prometheus text format."""
+    return PlainTextResponse(
+        "# TYPE ml_server_parse_in_flight gauge\n"
+        f"ml_server_parse_in_flight {limiter.in_flight}\n"
+        "# TYPE ml_server_parse_queued gauge\n"
+        f"ml_server_parse_queued {limiter.queued}\n"
+        "# TYPE ml_server_parse_rejected_total counter\n"
+        f"ml_server_parse_rejected_total {limiter.rejected}\n"
+    )
+
+
 @app.post("/v1/parse")
-def parse(
-    upload_file: UploadFile, parser: Annotated[IParser, Depends(get_parser)]
+async def parse(
+    upload_file: UploadFile,
+    parser: Annotated[IAsyncParser, Depends(get_async_parser)],
+    limiter: Annotated[ConcurrencyLimiter, Depends(get_parse_limiter)],
 ) -> ParsedDataInterface:
     file = upload_file.file
     content_type = upload_file.content_type if upload_file.content_type else "not specified"
-    parsed_data = ParserService.parse(
+    parsed_data = await ParserService.parse_async(
         file=file,
         content_type=content_type,
         parser=parser,
         allowed_formats=settings.allowed_formats,
+        limiter=limiter,
     )
     return ParsedDataInterface.from_parsed_data(parsed_data.data)
+
+
+@app.post("/v1/parse/batch")
+async def parse_batch(
+    upload_files: list[UploadFile],
+    parser: Annotated[IParser, Depends(get_parser)],
+    limiter: Annotated[ConcurrencyLimiter, Depends(get_parse_limiter)],
+) -> BatchParsedDataInterface:
+    """Parse many documents at once. Each document gets its own status code, a failure not
+    affecting the others."""
+    documents = [
+        Document(
+            filename=upload_file.filename or f"document {i + 1}",
+            file=upload_file.file,
+            content_type=upload_file.content_type or "not specified",
+        )
+        for i, upload_file in enumerate(upload_files)
+    ]
+    results = await ParserService.parse_batch(
+        documents=documents,
+        parser=parser,
+        allowed_formats=settings.allowed_formats,
+        max_documents=settings.batch_max_documents,
+        max_concurrency=settings.batch_max_concurrency,
+        limiter=limiter,
+    )
+    return BatchParsedDataInterface(
+        results=[BatchItemInterface.from_batch_item_result(result) for result in results]
+    )
@@ -1,16 +1,78 @@
-from ml_server.infrastructure.parser import GeminiParser
-from ml_server.services.ports.parser import IParser
+from concurrent.futures import Executor
+from typing import Any
+
+from fastapi import Request
+from google import genai
+
+from ml_server.infrastructure.image import ImageEncoding
+from ml_server.infrastructure.parser import (
+    AsyncCoalescingParser,
+    AsyncGeminiParser,
+    CoalescingParser,
+    GeminiParser,
+)
+from ml_server.infrastructure.rate_limiter import TokenBucketRateLimiter
+from ml_server.services.limiter import ConcurrencyLimiter
+from ml_server.services.ports.parser import IAsyncParser, IParser
 from ml_server.settings import get_settings
 
 settings = get_settings()
 
 
-def get_parser(
-    api_key: str = settings.gemini_api_key,
-    model_name: str = settings.parser_config.model_name,
+def get_parser(request: Request) -> IParser:
+    """Return the parser created once per worker in the app lifespan."""
+    return request.app.state.parser
+
+
+def get_async_parser(request: Request) -> IAsyncParser:
+    return request.app.state.async_parser
+
+
+def get_parse_limiter(request: Request) -> ConcurrencyLimiter:
+    return request.app.state.parse_limiter
+
+
+def create_rate_limiter() -> TokenBucketRateLimiter:
+    model = settings.parser_config.model
+    return TokenBucketRateLimiter(rpm=model.rpm, tpm=model.tpm, max_wait=model.max_wait)
+
+
+def create_parser(
+    client: genai.Client, executor: Executor, rate_limiter: TokenBucketRateLimiter
 ) -> IParser:
-    """Factory function to create and inject an instance of GeminiParser."""
-    return GeminiParser(
-        api_key=api_key,
-        model_name=model_name,
+    return CoalescingParser(
+        GeminiParser(
+            client=client,
+            executor=executor,
+            rate_limiter=rate_limiter,
+            **_gemini_parser_config(),
+        )
     )
+
+
+def create_async_parser(
+    client: genai.Client, executor: Executor, rate_limiter: TokenBucketRateLimiter
+) -> IAsyncParser:
+    return AsyncCoalescingParser(
+        AsyncGeminiParser(
+            client=client,
+            executor=executor,
+            rate_limiter=rate_limiter,
+            **_gemini_parser_config(),
+        )
+    )
+
+
+def _gemini_parser_config() -> dict[str, Any]:
+    parser_config = settings.parser_config
+    return {
+        "model_name": parser_config.model_name,
+        "dpi": parser_config.dpi,
+        "first_page": parser_config.first_page,
+        "last_page": parser_config.last_page,
+        "image_encoding": ImageEncoding(**parser_config.image.model_dump()),
+        "text_layer_min_chars": parser_config.text_layer_min_chars,
+        "tokens_per_request": parser_config.model.tokens_per_request,
+        "max_retries": parser_config.model.max_retries,
+        "retry_backoff": parser_config.model.retry_backoff,
+    }
@@ -2,7 +2,13 @@ from datetime import date
 
 from pydantic import BaseModel
 
-from ml_server.domain.parser import Currency, ParsedClientData, ParsedData, ParsedInvoiceData
+from ml_server.domain.parser import (
+    BatchItemResult,
+    Currency,
+    ParsedClientData,
+    ParsedData,
+    ParsedInvoiceData,
+)
 
 
 class ParsedInvoiceDataInterface(BaseModel):
@@ -59,3 +65,25 @@ class ParsedDataInterface(BaseModel):
             invoice=ParsedInvoiceDataInterface.from_parsed_invoice_data(parsed_data.invoice),
             client=ParsedClientDataInterface.from_parsed_client_data(parsed_data.client),
         )
+
+
+class BatchItemInterface(BaseModel):
+    filename: str
+    status_code: int
+    data: ParsedDataInterface | None = None
+    detail: str | None = None
+
+    @classmethod
+    def from_batch_item_result(cls, result: BatchItemResult) -> "BatchItemInterface":
+        return cls(
+            filename=result.filename,
+            status_code=result.status_code,
+            data=ParsedDataInterface.from_parsed_data(result.prediction.data)
+            if result.prediction
+            else None,
+            detail=result.error,
+        )
+
+
+class BatchParsedDataInterface(BaseModel):
+    results: list[BatchItemInterface]
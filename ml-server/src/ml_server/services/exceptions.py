@@ -13,3 +13,13 @@ class ParserException(CustomException):
 class FileFormatNotHandledException(CustomException):
     def __init__(self, message: str):
         super().__init__(message=message, status_code=415)
+
+
+class BatchTooLargeException(CustomException):
+    def __init__(self, message: str):
+        super().__init__(message=message, status_code=413)
+
+
+class ServiceUnavailableException(CustomException):
+    def __init__(self, message: str):
+        super().__init__(message=message, status_code=503)
@@ -0,0 +1,35 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from ml_server.services.exceptions import ServiceUnavailableException
+
+
+class ConcurrencyLimiter:
+    """Let at most `max_in_flight` calls run at a time, and `max_queued` more wait for their
+    turn. Beyond that, calls are rejected right away instead of piling up in memory."""
+
+    def __init__(self, max_in_flight: int, max_queued: int) -> None:
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.in_flight = 0
+        self.queued = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        if self._semaphore.locked() and self.queued >= self.max_queued:
+            self.rejected += 1
+            raise ServiceUnavailableException("The parser is overloaded. Please try again later.")
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
@@ -1,8 +1,17 @@
+from functools import partial
 from typing import BinaryIO
 
-from ml_server.domain.parser import ParserPrediction
-from ml_server.services.exceptions import FileFormatNotHandledException
-from ml_server.services.ports.parser import IParser
+import anyio
+from anyio import to_thread
+
+from ml_server.domain.parser import BatchItemResult, Document, ParserPrediction
+from ml_server.services.exceptions import (
+    BatchTooLargeException,
+    CustomException,
+    FileFormatNotHandledException,
+)
+from ml_server.services.limiter import ConcurrencyLimiter
+from ml_server.services.ports.parser import IAsyncParser, IParser
 from ml_server.utils.logger import get_logger
 
 logger = get_logger()
@@ -17,5 +26,87 @@ class ParserService:
             raise FileFormatNotHandledException(f"Unsupported content type: {content_type}")
         logger.info("Starting invoice parsing")
         parsed_data = parser.parse(file)
-        logger.info("Invoice parsing completed successfully")
+        logger.info(f"Invoice parsing completed successfully from its {parsed_data.input_type}")
+        return parsed_data
+
+    @staticmethod
+    async def parse_async(
+        file: BinaryIO,
+        content_type: str,
+        parser: IAsyncParser,
+        allowed_formats: list[str],
+        limiter: ConcurrencyLimiter,
+    ) -> ParserPrediction:
+        """Same as `parse`, the upstream calls being limited by `limiter`. Requests beyond its
+        queue are rejected with a 503."""
+        if content_type not in allowed_formats:
+            raise FileFormatNotHandledException(f"Unsupported content type: {content_type}")
+        async with limiter.acquire():
+            logger.info("Starting invoice parsing")
+            parsed_data = await parser.parse(file)
+        logger.info(f"Invoice parsing completed successfully from its {parsed_data.input_type}")
         return parsed_data
+
+    @staticmethod
+    async def parse_batch(
+        documents: list[Document],
+        parser: IParser,
+        allowed_formats: list[str],
+        max_documents: int,
+        max_concurrency: int,
+        limiter: ConcurrencyLimiter,
+    ) -> list[BatchItemResult]:
+        """Parse the documents concurrently in worker threads, at most `max_concurrency` at a
+        time. Results are returned in input order, failures being reported per document.
+        Documents count against `limiter` as single requests do: those beyond its queue are
+        reported with a 503."""
+        if len(documents) > max_documents:
+            raise BatchTooLargeException(f"Batches are limited to {max_documents} documents.")
+        batch_limiter = anyio.CapacityLimiter(max_concurrency)
+        results: list[BatchItemResult | None] = [None] * len(documents)
+
+        async def parse_document(index: int, document: Document) -> None:
+            async with batch_limiter:
+                results[index] = await ParserService._parse_batch_item(
+                    document=document,
+                    parser=parser,
+                    allowed_formats=allowed_formats,
+                    limiter=limiter,
+                )
+
+        async with anyio.create_task_group() as task_group:
+            for index, document in enumerate(documents):
+                task_group.start_soon(parse_document, index, document)
+        return [result for result in results if result]
+
+    @staticmethod
+    async def _parse_batch_item(
+        document: Document,
+        parser: IParser,
+        allowed_formats: list[str],
+        limiter: ConcurrencyLimiter,
+    ) -> BatchItemResult:
+        try:
+            async with limiter.acquire():
+                prediction = await to_thread.run_sync(
+                    partial(
+                        ParserService.parse,
+                        file=document.file,
+                        content_type=document.content_type,
+                        parser=parser,
+                        allowed_formats=allowed_formats,
+                    )
+                )
+        except CustomException as e:
+            logger.error(f"Failed to parse {document.filename}: {e.message}")
+            return BatchItemResult(
+                filename=document.filename, status_code=e.status_code, error=e.message
+            )
+        except Exception as e:
+            logger.error(f"Failed to parse {document.filename}: {e!r}")
+            return BatchItemResult(
+                filename=document.filename,
+                status_code=500,
+                error="Something went wrong while parsing the document.",
+            )
+        return BatchItemResult(filename=document.filename, status_code=200, prediction=prediction)
@@ -10,3 +10,11 @@ class IParser(ABC):
     @abstractmethod
     def parse(self, file: BinaryIO) -> ParserPrediction:
         pass
+
+
+class IAsyncParser(ABC):
+    """Async counterpart of `IParser`."""
+
+    @abstractmethod
+    async def parse(self, file: BinaryIO) -> ParserPrediction:
+        pass
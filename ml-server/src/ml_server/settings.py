@@ -1,9 +1,51 @@
+from functools import lru_cache
+from typing import Literal
+
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class ModelConfig(BaseModel):
+    """Quota granted by the provider for a model, and how calls to it are retried.
+    The quota is shared by the workers: split it when running several."""
+
+    rpm: int = 1000  # Requests per minute
+    tpm: int = 1_000_000  # Tokens per minute
+    tokens_per_request: int = 2000  # Estimate reserved before a call, corrected after
+    max_wait: float = 30.0  # Seconds a call may wait for quota before answering 503
+    max_retries: int = 3  # Retries on 429 and 503
+    retry_backoff: float = 1.0  # Seconds, doubled on each retry
+
+
+class ImageConfig(BaseModel):
+    """How the rendered pages are encoded before being uploaded to the model. Compare the
+    settings with the ml-dev evaluation (`parser-cli eval compare-images`) before changing
+    them: smaller uploads are faster but may cost accuracy."""
+
+    max_dimension: int | None = None  # Longest side in pixels, larger pages are downscaled
+    grayscale: bool = False
+    format: Literal["PNG", "JPEG", "WEBP"] = "PNG"
+    quality: int = 85  # JPEG and WEBP only
+
+
 class ParserConfig(BaseModel):
     model_name: str = "gemini-2.5-flash"
+    # Pages sent to the model, from first to last (to the end if None), rendered at this DPI
+    dpi: int = 200
+    first_page: int = 1
+    last_page: int | None = 1
+    image: ImageConfig = ImageConfig()
+    # Documents with at least this many characters of embedded text are sent as text, without
+    # rendering their pages. Scanned documents have none. None to always send images.
+    text_layer_min_chars: int | None = 100
+    models: dict[str, ModelConfig] = {
+        "gemini-2.5-flash": ModelConfig(rpm=1000, tpm=1_000_000),
+        "gemini-2.5-pro": ModelConfig(rpm=150, tpm=2_000_000),
+    }
+
+    @property
+    def model(self) -> ModelConfig:
+        return self.models.get(self.model_name, ModelConfig())
 
 
 class Settings(BaseSettings):
@@ -11,9 +53,16 @@ class Settings(BaseSettings):
 
     allowed_formats: list[str] = ["application/pdf"]
 
+    batch_max_documents: int = 50  # Documents per batch request
+    batch_max_concurrency: int = 8  # Documents of a batch parsed at the same time
+
     gemini_api_key: str = ""
+    parser_max_in_flight: int = 32  # Concurrent model calls per worker
+    parser_max_queued: int = 64  # Requests waiting for a model call before answering 503
+    rasterize_workers: int = 2  # Processes rendering PDF pages
     parser_config: ParserConfig = ParserConfig()
 
 
+@lru_cache
 def get_settings() -> Settings:
     return Settings()  # type: ignore
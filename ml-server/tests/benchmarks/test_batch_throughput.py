@@ -0,0 +1,68 @@
+"""Measure the throughput of `/v1/parse/batch` fanning documents out to the parser.
+
+The model call is simulated by `TestParser` with a fixed latency, e.g.:
+
+    BENCHMARK_PARSER_LATENCY=0.2 uv run pytest tests/benchmarks/test_batch_throughput.py \\
+        -m benchmark -s
+"""
+
+import os
+import time
+from io import BytesIO
+from typing import BinaryIO
+
+import anyio
+import pytest
+
+from ml_server.domain.parser import Document, ParserPrediction
+from ml_server.infrastructure.parser import TestParser
+from ml_server.services.limiter import ConcurrencyLimiter
+from ml_server.services.parser import ParserService
+
+pytestmark = pytest.mark.benchmark
+
+PARSER_LATENCY = float(os.getenv("BENCHMARK_PARSER_LATENCY", "0.05"))  # Seconds
+N_DOCUMENTS = 32
+CONCURRENCY = 8
+
+
+class SlowParser(TestParser):
+    def parse(self, file: BinaryIO) -> ParserPrediction:
+        time.sleep(PARSER_LATENCY)
+        return super().parse(file)
+
+
+def documents() -> list[Document]:
+    return [
+        Document(filename=f"{i}.pdf", file=BytesIO(b"%PDF"), content_type="application/pdf")
+        for i in range(N_DOCUMENTS)
+    ]
+
+
+def throughput(max_concurrency: int) -> float:
+    """Documents parsed per second."""
+    start = time.perf_counter()
+    results = anyio.run(
+        lambda: ParserService.parse_batch(
+            documents=documents(),
+            parser=SlowParser(),
+            allowed_formats=["application/pdf"],
+            max_documents=N_DOCUMENTS,
+            max_concurrency=max_concurrency,
+            limiter=ConcurrencyLimiter(max_in_flight=N_DOCUMENTS, max_queued=N_DOCUMENTS),
+        )
+    )
+    elapsed = time.perf_counter() - start
+    assert all(result.status_code == 200 for result in results)
+    return N_DOCUMENTS / elapsed
+
+
+def test_batch_throughput():
+    sequential = throughput(max_concurrency=1)
+    batched = throughput(max_concurrency=CONCURRENCY)
+    print(
+        f"\nThroughput over {N_DOCUMENTS} documents, {PARSER_LATENCY * 1000:.0f} ms per parse:"
+        f"\none at a time: {sequential:.1f} documents/s"
+        f"\n{CONCURRENCY} at a time: {batched:.1f} documents/s"
+    )
+    assert batched > CONCURRENCY / 2 * sequential
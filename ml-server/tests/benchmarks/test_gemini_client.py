@@ -0,0 +1,59 @@
+"""Measure the overhead of building the Gemini client and the settings on every request,
+against building them once in the app lifespan.
+
+The model endpoint is replaced by a mocked HTTP transport, so only the client side is
+measured:
+
+    uv run pytest tests/benchmarks/test_gemini_client.py -m benchmark -s
+"""
+
+import statistics
+import time
+from collections.abc import Callable
+from io import BytesIO
+
+import pytest
+
+from ml_server.domain.parser import ParserPrediction
+from ml_server.settings import Settings, get_settings
+from tests.fakes import ImageParser, mock_client
+
+pytestmark = pytest.mark.benchmark
+
+N_CALLS = 20
+
+
+def median_latency(call: Callable[[], object]) -> float:
+    """Median latency in ms."""
+    latencies = []
+    for _ in range(N_CALLS):
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def parse_with_new_client() -> ParserPrediction:
+    """Previous behaviour: settings read and client created for every request."""
+    settings = Settings()  # type: ignore
+    parser = ImageParser(client=mock_client(), model_name=settings.parser_config.model_name)
+    return parser.parse(BytesIO(b"image"))
+
+
+def test_shared_client_overhead():
+    startup = median_latency(mock_client)
+    settings_uncached = median_latency(lambda: Settings())  # type: ignore
+    settings_cached = median_latency(get_settings)
+    shared_parser = ImageParser(client=mock_client(), model_name="gemini-2.5-flash")
+    shared = median_latency(lambda: shared_parser.parse(BytesIO(b"image")))
+    per_request = median_latency(parse_with_new_client)
+
+    print(
+        f"\nMedian latency over {N_CALLS} calls:"
+        f"\nclient creation: {startup:.2f} ms"
+        f"\nsettings: {settings_uncached:.3f} ms read, {settings_cached:.4f} ms cached"
+        f"\nparse with a client per request: {per_request:.2f} ms"
+        f"\nparse with the shared client: {shared:.2f} ms"
+    )
+    assert settings_cached < settings_uncached
+    assert shared < per_request
@@ -0,0 +1,49 @@
+"""Upload size and encoding time of a rendered invoice page per image setting.
+
+The accuracy of each setting is measured with the ml-dev evaluation:
+
+    uv run pytest tests/benchmarks/test_image_encoding.py -m benchmark -s
+    uv run parser-cli eval compare-images   # from ml-dev/parser
+"""
+
+import statistics
+import time
+
+import pytest
+from PIL import Image
+
+from ml_server.infrastructure.image import ImageEncoding, encode_image
+
+pytestmark = pytest.mark.benchmark
+
+IMAGE_PATH = "tests/assets/invoice.png"
+N_CALLS = 5
+
+ENCODINGS = {
+    "png": ImageEncoding(),
+    "png-gray": ImageEncoding(grayscale=True),
+    "jpeg-85": ImageEncoding(format="JPEG", quality=85),
+    "jpeg-85-gray": ImageEncoding(format="JPEG", quality=85, grayscale=True),
+    "jpeg-75-1024": ImageEncoding(format="JPEG", quality=75, max_dimension=1024),
+    "webp-80": ImageEncoding(format="WEBP", quality=80),
+}
+
+
+def median_encoding(image: Image.Image, encoding: ImageEncoding) -> tuple[int, float]:
+    """Size in bytes and median encoding time in ms."""
+    latencies = []
+    for _ in range(N_CALLS):
+        start = time.perf_counter()
+        encoded = encode_image(image, encoding=encoding)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return len(encoded), statistics.median(latencies)
+
+
+def test_image_encoding():
+    with Image.open(IMAGE_PATH) as image:
+        image.load()
+        results = {name: median_encoding(image, encoding) for name, encoding in ENCODINGS.items()}
+    print("\nUpload size and median encoding time per setting:")
+    for name, (size, latency) in results.items():
+        print(f"{name}: {size / 1024:.0f} kB, {latency:.1f} ms")
+    assert results["jpeg-85"][0] < results["png"][0]
@@ -0,0 +1,148 @@
+"""Load test of the parse path against a fake model endpoint answering after a fixed latency.
+
+Compares the sync path, each request holding a worker thread for the whole model call, with
+the async path limited by `ConcurrencyLimiter`, then checks that requests beyond its queue are
+shed with 503s, e.g.:
+
+    BENCHMARK_MODEL_LATENCY=5 uv run pytest tests/benchmarks/test_load.py -m benchmark -s
+"""
+
+import asyncio
+import os
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable, Iterator
+from io import BytesIO
+
+import anyio
+import httpx
+import pytest
+from anyio import to_thread
+from google import genai
+
+from ml_server.interfaces.api import app
+from ml_server.services.limiter import ConcurrencyLimiter
+from ml_server.services.parser import ParserService
+from tests.fakes import AsyncImageParser, ImageParser, mock_client, model_response
+
+pytestmark = pytest.mark.benchmark
+
+MODEL_LATENCY = float(os.getenv("BENCHMARK_MODEL_LATENCY", "1"))  # Seconds
+N_REQUESTS = 400
+MAX_IN_FLIGHT = 200
+SHEDDING_MAX_IN_FLIGHT = 50
+SHEDDING_MAX_QUEUED = 50
+PDF = ["application/pdf"]
+SHED_LOAD_STATE = ("async_parser", "parse_limiter")
+
+
+def generate_content(request: httpx.Request) -> httpx.Response:
+    time.sleep(MODEL_LATENCY)
+    return model_response()
+
+
+async def generate_content_async(request: httpx.Request) -> httpx.Response:
+    await asyncio.sleep(MODEL_LATENCY)
+    return model_response()
+
+
+def slow_client() -> genai.Client:
+    """Client whose model answers after `MODEL_LATENCY`."""
+    return mock_client(generate_content, generate_content_async)
+
+
+async def run_concurrently(n: int, call: Callable[[], Awaitable[object]]) -> float:
+    """Requests served per second."""
+    start = time.perf_counter()
+    async with anyio.create_task_group() as task_group:
+        for _ in range(n):
+            task_group.start_soon(call)
+    return n / (time.perf_counter() - start)
+
+
+async def sync_throughput() -> float:
+    # The sync handler ran in the threadpool, 40 threads by default
+    parser = ImageParser(client=slow_client(), model_name="gemini-2.5-flash")
+    return await run_concurrently(
+        N_REQUESTS,
+        lambda: to_thread.run_sync(
+            lambda: ParserService.parse(
+                file=BytesIO(b"image"), content_type=PDF[0], parser=parser, allowed_formats=PDF
+            )
+        ),
+    )
+
+
+async def async_throughput() -> float:
+    parser = AsyncImageParser(client=slow_client(), model_name="gemini-2.5-flash")
+    limiter = ConcurrencyLimiter(max_in_flight=MAX_IN_FLIGHT, max_queued=N_REQUESTS)
+    return await run_concurrently(
+        N_REQUESTS,
+        lambda: ParserService.parse_async(
+            file=BytesIO(b"image"),
+            content_type=PDF[0],
+            parser=parser,
+            allowed_formats=PDF,
+            limiter=limiter,
+        ),
+    )
+
+
+@pytest.fixture
+def app_state() -> Iterator[None]:
+    """Restore the parser and the limiter of the app, replaced by `shed_load`."""
+    saved = {name: getattr(app.state, name, None) for name in SHED_LOAD_STATE}
+    yield
+    for name, value in saved.items():
+        if value is None:
+            delattr(app.state, name)
+        else:
+            setattr(app.state, name, value)
+
+
+async def shed_load() -> tuple[list[int], ConcurrencyLimiter]:
+    """Status codes of `N_REQUESTS` concurrent requests to `/v1/parse`."""
+    app.state.async_parser = AsyncImageParser(client=slow_client(), model_name="gemini-2.5-flash")
+    app.state.parse_limiter = ConcurrencyLimiter(
+        max_in_flight=SHEDDING_MAX_IN_FLIGHT, max_queued=SHEDDING_MAX_QUEUED
+    )
+    status_codes: list[int] = []
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://ml-server"
+    ) as client:
+
+        async def call() -> None:
+            files = {"upload_file": ("invoice.pdf", b"%PDF" * 1000, "application/pdf")}
+            response = await client.post("/v1/parse", files=files)
+            status_codes.append(response.status_code)
+
+        await run_concurrently(N_REQUESTS, call)
+    return status_codes, app.state.parse_limiter
+
+
+def test_async_throughput():
+    sync = anyio.run(sync_throughput)
+    async_ = anyio.run(async_throughput)
+    print(
+        f"\nThroughput over {N_REQUESTS} concurrent requests, {MODEL_LATENCY * 1000:.0f} ms per"
+        f" model call:\nsync: {sync:.0f} requests/s\nasync: {async_:.0f} requests/s"
+    )
+    assert async_ > 2 * sync
+
+
+@pytest.mark.usefixtures("app_state")
+def test_load_shedding():
+    tracemalloc.start()
+    status_codes, limiter = anyio.run(shed_load)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    n_shed = status_codes.count(503)
+    print(
+        f"\n{len(status_codes)} concurrent requests, {SHEDDING_MAX_IN_FLIGHT} in flight and"
+        f" {SHEDDING_MAX_QUEUED} queued at most:"
+        f"\n{status_codes.count(200)} served, {n_shed} shed with 503"
+        f"\npeak memory: {peak / 1e6:.1f} MB"
+    )
+    assert set(status_codes) == {200, 503}
+    assert limiter.rejected == n_shed
+    assert (limiter.in_flight, limiter.queued) == (0, 0)
@@ -0,0 +1,75 @@
+"""Compare rendering the whole PDF at the default DPI with rendering the first page only.
+
+Requires poppler (`pdftoppm`), as in the ML server image:
+
+    uv run pytest tests/benchmarks/test_rasterization.py -m benchmark -s
+"""
+
+import base64
+import shutil
+import statistics
+import time
+from collections.abc import Callable
+from io import BytesIO
+
+import pdf2image
+import pytest
+from PIL import Image, ImageDraw
+
+from ml_server.infrastructure.parser import rasterize
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(not shutil.which("pdftoppm"), reason="poppler is not installed"),
+]
+
+PAGE_COUNTS = [1, 10, 50]
+DPI = 150
+N_CALLS = 3
+
+
+def make_pdf(n_pages: int) -> bytes:
+    pages = []
+    for i in range(n_pages):
+        page = Image.new("RGB", (1240, 1754), "white")  # A4 at 150 DPI
+        draw = ImageDraw.Draw(page)
+        for line in range(40):
+            draw.text((100, 100 + line * 40), f"Page {i + 1} - Invoice line {line}", fill="black")
+        pages.append(page)
+    with BytesIO() as buffered:
+        pages[0].save(buffered, format="PDF", save_all=True, append_images=pages[1:])
+        return buffered.getvalue()
+
+
+def whole_document(pdf_bytes: bytes) -> bytes:
+    """Previous behaviour: every page rendered, the first one sent through base64."""
+    images = pdf2image.convert_from_bytes(pdf_bytes)
+    with BytesIO() as buffered:
+        images[0].save(buffered, format="PNG", optimize=True)
+        str_img = base64.b64encode(buffered.getvalue()).decode("utf-8")
+    return base64.b64decode(str_img)
+
+
+def first_page(pdf_bytes: bytes) -> bytes:
+    return rasterize(pdf_bytes, dpi=DPI, first_page=1, last_page=1)[0]
+
+
+def median_latency(process: Callable[[bytes], bytes], pdf_bytes: bytes) -> float:
+    """Median latency in ms."""
+    latencies = []
+    for _ in range(N_CALLS):
+        start = time.perf_counter()
+        process(pdf_bytes)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def test_first_page_rasterization():
+    print("\nMedian rasterization latency per page count:")
+    for n_pages in PAGE_COUNTS:
+        pdf_bytes = make_pdf(n_pages)
+        whole = median_latency(whole_document, pdf_bytes)
+        first = median_latency(first_page, pdf_bytes)
+        print(f"{n_pages} pages: whole document {whole:.0f} ms, first page {first:.0f} ms")
+        if n_pages > 1:
+            assert first < whole
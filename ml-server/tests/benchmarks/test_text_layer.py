@@ -0,0 +1,53 @@
+"""Compare the content sent to the model for a digital invoice: its embedded text or the image
+of its page.
+
+Requires poppler (`pdftotext`, `pdftoppm`), as in the ML server image:
+
+    uv run pytest tests/benchmarks/test_text_layer.py -m benchmark -s
+"""
+
+import shutil
+import statistics
+import time
+from collections.abc import Callable
+
+import pytest
+
+from ml_server.infrastructure.parser import prepare_document
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(
+        not shutil.which("pdftotext") or not shutil.which("pdftoppm"),
+        reason="poppler is not installed",
+    ),
+]
+
+FILE_PATH = "tests/assets/invoice.pdf"
+N_CALLS = 5
+
+
+def median_latency(prepare: Callable[[], str | list[bytes]]) -> tuple[int, float]:
+    """Size of the content in bytes and median latency in ms."""
+    latencies = []
+    for _ in range(N_CALLS):
+        start = time.perf_counter()
+        content = prepare()
+        latencies.append((time.perf_counter() - start) * 1000)
+    size = len(content.encode()) if isinstance(content, str) else sum(map(len, content))
+    return size, statistics.median(latencies)
+
+
+def test_text_layer():
+    with open(FILE_PATH, "rb") as file:
+        pdf_bytes = file.read()
+    text_size, text_latency = median_latency(
+        lambda: prepare_document(pdf_bytes, 200, 1, 1, text_layer_min_chars=100)
+    )
+    image_size, image_latency = median_latency(lambda: prepare_document(pdf_bytes, 200, 1, 1))
+    print(
+        f"\ntext layer: {text_size / 1024:.1f} kB in {text_latency:.0f} ms"
+        f"\nimage: {image_size / 1024:.1f} kB in {image_latency:.0f} ms"
+    )
+    assert text_size < image_size
+    assert text_latency < image_latency
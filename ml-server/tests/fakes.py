@@ -0,0 +1,66 @@
+"""Fake Gemini model endpoint, to run the parsers without calling the model."""
+
+import json
+from collections.abc import Awaitable, Callable
+from typing import BinaryIO
+
+import httpx
+from google import genai
+from google.genai import types
+
+from ml_server.infrastructure.parser import AsyncGeminiParser, GeminiParser
+
+PREDICTION = {"invoice": {"invoice_number": "INV-1"}, "client": {}}
+
+
+def model_response(status_code: int = 200) -> httpx.Response:
+    """Answer of the model endpoint: `PREDICTION`, or an error with the status code."""
+    if status_code != 200:
+        return httpx.Response(
+            status_code, json={"error": {"code": status_code, "message": "Model error."}}
+        )
+    return httpx.Response(
+        200,
+        json={
+            "candidates": [
+                {
+                    "content": {"role": "model", "parts": [{"text": json.dumps(PREDICTION)}]},
+                    "finishReason": "STOP",
+                }
+            ],
+            "usageMetadata": {"totalTokenCount": 500},
+        },
+    )
+
+
+def mock_client(
+    handler: Callable[[httpx.Request], httpx.Response] = lambda request: model_response(),
+    async_handler: Callable[[httpx.Request], Awaitable[httpx.Response]] | None = None,
+) -> genai.Client:
+    """Client whose requests to the model endpoint are answered by the handlers."""
+    return genai.Client(
+        api_key="test",
+        http_options=types.HttpOptions(
+            httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+            httpx_async_client=httpx.AsyncClient(
+                transport=httpx.MockTransport(async_handler),
+                limits=httpx.Limits(max_connections=None),
+            )
+            if async_handler
+            else None,
+        ),
+    )
+
+
+class ImageParser(GeminiParser):
+    """Sends the file as is, without rasterization."""
+
+    def _process_file(self, file: BinaryIO) -> list[bytes]:
+        return [file.read()]
+
+
+class AsyncImageParser(AsyncGeminiParser):
+    """Sends the file as is, without rasterization."""
+
+    async def _process_file(self, file: BinaryIO) -> list[bytes]:
+        return [file.read()]
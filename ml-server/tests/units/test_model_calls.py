@@ -0,0 +1,154 @@
+import asyncio
+import threading
+import time
+from io import BytesIO
+from typing import BinaryIO
+
+import httpx
+import pytest
+
+from ml_server.domain.parser import InputType, ParserPrediction
+from ml_server.infrastructure.parser import (
+    AsyncCoalescingParser,
+    CoalescingParser,
+    GeminiParser,
+    TestParser,
+)
+from ml_server.infrastructure.rate_limiter import TokenBucketRateLimiter
+from ml_server.services.exceptions import ParserException, ServiceUnavailableException
+from ml_server.services.ports.parser import IAsyncParser, IParser
+from tests.fakes import ImageParser, mock_client, model_response
+
+
+class TextParser(GeminiParser):
+    def _process_file(self, file: BinaryIO) -> str:
+        return file.read().decode()
+
+
+def parser_answering(status_codes: list[int], **kwargs) -> tuple[ImageParser, list[int]]:
+    """Parser whose model answers with the status codes in turn, and the calls made."""
+    calls: list[int] = []
+
+    def generate_content(request: httpx.Request) -> httpx.Response:
+        calls.append(len(calls))
+        return model_response(status_codes[min(len(calls), len(status_codes)) - 1])
+
+    parser = ImageParser(
+        client=mock_client(generate_content),
+        model_name="gemini-2.5-flash",
+        retry_backoff=0.01,
+        **kwargs,
+    )
+    return parser, calls
+
+
+def test_retry_on_quota_exceeded():
+    parser, calls = parser_answering([429, 503, 200], max_retries=2)
+    prediction = parser.parse(BytesIO(b"image"))
+    assert prediction.data.invoice.invoice_number == "INV-1"
+    assert len(calls) == 3
+
+
+def test_input_type_recorded():
+    parser, _ = parser_answering([200])
+    assert parser.parse(BytesIO(b"image")).input_type == InputType.IMAGE
+
+    bodies: list[bytes] = []
+
+    def generate_content(request: httpx.Request) -> httpx.Response:
+        bodies.append(request.read())
+        return model_response(200)
+
+    text_parser = TextParser(client=mock_client(generate_content), model_name="gemini-2.5-flash")
+    prediction = text_parser.parse(BytesIO(b"Invoice INV-1"))
+    assert prediction.input_type == InputType.TEXT
+    assert b"Invoice INV-1" in bodies[0]
+    assert b"inlineData" not in bodies[0]  # No image uploaded
+
+
+def test_retries_exhausted():
+    parser, calls = parser_answering([503], max_retries=1)
+    with pytest.raises(ServiceUnavailableException):
+        parser.parse(BytesIO(b"image"))
+    assert len(calls) == 2
+
+
+def test_model_errors_not_retried():
+    parser, calls = parser_answering([400], max_retries=2)
+    with pytest.raises(ParserException) as exc_info:
+        parser.parse(BytesIO(b"image"))
+    assert exc_info.value.status_code == 502
+    assert len(calls) == 1
+
+
+def test_rate_limiter_spaces_calls():
+    rate_limiter = TokenBucketRateLimiter(rpm=600, tpm=1_000_000, max_wait=1)
+    rate_limiter._requests = 0  # Bucket emptied: one request per 0.1 second
+    start = time.perf_counter()
+    for _ in range(3):
+        rate_limiter.acquire(tokens=1)
+    assert time.perf_counter() - start == pytest.approx(0.3, abs=0.1)
+
+
+def test_rate_limiter_rejects_long_waits():
+    rate_limiter = TokenBucketRateLimiter(rpm=30, tpm=1_000_000, max_wait=1)
+    rate_limiter._requests = 0
+    with pytest.raises(ServiceUnavailableException):
+        rate_limiter.acquire(tokens=1)
+
+
+def test_rate_limiter_corrected_with_used_tokens():
+    rate_limiter = TokenBucketRateLimiter(rpm=1000, tpm=10_000, max_wait=0)
+    parser, _ = parser_answering([200], rate_limiter=rate_limiter, tokens_per_request=2000)
+    parser.parse(BytesIO(b"image"))
+    # 2000 tokens reserved, 500 used
+    assert rate_limiter._tokens == pytest.approx(10_000 - 500, abs=10)
+
+
+class SlowParser(IParser):
+    def __init__(self) -> None:
+        self.n_calls = 0
+
+    def parse(self, file: BinaryIO) -> ParserPrediction:
+        self.n_calls += 1
+        time.sleep(0.1)
+        return TestParser().parse(file)
+
+
+class AsyncSlowParser(IAsyncParser):
+    def __init__(self) -> None:
+        self.n_calls = 0
+
+    async def parse(self, file: BinaryIO) -> ParserPrediction:
+        self.n_calls += 1
+        await asyncio.sleep(0.1)
+        return TestParser().parse(file)
+
+
+def test_identical_documents_coalesced():
+    parser = SlowParser()
+    coalescing_parser = CoalescingParser(parser)
+    threads = [
+        threading.Thread(target=coalescing_parser.parse, args=(BytesIO(content),))
+        for content in (b"same", b"same", b"same", b"other")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert parser.n_calls == 2
+
+
+def test_identical_documents_coalesced_async():
+    parser = AsyncSlowParser()
+    coalescing_parser = AsyncCoalescingParser(parser)
+
+    async def main() -> list[ParserPrediction]:
+        return await asyncio.gather(
+            *(coalescing_parser.parse(BytesIO(b"same")) for _ in range(3)),
+            coalescing_parser.parse(BytesIO(b"other")),
+        )
+
+    predictions = asyncio.run(main())
+    assert len(predictions) == 4
+    assert parser.n_calls == 2
@@ -2,24 +2,69 @@ from datetime import date
 from io import BytesIO
 
 import pytest
+from PIL import Image
 
-from ml_server.infrastructure.parser import GeminiParser
+from ml_server.infrastructure import parser
+from ml_server.infrastructure.image import ImageEncoding, encode_image
+from ml_server.infrastructure.parser import prepare_document, rasterize
 from ml_server.infrastructure.schemas.parser import ParsedClientDataSchema, ParsedInvoiceDataSchema
+from ml_server.infrastructure.text_layer import has_text_layer
 from ml_server.services.exceptions import ParserException
 
 FILE_PATH = "tests/assets/invoice.pdf"
+IMAGE_PATH = "tests/assets/invoice.png"
 
 
 def test_process_file():
     with open(FILE_PATH, "rb") as file:
-        img_str = GeminiParser._process_file(file=file)
-    assert isinstance(img_str, str)
+        images = rasterize(file.read(), dpi=100, first_page=1, last_page=1)
+    assert len(images) == 1
+    assert images[0].startswith(b"\x89PNG")
 
 
 def test_process_file_invalid():
-    invalid_pdf = BytesIO(b"This is not a valid PDF content")
     with pytest.raises(ParserException):
-        GeminiParser._process_file(file=invalid_pdf)
+        rasterize(b"This is not a valid PDF content", dpi=100, first_page=1, last_page=1)
+
+
+def test_encode_image():
+    encoding = ImageEncoding(max_dimension=500, grayscale=True, format="JPEG", quality=70)
+    with Image.open(IMAGE_PATH) as image:
+        encoded = encode_image(image, encoding=encoding)
+    with Image.open(BytesIO(encoded)) as encoded_image:
+        assert encoded_image.format == "JPEG"
+        assert encoded_image.mode == "L"
+        assert max(encoded_image.size) == 500
+    assert encoding.mime_type == "image/jpeg"
+
+
+def test_encode_image_not_upscaled():
+    with Image.open(IMAGE_PATH) as image:
+        size = image.size
+        encoded = encode_image(image, encoding=ImageEncoding(max_dimension=10_000))
+    with Image.open(BytesIO(encoded)) as encoded_image:
+        assert encoded_image.format == "PNG"
+        assert encoded_image.size == size
+
+
+def test_has_text_layer():
+    assert has_text_layer("Invoice INV-1\n  Total: 100 EUR", min_chars=10)
+    assert not has_text_layer(" \n\f \n", min_chars=1)
+    assert not has_text_layer("Page 1", min_chars=10)
+
+
+def test_prepare_document_text_layer(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(parser, "extract_text", lambda *args, **kwargs: "Invoice INV-1 " * 10)
+    monkeypatch.setattr(parser, "rasterize", lambda *args, **kwargs: pytest.fail("Rasterized"))
+    content = prepare_document(b"pdf", dpi=100, first_page=1, last_page=1, text_layer_min_chars=50)
+    assert content == "Invoice INV-1 " * 10
+
+
+def test_prepare_document_scanned(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(parser, "extract_text", lambda *args, **kwargs: "\f")
+    monkeypatch.setattr(parser, "rasterize", lambda *args, **kwargs: [b"image"])
+    content = prepare_document(b"pdf", dpi=100, first_page=1, last_page=1, text_layer_min_chars=50)
+    assert content == [b"image"]
 
 
 def test_parsed_client_schema():
@@ -0,0 +1,118 @@
+import asyncio
+from io import BytesIO
+
+import anyio
+import pytest
+from fastapi.testclient import TestClient
+
+from ml_server.domain.parser import Document
+from ml_server.infrastructure.parser import TestParser
+from ml_server.interfaces.api import app
+from ml_server.interfaces.dependencies.parser import get_parse_limiter, get_parser
+from ml_server.interfaces.schemas.parser import BatchParsedDataInterface
+from ml_server.services.exceptions import BatchTooLargeException, ServiceUnavailableException
+from ml_server.services.limiter import ConcurrencyLimiter
+from ml_server.services.parser import ParserService
+
+FILE_PATH = "tests/assets/invoice.pdf"
+
+
+def document(filename: str, content_type: str = "application/pdf") -> Document:
+    return Document(filename=filename, file=BytesIO(b"%PDF"), content_type=content_type)
+
+
+def test_parse_batch_reports_failures_per_document():
+    documents = [document("a.pdf"), document("b.png", content_type="image/png"), document("c.pdf")]
+    results = anyio.run(
+        lambda: ParserService.parse_batch(
+            documents=documents,
+            parser=TestParser(),
+            allowed_formats=["application/pdf"],
+            max_documents=10,
+            max_concurrency=2,
+            limiter=ConcurrencyLimiter(max_in_flight=2, max_queued=2),
+        )
+    )
+    assert [result.filename for result in results] == ["a.pdf", "b.png", "c.pdf"]
+    assert [result.status_code for result in results] == [200, 415, 200]
+    assert results[0].prediction
+    assert results[1].prediction is None
+    assert results[1].error
+
+
+def test_parse_batch_too_large():
+    with pytest.raises(BatchTooLargeException):
+        anyio.run(
+            lambda: ParserService.parse_batch(
+                documents=[document("a.pdf"), document("b.pdf")],
+                parser=TestParser(),
+                allowed_formats=["application/pdf"],
+                max_documents=1,
+                max_concurrency=2,
+                limiter=ConcurrencyLimiter(max_in_flight=2, max_queued=2),
+            )
+        )
+
+
+def test_parse_batch_endpoint():
+    app.dependency_overrides[get_parser] = lambda: TestParser()
+    app.dependency_overrides[get_parse_limiter] = lambda: ConcurrencyLimiter(
+        max_in_flight=2, max_queued=2
+    )
+    try:
+        with open(FILE_PATH, "rb") as file:
+            content = file.read()
+        response = TestClient(app).post(
+            "/v1/parse/batch",
+            files=[
+                ("upload_files", ("first.pdf", content, "application/pdf")),
+                ("upload_files", ("second.txt", b"text", "text/plain")),
+            ],
+        )
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 200
+    batch = BatchParsedDataInterface.model_validate(response.json())
+    assert [item.status_code for item in batch.results] == [200, 415]
+    assert batch.results[0].data
+    assert batch.results[0].data.invoice.invoice_number == "INV-12345"
+
+
+def test_parse_batch_shares_the_parse_limiter():
+    limiter = ConcurrencyLimiter(max_in_flight=1, max_queued=1)
+    documents = [document(f"{i}.pdf") for i in range(4)]
+    results = anyio.run(
+        lambda: ParserService.parse_batch(
+            documents=documents,
+            parser=TestParser(),
+            allowed_formats=["application/pdf"],
+            max_documents=10,
+            max_concurrency=4,
+            limiter=limiter,
+        )
+    )
+    # One document in flight and one queued, the others shed as single requests would be
+    assert sorted(result.status_code for result in results) == [200, 200, 503, 503]
+    assert limiter.rejected == 2
+
+
+def test_limiter_sheds_load_beyond_queue():
+    limiter = ConcurrencyLimiter(max_in_flight=1, max_queued=1)
+    release = asyncio.Event()
+
+    async def call() -> None:
+        async with limiter.acquire():
+            await release.wait()
+
+    async def main() -> None:
+        running = asyncio.create_task(call())
+        waiting = asyncio.create_task(call())
+        await asyncio.sleep(0)
+        assert (limiter.in_flight, limiter.queued) == (1, 1)
+        with pytest.raises(ServiceUnavailableException):
+            await call()
+        release.set()
+        await asyncio.gather(running, waiting)
+
+    asyncio.run(main())
+    assert (limiter.in_flight, limiter.queued, limiter.rejected) == (0, 0, 1)
@@ -0,0 +1,43 @@
+"""Add indexes and unique constraints for hot queries
+
+Revision ID: a3f1c2d4e5b6
+Revises: 0509cf07780e
+Create Date: 2026-10-18 10:12:31.402118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a3f1c2d4e5b6"
+down_revision: Union[str, None] = "0509cf07780e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Uniqueness already enforced by the services. The unique indexes also serve
+    # lookups on their leftmost column (user_id), so no single-column index is needed.
+    op.create_unique_constraint("uq_user_email", "user", ["email"])
+    op.create_unique_constraint(
+        "uq_client_user_id_client_name", "client", ["user_id", "client_name"]
+    )
+    op.create_unique_constraint(
+        "uq_invoice_user_id_invoice_number", "invoice", ["user_id", "invoice_number"]
+    )
+    op.create_index(
+        "ix_invoice_user_id_invoiced_date",
+        "invoice",
+        ["user_id", "invoiced_date", "invoice_id"],
+    )
+    op.create_index("ix_invoice_client_id", "invoice", ["client_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_invoice_client_id", table_name="invoice")
+    op.drop_index("ix_invoice_user_id_invoiced_date", table_name="invoice")
+    op.drop_constraint("uq_invoice_user_id_invoice_number", "invoice", type_="unique")
+    op.drop_constraint("uq_client_user_id_client_name", "client", type_="unique")
+    op.drop_constraint("uq_user_email", "user", type_="unique")
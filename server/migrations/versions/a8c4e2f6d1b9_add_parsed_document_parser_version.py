@@ -0,0 +1,37 @@
+"""Add parser version to parsed documents
+
+Revision ID: a8c4e2f6d1b9
+Revises: d5e1f8a3b7c2
+Create Date: 2026-10-18 16:48:31.207514
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a8c4e2f6d1b9"
+down_revision: Union[str, None] = "d5e1f8a3b7c2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing results have no known version: never served again, overwritten on the next parse
+    op.add_column(
+        "parsed_document",
+        sa.Column(
+            "parser_version",
+            sqlmodel.sql.sqltypes.AutoString(length=64),
+            nullable=False,
+            server_default="",
+        ),
+    )
+    op.alter_column("parsed_document", "parser_version", server_default=None)
+
+
+def downgrade() -> None:
+    op.drop_column("parsed_document", "parser_version")
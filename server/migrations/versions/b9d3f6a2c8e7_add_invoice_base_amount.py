@@ -0,0 +1,77 @@
+"""Add invoice base amount
+
+Revision ID: b9d3f6a2c8e7
+Revises: f2a7c1e8b5d4
+Create Date: 2026-10-18 15:21:37.604912
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b9d3f6a2c8e7"
+down_revision: Union[str, None] = "f2a7c1e8b5d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Gross amount converted into the base currency (EUR) at write time
+    op.add_column("invoice", sa.Column("base_amount", sa.Float(), nullable=True))
+    op.add_column("invoice", sa.Column("base_rate_date", sa.Date(), nullable=True))
+
+    # Backfill with the latest stored rates. Invoices in a currency they don't cover are left
+    # to the exchange rates refresher, which backfills them once rates are fetched.
+    op.execute(
+        """
+        UPDATE invoice
+        SET base_amount = gross_amount, base_rate_date = CURRENT_DATE
+        WHERE currency = 'EUR'
+        """
+    )
+    op.execute(
+        """
+        UPDATE invoice
+        SET base_amount = invoice.gross_amount / (latest.rates ->> invoice.currency::text)::float,
+            base_rate_date = latest.rate_date
+        FROM (
+            SELECT rate_date, rates FROM exchange_rate
+            WHERE base_currency = 'EUR'
+            ORDER BY rate_date DESC
+            LIMIT 1
+        ) AS latest
+        WHERE invoice.base_amount IS NULL
+          AND latest.rates ->> invoice.currency::text IS NOT NULL
+        """
+    )
+
+    # Keep yearly analytics index-only now that they sum the base amount
+    op.drop_index("ix_invoice_user_id_revenue_date", table_name="invoice")
+    op.create_index(
+        "ix_invoice_user_id_revenue_date",
+        "invoice",
+        ["user_id", "revenue_date"],
+        postgresql_include=["client_id", "currency", "gross_amount", "base_amount", "paid_date"],
+    )
+    op.create_index(
+        "ix_invoice_missing_base_amount",
+        "invoice",
+        ["currency"],
+        postgresql_where=sa.text("base_amount IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_invoice_missing_base_amount", table_name="invoice")
+    op.drop_index("ix_invoice_user_id_revenue_date", table_name="invoice")
+    op.create_index(
+        "ix_invoice_user_id_revenue_date",
+        "invoice",
+        ["user_id", "revenue_date"],
+        postgresql_include=["client_id", "currency", "gross_amount", "paid_date"],
+    )
+    op.drop_column("invoice", "base_rate_date")
+    op.drop_column("invoice", "base_amount")
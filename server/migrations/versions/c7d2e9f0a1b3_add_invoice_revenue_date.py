@@ -0,0 +1,36 @@
+"""Add invoice revenue date
+
+Revision ID: c7d2e9f0a1b3
+Revises: a3f1c2d4e5b6
+Create Date: 2026-10-18 11:04:52.871263
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c7d2e9f0a1b3"
+down_revision: Union[str, None] = "a3f1c2d4e5b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Date used to bucket revenues: paid_date if paid, invoiced_date otherwise
+    op.add_column("invoice", sa.Column("revenue_date", sa.Date(), nullable=True))
+    op.execute("UPDATE invoice SET revenue_date = COALESCE(paid_date, invoiced_date)")
+    op.alter_column("invoice", "revenue_date", existing_type=sa.Date(), nullable=False)
+    op.create_index(
+        "ix_invoice_user_id_revenue_date",
+        "invoice",
+        ["user_id", "revenue_date"],
+        postgresql_include=["client_id", "currency", "gross_amount", "paid_date"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_invoice_user_id_revenue_date", table_name="invoice")
+    op.drop_column("invoice", "revenue_date")
@@ -0,0 +1,39 @@
+"""Add parse job queue
+
+Revision ID: d5e1f8a3b7c2
+Revises: b9d3f6a2c8e7
+Create Date: 2026-10-18 16:05:12.418263
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d5e1f8a3b7c2"
+down_revision: Union[str, None] = "b9d3f6a2c8e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "parse_job",
+        sa.Column("job_id", sa.Uuid(), nullable=False),
+        sa.Column("status", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("job", sa.JSON(), nullable=False),
+        sa.Column("file", sa.LargeBinary(), nullable=True),
+        sa.PrimaryKeyConstraint("job_id"),
+    )
+    op.create_index("ix_parse_job_status_available_at", "parse_job", ["status", "available_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_parse_job_status_available_at", table_name="parse_job")
+    op.drop_table("parse_job")
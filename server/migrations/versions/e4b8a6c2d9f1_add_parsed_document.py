@@ -0,0 +1,34 @@
+"""Add parsed document cache
+
+Revision ID: e4b8a6c2d9f1
+Revises: c7d2e9f0a1b3
+Create Date: 2026-10-18 12:21:07.553190
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4b8a6c2d9f1"
+down_revision: Union[str, None] = "c7d2e9f0a1b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "parsed_document",
+        sa.Column("content_hash", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+        sa.Column("invoice_data", sa.JSON(), nullable=False),
+        sa.Column("client_data", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("content_hash"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("parsed_document")
@@ -0,0 +1,39 @@
+"""Add exchange rate table
+
+Revision ID: f2a7c1e8b5d4
+Revises: e4b8a6c2d9f1
+Create Date: 2026-10-18 13:02:44.190326
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "f2a7c1e8b5d4"
+down_revision: Union[str, None] = "e4b8a6c2d9f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "exchange_rate",
+        sa.Column("rate_date", sa.Date(), nullable=False),
+        sa.Column(
+            "base_currency",
+            # Reuse the enum type created with the invoice table
+            postgresql.ENUM("USD", "EUR", "GBP", "CZK", name="currency", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("rates", sa.JSON(), nullable=False),
+        sa.Column("fetched_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("rate_date", "base_currency"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("exchange_rate")
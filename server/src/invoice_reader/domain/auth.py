@@ -1,9 +1,24 @@
 from datetime import datetime
+from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_serializer
 
 
 class DecodedToken(BaseModel):
     email: str
     exp: datetime
     type: str
+    user_id: UUID | None = None  # Optional signed claim, see `jwt_user_id_claim` setting
+
+    @field_serializer("user_id")
+    def serialize_user_id(self, user_id: UUID | None) -> str | None:
+        return str(user_id) if user_id else None
+
+
+class UserIdentity(BaseModel):
+    """What authenticated requests need to know about the user."""
+
+    user_id: UUID
+    email: str
+    is_disabled: bool = False
+    is_deleted: bool = False  # Tombstone cached on deletion, see `UserService.delete`
@@ -18,3 +18,10 @@ class AmountsCurrencyMismatchException(CustomException):
 
     def __init__(self, message: str):
         super().__init__(message=message, status_code=400)
+
+
+class InvalidCursorException(CustomException):
+    """Exception for malformed pagination cursors."""
+
+    def __init__(self, message: str):
+        super().__init__(message=message, status_code=400)
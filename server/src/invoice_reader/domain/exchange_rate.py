@@ -6,6 +6,9 @@ from invoice_reader.domain.invoice import Currency
 
 type Rates = dict[Currency, float]
 
+# Currency the exchange rates are fetched in, and invoice amounts normalised to
+BASE_CURRENCY = Currency.EUR
+
 
 class ExchangeRates(BaseModel):
     base_currency: Currency
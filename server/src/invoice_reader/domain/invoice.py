@@ -55,3 +55,50 @@ class Invoice(BaseModel):
     user_id: UUID
     storage_path: str
     data: InvoiceData
+    # Gross amount converted into the base currency at write time, with the date of the rates
+    # used. None when no exchange rates were available yet, until backfilled.
+    base_amount: float | None = None
+    base_rate_date: date | None = None
+
+
+class InvoiceImport(BaseModel):
+    """Invoice of a bulk import, along with the content of its file."""
+
+    filename: str
+    file: bytes
+    client_id: UUID
+    data: InvoiceData
+
+
+class ImportStatus(StrEnum):
+    CREATED = "created"
+    FAILED = "failed"
+
+
+class InvoiceImportResult(BaseModel):
+    filename: str
+    invoice_number: str | None = None
+    status: ImportStatus
+    invoice_id: UUID | None = None
+    detail: str | None = None
+
+
+class MonthlyRevenue(BaseModel):
+    """Invoiced amounts of a client aggregated per month and currency. Invoices having a base
+    amount are summed in the base currency, whatever their own currency."""
+
+    month: Annotated[int, Field(ge=1, le=12)]
+    client_id: UUID
+    currency: Currency
+    total_paid: float
+    total_pending: float
+
+
+class ClientRevenue(BaseModel):
+    """Number of invoices of a client and their gross amounts aggregated per currency.
+    Invoices having a base amount are summed in the base currency."""
+
+    client_id: UUID
+    currency: Currency
+    n_invoices: int
+    total: float
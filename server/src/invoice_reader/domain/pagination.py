@@ -0,0 +1,36 @@
+import base64
+from datetime import date
+from typing import Self
+from uuid import UUID
+
+from pydantic import BaseModel, ValidationError
+
+from invoice_reader.domain.exceptions import InvalidCursorException
+
+
+class Cursor(BaseModel):
+    """Keyset pagination position, exchanged with clients as an opaque string."""
+
+    def encode(self) -> str:
+        return base64.urlsafe_b64encode(self.model_dump_json().encode()).decode()
+
+    @classmethod
+    def decode(cls, token: str) -> Self:
+        try:
+            return cls.model_validate_json(base64.urlsafe_b64decode(token.encode()))
+        except (ValueError, ValidationError) as e:
+            raise InvalidCursorException(message="Invalid pagination cursor.") from e
+
+
+class InvoiceCursor(Cursor):
+    """Invoices are listed from the most recently issued."""
+
+    issued_date: date
+    invoice_id: UUID
+
+
+class ClientCursor(Cursor):
+    """Clients are listed by name."""
+
+    client_name: str
+    client_id: UUID
@@ -0,0 +1,41 @@
+from datetime import UTC, datetime
+from enum import StrEnum
+from uuid import UUID, uuid4
+
+from pydantic import BaseModel, Field
+
+from invoice_reader.domain.invoice import InvoiceData
+
+
+def utcnow() -> datetime:
+    return datetime.now(UTC)
+
+
+class ParseJobStatus(StrEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class ParseJob(BaseModel):
+    """Parsing of an uploaded document, run in the background by the parse workers.
+
+    The result is the parsed invoice data along with the client found in the database, if any.
+    """
+
+    id_: UUID = Field(default_factory=uuid4)
+    user_id: UUID
+    status: ParseJobStatus = ParseJobStatus.PENDING
+    attempts: int = 0
+    invoice_data: InvoiceData | None = None
+    client_id: UUID | None = None
+    error: str | None = None
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
+    # Not claimed by a worker before this time, pushed back when a failed attempt is retried
+    available_at: datetime = Field(default_factory=utcnow)
+
+    @property
+    def is_done(self) -> bool:
+        return self.status in (ParseJobStatus.SUCCEEDED, ParseJobStatus.FAILED)
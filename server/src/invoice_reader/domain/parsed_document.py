@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+from invoice_reader.domain.client import ClientData
+from invoice_reader.domain.invoice import InvoiceData
+
+
+class ParsedDocument(BaseModel):
+    """Parser result for a document, identified by the SHA-256 of its content and the version
+    of the parser which produced it."""
+
+    content_hash: str
+    parser_version: str
+    invoice_data: InvoiceData
+    client_data: ClientData
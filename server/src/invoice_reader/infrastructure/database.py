@@ -0,0 +1,110 @@
+from collections.abc import Callable
+from typing import Any
+
+import sqlmodel
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_fastapi_instrumentator.metrics import Info
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.pool import PoolProxiedConnection, QueuePool
+from sqlmodel import Session
+
+from invoice_reader.services.exceptions import ExistingEntityException
+
+# SQLSTATE of unique constraint violations on Postgres
+UNIQUE_VIOLATION = "23505"
+
+POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total",
+    "Number of connections checked out from the pool.",
+)
+POOL_CONNECTIONS = Counter(
+    "db_pool_connections_total",
+    "Number of new DBAPI connections opened by the pool.",
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the pool.",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+
+
+class TimedQueuePool(QueuePool):
+    """Queue pool recording the time spent waiting for each checkout.
+    Timed in the pool rather than around the session: sessions stay lazy and only check a
+    connection out on their first query, requests served from caches never do."""
+
+    def connect(self) -> PoolProxiedConnection:
+        with POOL_CHECKOUT_WAIT.time():
+            return super().connect()
+
+
+def create_db_engine(
+    database_url: str,
+    pool_size: int,
+    max_overflow: int,
+    pool_recycle: int,
+    pool_timeout: int,
+) -> Engine:
+    """Create the database engine with connection pooling.
+    Meant to be called once per worker, in the app lifespan.
+    """
+    engine = sqlmodel.create_engine(
+        database_url,
+        echo=False,
+        poolclass=TimedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_pre_ping=True,  # Verify connections are alive before using
+        pool_recycle=pool_recycle,
+    )
+    event.listen(engine, "checkout", _on_checkout)
+    event.listen(engine, "connect", _on_connect)
+    return engine
+
+
+def commit_unique(session: Session, message: str) -> None:
+    """Commit the session. A unique constraint violation, e.g. from a concurrent insert racing
+    the service checks, is rolled back and raised as `ExistingEntityException(message)`."""
+    try:
+        session.commit()
+    except IntegrityError as e:
+        session.rollback()
+        if is_unique_violation(e):
+            raise ExistingEntityException(message=message) from e
+        raise
+
+
+def is_unique_violation(error: IntegrityError) -> bool:
+    # Postgres reports the SQLSTATE, SQLite only a message
+    return getattr(
+        error.orig, "pgcode", None
+    ) == UNIQUE_VIOLATION or "UNIQUE constraint failed" in str(error.orig)
+
+
+def _on_checkout(*args: Any) -> None:
+    POOL_CHECKOUTS.inc()
+
+
+def _on_connect(*args: Any) -> None:
+    POOL_CONNECTIONS.inc()
+
+
+def pool_metrics() -> Callable[[Info], None]:
+    """Instrumentator metric sampling the pool state of the engine stored in `app.state`."""
+    checked_out = Gauge("db_pool_checked_out", "Connections currently checked out.")
+    overflow = Gauge("db_pool_overflow", "Overflow connections currently opened.")
+    size = Gauge("db_pool_size", "Configured pool size.")
+
+    def instrumentation(info: Info) -> None:
+        engine: Engine | None = getattr(info.request.app.state, "engine", None)
+        if engine is None or not isinstance(engine.pool, QueuePool):
+            return
+        pool = engine.pool
+        checked_out.set(pool.checkedout())
+        overflow.set(max(pool.overflow(), 0))
+        size.set(pool.size())
+
+    return instrumentation
@@ -38,27 +38,30 @@ class ExchangeRatesUniRateAPI(IExchangeRateService):
     def get_exchange_rates(self, base_currency: Currency) -> ExchangeRates:
         url = f"{self.base_url}/rates"
         response = httpx.get(url=url, params={"api_key": self.api_key, "from": base_currency})
+        return _read_rates_response(response, base_currency=base_currency)
 
-        if response.status_code == 200:
-            rates = {
-                Currency(curr): rate
-                for curr, rate in response.json()["rates"].items()
-                if curr.upper() in Currency._member_names_
-            }
-            return ExchangeRates(
-                base_currency=base_currency,
-                rate_date=date.today(),
-                rates=rates,
-            )
 
-        elif response.status_code == 401:
-            raise Exception("Invalid API key for exchange rates service")
-        elif response.status_code == 400:
-            raise Exception("Bad request to exchange rates service")
-        elif response.status_code == 404:
-            raise Exception("Exchange rates not found for the given date")
-        elif response.status_code >= 500:
-            raise Exception("Exchange rates service is currently unavailable")
-        else:
-            logger.error("Unexpected error from exchange rate service: {}", response.text)
-            raise Exception("Error fetching exchange rates.")
+def _read_rates_response(response: httpx.Response, base_currency: Currency) -> ExchangeRates:
+    if response.status_code == 200:
+        rates = {
+            Currency(curr): rate
+            for curr, rate in response.json()["rates"].items()
+            if curr.upper() in Currency._member_names_
+        }
+        return ExchangeRates(
+            base_currency=base_currency,
+            rate_date=date.today(),
+            rates=rates,
+        )
+
+    elif response.status_code == 401:
+        raise Exception("Invalid API key for exchange rates service")
+    elif response.status_code == 400:
+        raise Exception("Bad request to exchange rates service")
+    elif response.status_code == 404:
+        raise Exception("Exchange rates not found for the given date")
+    elif response.status_code >= 500:
+        raise Exception("Exchange rates service is currently unavailable")
+    else:
+        logger.error("Unexpected error from exchange rate service: {}", response.text)
+        raise Exception("Error fetching exchange rates.")
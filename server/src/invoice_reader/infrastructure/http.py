@@ -0,0 +1,119 @@
+import math
+import random
+import time
+from collections.abc import Awaitable, Callable
+from importlib.util import find_spec
+
+import anyio
+import httpx
+
+from invoice_reader.utils.logger import get_logger
+
+logger = get_logger()
+
+# HTTP/2 requires the optional `h2` package (httpx[http2])
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+# The request never reached the server, or the server is unavailable: safe to send again
+RETRY_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+RETRY_STATUS_CODES = frozenset({502, 503, 504})
+
+
+def create_http_client(
+    timeout: float, max_connections: int, max_keepalive_connections: int
+) -> httpx.Client:
+    """Long-lived HTTP client reusing connections across requests.
+    Meant to be created once per worker, in the app lifespan."""
+    return httpx.Client(
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        ),
+        http2=HTTP2_AVAILABLE,
+    )
+
+
+def create_async_http_client(
+    timeout: float, max_connections: int, max_keepalive_connections: int
+) -> httpx.AsyncClient:
+    """Async counterpart of `create_http_client`."""
+    return httpx.AsyncClient(
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        ),
+        http2=HTTP2_AVAILABLE,
+    )
+
+
+def send_with_retry(
+    send: Callable[[], httpx.Response],
+    max_retries: int,
+    backoff: float,
+    max_elapsed: float = math.inf,
+) -> httpx.Response:
+    """Call `send`, retrying with jittered exponential backoff when the ML server could not be
+    reached (connection errors) or is unavailable (502, 503, 504).
+    Read timeouts are not retried: the server may still be busy with the request, and each
+    retry would hold the caller for another full timeout. No retry starts once `max_elapsed`
+    seconds would be exceeded. The last attempt returns or raises as is."""
+    deadline = time.monotonic() + max_elapsed
+    attempt = 0
+    while True:
+        try:
+            response = send()
+        except RETRY_ERRORS as e:
+            if (delay := _retry_delay(attempt, max_retries, backoff, deadline)) is None:
+                raise
+            logger.warning("Attempt {} failed with error: {!r}", attempt + 1, e)
+        else:
+            if response.status_code not in RETRY_STATUS_CODES or (
+                (delay := _retry_delay(attempt, max_retries, backoff, deadline)) is None
+            ):
+                return response
+            logger.warning("Attempt {} failed with status {}.", attempt + 1, response.status_code)
+        time.sleep(delay)
+        attempt += 1
+
+
+async def send_with_retry_async(
+    send: Callable[[], Awaitable[httpx.Response]],
+    max_retries: int,
+    backoff: float,
+    max_elapsed: float = math.inf,
+) -> httpx.Response:
+    """Async counterpart of `send_with_retry`."""
+    deadline = time.monotonic() + max_elapsed
+    attempt = 0
+    while True:
+        try:
+            response = await send()
+        except RETRY_ERRORS as e:
+            if (delay := _retry_delay(attempt, max_retries, backoff, deadline)) is None:
+                raise
+            logger.warning("Attempt {} failed with error: {!r}", attempt + 1, e)
+        else:
+            if response.status_code not in RETRY_STATUS_CODES or (
+                (delay := _retry_delay(attempt, max_retries, backoff, deadline)) is None
+            ):
+                return response
+            logger.warning("Attempt {} failed with status {}.", attempt + 1, response.status_code)
+        await anyio.sleep(delay)
+        attempt += 1
+
+
+def _retry_delay(attempt: int, max_retries: int, backoff: float, deadline: float) -> float | None:
+    """Delay before the next attempt, None when the retries or the time budget are spent."""
+    if attempt >= max_retries:
+        return None
+    delay = _backoff_delay(attempt=attempt, backoff=backoff)
+    if time.monotonic() + delay > deadline:
+        return None
+    return delay
+
+
+def _backoff_delay(attempt: int, backoff: float) -> float:
+    """Full jitter: spread retries from concurrent requests over the backoff window."""
+    return random.uniform(0, backoff * 2**attempt)
@@ -1,5 +1,15 @@
 from .client import ClientModel
+from .exchange_rate import ExchangeRateModel
 from .invoice import InvoiceModel
+from .parse_job import ParseJobModel
+from .parsed_document import ParsedDocumentModel
 from .user import UserModel
 
-__all__ = ["InvoiceModel", "UserModel", "ClientModel"]
+__all__ = [
+    "InvoiceModel",
+    "UserModel",
+    "ClientModel",
+    "ParsedDocumentModel",
+    "ExchangeRateModel",
+    "ParseJobModel",
+]
@@ -1,10 +1,14 @@
 from uuid import UUID
 
+from sqlalchemy import UniqueConstraint
 from sqlmodel import Field, SQLModel  # type: ignore
 
 
 class ClientModel(SQLModel, table=True):
     __tablename__ = "client"  # type: ignore
+    __table_args__ = (
+        UniqueConstraint("user_id", "client_name", name="uq_client_user_id_client_name"),
+    )
 
     client_id: UUID = Field(primary_key=True)
     user_id: UUID = Field(foreign_key="user.user_id")
@@ -0,0 +1,15 @@
+from datetime import date, datetime
+
+from sqlalchemy import JSON, Column
+from sqlmodel import Field, SQLModel  # type: ignore
+
+from invoice_reader.domain.invoice import Currency
+
+
+class ExchangeRateModel(SQLModel, table=True):
+    __tablename__ = "exchange_rate"  # type: ignore
+
+    rate_date: date = Field(primary_key=True)
+    base_currency: Currency = Field(primary_key=True)
+    rates: dict[str, float] = Field(sa_column=Column(JSON, nullable=False))
+    fetched_at: datetime
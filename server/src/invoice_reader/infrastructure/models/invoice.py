@@ -1,6 +1,7 @@
 from datetime import date
 from uuid import UUID
 
+from sqlalchemy import Index, UniqueConstraint, text
 from sqlmodel import Field, SQLModel  # type: ignore
 
 from invoice_reader.domain.invoice import Currency
@@ -8,6 +9,32 @@ from invoice_reader.domain.invoice import Currency
 
 class InvoiceModel(SQLModel, table=True):
     __tablename__ = "invoice"  # type: ignore
+    __table_args__ = (
+        # Also serves the lookups on user_id alone (leftmost prefix)
+        UniqueConstraint("user_id", "invoice_number", name="uq_invoice_user_id_invoice_number"),
+        # Year range scans and keyset pagination on (invoiced_date, invoice_id)
+        Index("ix_invoice_user_id_invoiced_date", "user_id", "invoiced_date", "invoice_id"),
+        Index("ix_invoice_client_id", "client_id"),
+        # Yearly analytics, index-only on Postgres thanks to the included columns
+        Index(
+            "ix_invoice_user_id_revenue_date",
+            "user_id",
+            "revenue_date",
+            postgresql_include=[
+                "client_id",
+                "currency",
+                "gross_amount",
+                "base_amount",
+                "paid_date",
+            ],
+        ),
+        # Invoices left to backfill, once exchange rates are available
+        Index(
+            "ix_invoice_missing_base_amount",
+            "currency",
+            postgresql_where=text("base_amount IS NULL"),
+        ),
+    )
 
     invoice_id: UUID = Field(primary_key=True)
     user_id: UUID = Field(foreign_key="user.user_id")
@@ -20,5 +47,8 @@ class InvoiceModel(SQLModel, table=True):
     description: str
     invoiced_date: date
     paid_date: date | None = None
+    revenue_date: date  # paid_date if paid, invoiced_date otherwise
+    base_amount: float | None = None  # gross_amount in the base currency
+    base_rate_date: date | None = None  # date of the exchange rates used for base_amount
     uploaded_date: date | None = Field(default_factory=date.today)
     last_updated_date: date | None = Field(default_factory=date.today)
@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import JSON, Column, DateTime, Index, LargeBinary
+from sqlmodel import Field, SQLModel  # type: ignore
+
+
+class ParseJobModel(SQLModel, table=True):
+    __tablename__ = "parse_job"  # type: ignore
+    __table_args__ = (
+        # Claims look for the oldest available job
+        Index("ix_parse_job_status_available_at", "status", "available_at"),
+    )
+
+    job_id: UUID = Field(primary_key=True)
+    status: str
+    created_at: datetime = Field(sa_column=Column(DateTime(timezone=True), nullable=False))
+    updated_at: datetime = Field(sa_column=Column(DateTime(timezone=True), nullable=False))
+    available_at: datetime = Field(sa_column=Column(DateTime(timezone=True), nullable=False))
+    job: dict[str, Any] = Field(sa_column=Column(JSON, nullable=False))
+    file: bytes | None = Field(default=None, sa_column=Column(LargeBinary, nullable=True))
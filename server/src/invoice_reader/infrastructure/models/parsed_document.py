@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import JSON, Column
+from sqlmodel import Field, SQLModel  # type: ignore
+
+
+class ParsedDocumentModel(SQLModel, table=True):
+    __tablename__ = "parsed_document"  # type: ignore
+
+    content_hash: str = Field(primary_key=True, max_length=64)  # SHA-256 hex digest
+    parser_version: str = Field(max_length=64)
+    invoice_data: dict[str, Any] = Field(sa_column=Column(JSON, nullable=False))
+    client_data: dict[str, Any] = Field(sa_column=Column(JSON, nullable=False))
+    created_at: datetime = Field(default_factory=datetime.now)
@@ -1,10 +1,12 @@
 from uuid import UUID
 
+from sqlalchemy import UniqueConstraint
 from sqlmodel import Field, SQLModel  # type: ignore
 
 
 class UserModel(SQLModel, table=True):
     __tablename__ = "user"  # type: ignore
+    __table_args__ = (UniqueConstraint("email", name="uq_user_email"),)
 
     user_id: UUID = Field(primary_key=True)
     email: str
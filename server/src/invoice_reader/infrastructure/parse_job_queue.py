@@ -0,0 +1,319 @@
+import sqlite3
+from datetime import datetime, timedelta
+from threading import Lock
+from uuid import UUID
+
+from sqlalchemy import and_, delete, func, or_
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+
+from invoice_reader.domain.parse_job import ParseJob, ParseJobStatus, utcnow
+from invoice_reader.infrastructure.models import ParseJobModel
+from invoice_reader.services.interfaces.parse_job_queue import IParseJobQueue
+
+
+class InMemoryParseJobQueue(IParseJobQueue):
+    """Thread-safe in-process queue. Jobs are only visible to the worker process holding them,
+    which fits a single worker or tests."""
+
+    def __init__(self) -> None:
+        self.jobs: dict[UUID, ParseJob] = {}
+        self.files: dict[UUID, bytes] = {}
+        self._lock = Lock()
+
+    def submit(self, job: ParseJob, file: bytes) -> None:
+        with self._lock:
+            self.jobs[job.id_] = job
+            self.files[job.id_] = file
+
+    def claim(self, lease: float) -> tuple[ParseJob, bytes] | None:
+        now = utcnow()
+        with self._lock:
+            job = min(
+                (job for job in self.jobs.values() if _is_claimable(job, now=now, lease=lease)),
+                key=lambda job: job.created_at,
+                default=None,
+            )
+            if job is None:
+                return None
+            job = _claimed(job, now=now)
+            self.jobs[job.id_] = job
+            return job, self.files[job.id_]
+
+    def save(self, job: ParseJob) -> None:
+        with self._lock:
+            self.jobs[job.id_] = job
+            if job.is_done:
+                self.files.pop(job.id_, None)
+
+    def get(self, job_id: UUID) -> ParseJob | None:
+        return self.jobs.get(job_id)
+
+    def count_pending(self) -> int:
+        with self._lock:
+            return sum(job.status == ParseJobStatus.PENDING for job in self.jobs.values())
+
+    def purge(self, done_before: datetime) -> int:
+        with self._lock:
+            expired = [
+                job.id_
+                for job in self.jobs.values()
+                if job.is_done and job.updated_at < done_before
+            ]
+            for job_id in expired:
+                del self.jobs[job_id]
+                self.files.pop(job_id, None)
+            return len(expired)
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteParseJobQueue(IParseJobQueue):
+    """Queue stored in a SQLite database file, shared by the worker processes of a host.
+
+    Claims run in an immediate transaction, so a job is only claimed by one worker.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        # A single connection per process, serialized by the lock
+        self._connection = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._lock = Lock()
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS parse_job (
+                    job_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    available_at REAL NOT NULL,
+                    job TEXT NOT NULL,
+                    file BLOB
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_parse_job_status_available_at "
+                "ON parse_job (status, available_at)"
+            )
+
+    def submit(self, job: ParseJob, file: bytes) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO parse_job (job_id, status, created_at, updated_at, available_at, "
+                "job, file) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (*_columns(job), file),
+            )
+
+    def claim(self, lease: float) -> tuple[ParseJob, bytes] | None:
+        now = utcnow()
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._connection.execute(
+                    "SELECT job, file FROM parse_job "
+                    "WHERE (status = ? AND available_at <= ?) OR (status = ? AND updated_at <= ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (
+                        ParseJobStatus.PENDING,
+                        now.timestamp(),
+                        ParseJobStatus.RUNNING,
+                        now.timestamp() - lease,
+                    ),
+                ).fetchone()
+                if row is None:
+                    self._connection.execute("COMMIT")
+                    return None
+                job = _claimed(ParseJob.model_validate_json(row[0]), now=now)
+                self._update(job)
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        return job, row[1]
+
+    def save(self, job: ParseJob) -> None:
+        with self._lock:
+            self._update(job)
+
+    def get(self, job_id: UUID) -> ParseJob | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT job FROM parse_job WHERE job_id = ?", (str(job_id),)
+            ).fetchone()
+        return ParseJob.model_validate_json(row[0]) if row else None
+
+    def count_pending(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT count(*) FROM parse_job WHERE status = ?", (ParseJobStatus.PENDING,)
+            ).fetchone()
+        return count
+
+    def purge(self, done_before: datetime) -> int:
+        with self._lock:
+            cursor = self._connection.execute(
+                "DELETE FROM parse_job WHERE status IN (?, ?) AND updated_at < ?",
+                (ParseJobStatus.SUCCEEDED, ParseJobStatus.FAILED, done_before.timestamp()),
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _update(self, job: ParseJob) -> None:
+        job_id, status, created_at, updated_at, available_at, data = _columns(job)
+        # The document is dropped once the job is done
+        self._connection.execute(
+            "UPDATE parse_job SET status = ?, updated_at = ?, available_at = ?, job = ?, "
+            "file = CASE WHEN ? THEN NULL ELSE file END WHERE job_id = ?",
+            (status, updated_at, available_at, data, job.is_done, job_id),
+        )
+
+
+class SQLModelParseJobQueue(IParseJobQueue):
+    """Queue stored in the application database, shared by every worker of every replica.
+
+    Claims lock the claimed row and skip the rows locked by concurrent claims on Postgres, so
+    a job is only claimed by one worker.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+
+    def submit(self, job: ParseJob, file: bytes) -> None:
+        with Session(self.engine) as session:
+            session.add(
+                ParseJobModel(
+                    job_id=job.id_,
+                    status=job.status,
+                    created_at=job.created_at,
+                    updated_at=job.updated_at,
+                    available_at=job.available_at,
+                    job=job.model_dump(mode="json"),
+                    file=file,
+                )
+            )
+            session.commit()
+
+    def claim(self, lease: float) -> tuple[ParseJob, bytes] | None:
+        now = utcnow()
+        with Session(self.engine) as session:
+            model = session.exec(
+                select(ParseJobModel)
+                .where(
+                    or_(
+                        and_(
+                            ParseJobModel.status == ParseJobStatus.PENDING,
+                            ParseJobModel.available_at <= now,
+                        ),
+                        and_(
+                            ParseJobModel.status == ParseJobStatus.RUNNING,
+                            ParseJobModel.updated_at <= now - timedelta(seconds=lease),
+                        ),
+                    )
+                )
+                .order_by(ParseJobModel.created_at)  # type: ignore
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            ).first()
+            if model is None:
+                return None
+            job = _claimed(ParseJob.model_validate(model.job), now=now)
+            file = model.file or b""
+            _update_model(model, job)
+            session.add(model)
+            session.commit()
+        return job, file
+
+    def save(self, job: ParseJob) -> None:
+        with Session(self.engine) as session:
+            model = session.get(ParseJobModel, job.id_)
+            if model is None:
+                return
+            _update_model(model, job)
+            session.add(model)
+            session.commit()
+
+    def get(self, job_id: UUID) -> ParseJob | None:
+        with Session(self.engine) as session:
+            model = session.get(ParseJobModel, job_id)
+            return ParseJob.model_validate(model.job) if model else None
+
+    def count_pending(self) -> int:
+        with Session(self.engine) as session:
+            return session.exec(
+                select(func.count())
+                .select_from(ParseJobModel)
+                .where(ParseJobModel.status == ParseJobStatus.PENDING)
+            ).one()
+
+    def purge(self, done_before: datetime) -> int:
+        with Session(self.engine) as session:
+            result = session.execute(
+                delete(ParseJobModel).where(
+                    ParseJobModel.status.in_(  # type: ignore
+                        [ParseJobStatus.SUCCEEDED, ParseJobStatus.FAILED]
+                    ),
+                    ParseJobModel.updated_at < done_before,  # type: ignore
+                )
+            )
+            session.commit()
+            return result.rowcount
+
+    def close(self) -> None:
+        # The engine is owned by the app lifespan
+        pass
+
+
+def create_parse_job_queue(backend: str, sqlite_path: str, engine: Engine) -> IParseJobQueue:
+    match backend:
+        case "database":
+            return SQLModelParseJobQueue(engine=engine)
+        case "memory":
+            return InMemoryParseJobQueue()
+        case "sqlite":
+            return SQLiteParseJobQueue(path=sqlite_path)
+        case _:
+            raise ValueError(f"Unknown parse job queue backend: {backend}.")
+
+
+def _is_claimable(job: ParseJob, now: datetime, lease: float) -> bool:
+    if job.status == ParseJobStatus.PENDING:
+        return job.available_at <= now
+    if job.status == ParseJobStatus.RUNNING:
+        return job.updated_at <= now - timedelta(seconds=lease)
+    return False
+
+
+def _claimed(job: ParseJob, now: datetime) -> ParseJob:
+    return job.model_copy(
+        update={"status": ParseJobStatus.RUNNING, "attempts": job.attempts + 1, "updated_at": now}
+    )
+
+
+def _update_model(model: ParseJobModel, job: ParseJob) -> None:
+    model.status = job.status
+    model.updated_at = job.updated_at
+    model.available_at = job.available_at
+    model.job = job.model_dump(mode="json")
+    if job.is_done:
+        # The document is dropped once the job is done
+        model.file = None
+
+
+def _columns(job: ParseJob) -> tuple[str, str, float, float, float, str]:
+    return (
+        str(job.id_),
+        job.status,
+        job.created_at.timestamp(),
+        job.updated_at.timestamp(),
+        job.available_at.timestamp(),
+        job.model_dump_json(),
+    )
@@ -1,17 +1,35 @@
-from datetime import date
+import hashlib
+import math
+from datetime import date, datetime, timedelta
 from typing import BinaryIO
 
 import httpx
+from anyio import to_thread
+from prometheus_client import Counter
 
 from invoice_reader.domain.client import ClientData
 from invoice_reader.domain.invoice import Currency, InvoiceData
+from invoice_reader.domain.parsed_document import ParsedDocument
+from invoice_reader.infrastructure.cache import TTLCache
+from invoice_reader.infrastructure.http import send_with_retry, send_with_retry_async
 from invoice_reader.infrastructure.schemas.parser import ParsedData
 from invoice_reader.services.exceptions import InfrastructureException
-from invoice_reader.services.interfaces.parser import IParser
+from invoice_reader.services.interfaces.parser import IAsyncParser, IParser
+from invoice_reader.services.interfaces.repositories import IParsedDocumentRepository
 from invoice_reader.settings import get_settings
 
 settings = get_settings()
 
+PARSE_CACHE_HITS = Counter(
+    "parse_cache_hits_total",
+    "Parser results served from the cache, by tier.",
+    ["tier"],
+)
+PARSE_CACHE_MISSES = Counter(
+    "parse_cache_misses_total",
+    "Documents sent to the parser because their result was not cached.",
+)
+
 
 class TestParser(IParser):
     def parse(self, file: BinaryIO) -> tuple[InvoiceData, ClientData]:
@@ -34,26 +52,226 @@ class TestParser(IParser):
         return invoice_data, client_data
 
 
+class ThreadedParser(IAsyncParser):
+    """Run a blocking parser in the worker threadpool."""
+
+    def __init__(self, parser: IParser) -> None:
+        self.parser = parser
+
+    async def parse(self, file: BinaryIO) -> tuple[InvoiceData, ClientData]:
+        return await to_thread.run_sync(self.parser.parse, file)
+
+
+class CachedParser(IParser):
+    """Serve parser results from a content-addressed cache before calling the parser.
+    Looks up the in-process LRU tier, then the persistent tier if any. Both tiers expire
+    results after the TTL of the in-process tier, and only serve those of `parser_version`."""
+
+    def __init__(
+        self,
+        parser: IParser,
+        cache: TTLCache[str, ParsedDocument],
+        repository: IParsedDocumentRepository | None = None,
+        parser_version: str = "",
+    ) -> None:
+        self.parser = parser
+        self.cache = cache
+        self.repository = repository
+        self.parser_version = parser_version
+
+    def parse(self, file: BinaryIO) -> tuple[InvoiceData, ClientData]:
+        content_hash = hash_content(file)
+        parsed_document = _get_cached(
+            content_hash,
+            parser_version=self.parser_version,
+            cache=self.cache,
+            repository=self.repository,
+        )
+        if not parsed_document:
+            invoice_data, client_data = self.parser.parse(file=file)
+            parsed_document = ParsedDocument(
+                content_hash=content_hash,
+                parser_version=self.parser_version,
+                invoice_data=invoice_data,
+                client_data=client_data,
+            )
+            _set_cached(parsed_document, cache=self.cache, repository=self.repository)
+        return parsed_document.invoice_data, parsed_document.client_data
+
+
+class AsyncCachedParser(IAsyncParser):
+    """Same as `CachedParser` for async parsers.
+    Hashing and the persistent tier are run in the worker threadpool."""
+
+    def __init__(
+        self,
+        parser: IAsyncParser,
+        cache: TTLCache[str, ParsedDocument],
+        repository: IParsedDocumentRepository | None = None,
+        parser_version: str = "",
+    ) -> None:
+        self.parser = parser
+        self.cache = cache
+        self.repository = repository
+        self.parser_version = parser_version
+
+    async def parse(self, file: BinaryIO) -> tuple[InvoiceData, ClientData]:
+        content_hash = await to_thread.run_sync(hash_content, file)
+        parsed_document = await to_thread.run_sync(
+            lambda: _get_cached(
+                content_hash,
+                parser_version=self.parser_version,
+                cache=self.cache,
+                repository=self.repository,
+            )
+        )
+        if not parsed_document:
+            invoice_data, client_data = await self.parser.parse(file=file)
+            parsed_document = ParsedDocument(
+                content_hash=content_hash,
+                parser_version=self.parser_version,
+                invoice_data=invoice_data,
+                client_data=client_data,
+            )
+            await to_thread.run_sync(
+                lambda: _set_cached(parsed_document, cache=self.cache, repository=self.repository)
+            )
+        return parsed_document.invoice_data, parsed_document.client_data
+
+
+def hash_content(file: BinaryIO) -> str:
+    """SHA-256 hex digest of the file, read in chunks. The file is rewound afterwards."""
+    file.seek(0)
+    content_hash = hashlib.file_digest(file, "sha256").hexdigest()
+    file.seek(0)
+    return content_hash
+
+
+def _get_cached(
+    content_hash: str,
+    parser_version: str,
+    cache: TTLCache[str, ParsedDocument],
+    repository: IParsedDocumentRepository | None,
+) -> ParsedDocument | None:
+    parsed_document = cache.get(content_hash)
+    if parsed_document and parsed_document.parser_version == parser_version:
+        PARSE_CACHE_HITS.labels(tier="memory").inc()
+        return parsed_document
+    created_after = datetime.now() - timedelta(seconds=cache.ttl)
+    if repository and (
+        parsed_document := repository.get(
+            content_hash=content_hash, parser_version=parser_version, created_after=created_after
+        )
+    ):
+        PARSE_CACHE_HITS.labels(tier="persistent").inc()
+        cache.set(content_hash, parsed_document)
+        return parsed_document
+    PARSE_CACHE_MISSES.inc()
+    return None
+
+
+def _set_cached(
+    parsed_document: ParsedDocument,
+    cache: TTLCache[str, ParsedDocument],
+    repository: IParsedDocumentRepository | None,
+) -> None:
+    cache.set(parsed_document.content_hash, parsed_document)
+    if repository:
+        repository.add(parsed_document=parsed_document)
+
+
 class MLServerParser(IParser):
-    def __init__(self, parser_endpoint_url: str) -> None:
+    """Parse documents with the ML server.
+    The HTTP client is shared across requests, see the app lifespan."""
+
+    def __init__(
+        self,
+        client: httpx.Client,
+        parser_endpoint_url: str,
+        max_retries: int = 0,
+        retry_backoff: float = 0.5,
+        retry_max_elapsed: float = math.inf,
+    ) -> None:
+        self.client = client
         self.ml_server_url = parser_endpoint_url
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.retry_max_elapsed = retry_max_elapsed
 
     def parse(self, file: BinaryIO) -> tuple[InvoiceData, ClientData]:
-        """Parse document using the /parser endpoint from the ML server."""
-        files = {"upload_file": ("document.pdf", file, "application/pdf")}
-        response = httpx.post(self.ml_server_url, files=files, timeout=60.0)
-        if response.status_code != 200:
-            raise InfrastructureException(
-                message=f"""Failed to parse the invoice document.\n Error: {response.text}. 
-                Response status: {response.status_code}""",
+        """Parse document using the /parser endpoint from the ML server.
+        The file is streamed in chunks from its current spool, never loaded in memory."""
+
+        def send() -> httpx.Response:
+            file.seek(0)
+            files = {"upload_file": ("document.pdf", file, "application/pdf")}
+            return self.client.post(self.ml_server_url, files=files)
+
+        try:
+            response = send_with_retry(
+                send,
+                max_retries=self.max_retries,
+                backoff=self.retry_backoff,
+                max_elapsed=self.retry_max_elapsed,
             )
+        except httpx.TransportError as e:
+            raise InfrastructureException(
+                message=f"ML server unreachable. Error: {e!r}", status_code=503
+            ) from e
+        return _read_parser_response(response)
+
+
+class AsyncMLServerParser(IAsyncParser):
+    """Parse documents with the ML server without holding a worker thread.
+    The HTTP client is shared across requests, see the app lifespan."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        parser_endpoint_url: str,
+        max_retries: int = 0,
+        retry_backoff: float = 0.5,
+        retry_max_elapsed: float = math.inf,
+    ) -> None:
+        self.client = client
+        self.ml_server_url = parser_endpoint_url
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.retry_max_elapsed = retry_max_elapsed
+
+    async def parse(self, file: BinaryIO) -> tuple[InvoiceData, ClientData]:
+        async def send() -> httpx.Response:
+            file.seek(0)
+            files = {"upload_file": ("document.pdf", file, "application/pdf")}
+            return await self.client.post(self.ml_server_url, files=files)
+
         try:
-            parsed_data = ParsedData.model_validate(response.json())
-        except Exception as e:
+            response = await send_with_retry_async(
+                send,
+                max_retries=self.max_retries,
+                backoff=self.retry_backoff,
+                max_elapsed=self.retry_max_elapsed,
+            )
+        except httpx.TransportError as e:
             raise InfrastructureException(
-                message="Failed to parse the invoice document. Error: " + str(e),
-                status_code=422,
+                message=f"ML server unreachable. Error: {e!r}", status_code=503
             ) from e
-        client_data = parsed_data.client.to_client_data()
-        invoice_data = parsed_data.invoice.to_invoice_data()
-        return invoice_data, client_data
+        return _read_parser_response(response)
+
+
+def _read_parser_response(response: httpx.Response) -> tuple[InvoiceData, ClientData]:
+    if response.status_code != 200:
+        raise InfrastructureException(
+            message=f"""Failed to parse the invoice document.\n Error: {response.text}. 
+            Response status: {response.status_code}""",
+        )
+    try:
+        parsed_data = ParsedData.model_validate(response.json())
+    except Exception as e:
+        raise InfrastructureException(
+            message="Failed to parse the invoice document. Error: " + str(e),
+            status_code=422,
+        ) from e
+    client_data = parsed_data.client.to_client_data()
+    invoice_data = parsed_data.invoice.to_invoice_data()
+    return invoice_data, client_data
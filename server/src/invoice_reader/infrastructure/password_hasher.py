@@ -0,0 +1,86 @@
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from threading import BoundedSemaphore
+
+from passlib.context import CryptContext
+from prometheus_client import Counter, Histogram
+
+from invoice_reader.services.exceptions import TooManyRequestsException
+from invoice_reader.services.interfaces.password_hasher import IPasswordHasher
+
+PASSWORD_HASHING_SECONDS = Histogram(
+    "password_hashing_seconds",
+    "Time spent hashing or verifying a password, queueing included.",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+PASSWORD_HASHING_REJECTED = Counter(
+    "password_hashing_rejected_total",
+    "Password operations rejected because the hashing pool was saturated.",
+)
+
+
+@lru_cache
+def _crypt_context(rounds: int) -> CryptContext:
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+def hash_password(password: str, rounds: int) -> str:
+    return _crypt_context(rounds).hash(password)
+
+
+def verify_password(password: str, hashed_password: str, rounds: int) -> bool:
+    """The cost of an existing hash is read from the hash itself, not `rounds`."""
+    return _crypt_context(rounds).verify(password, hashed_password)
+
+
+class BcryptPasswordHasher(IPasswordHasher):
+    """Hash passwords in the calling thread."""
+
+    def __init__(self, rounds: int) -> None:
+        self.rounds = rounds
+
+    def hash(self, password: str) -> str:
+        with PASSWORD_HASHING_SECONDS.labels(operation="hash").time():
+            return hash_password(password, self.rounds)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        with PASSWORD_HASHING_SECONDS.labels(operation="verify").time():
+            return verify_password(password, hashed_password, self.rounds)
+
+
+class ProcessPoolPasswordHasher(IPasswordHasher):
+    """Hash passwords in a dedicated process pool, so bcrypt neither holds the GIL of the
+    worker nor its threadpool. At most `max_workers + max_pending` operations are admitted
+    at once, further ones are rejected with a 429 instead of queueing.
+    Meant to be created once per worker, in the app lifespan."""
+
+    def __init__(self, max_workers: int, max_pending: int, rounds: int) -> None:
+        self.rounds = rounds
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self.slots = BoundedSemaphore(max_workers + max_pending)
+
+    def hash(self, password: str) -> str:
+        return self._run("hash", hash_password, password, self.rounds)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        return self._run("verify", verify_password, password, hashed_password, self.rounds)
+
+    def _run[T](self, operation: str, function: Callable[..., T], *args: object) -> T:
+        if not self.slots.acquire(blocking=False):
+            PASSWORD_HASHING_REJECTED.inc()
+            raise TooManyRequestsException(
+                message="Too many authentication requests. Please retry later."
+            )
+        try:
+            with PASSWORD_HASHING_SECONDS.labels(operation=operation).time():
+                return self.executor.submit(function, *args).result()
+        finally:
+            self.slots.release()
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
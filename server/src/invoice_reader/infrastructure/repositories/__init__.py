@@ -1,7 +1,8 @@
 from .client import SQLModelClientRepository
-from .exchange_rate import InMemoryExchangeRateRepository
+from .exchange_rate import InMemoryExchangeRateRepository, SQLModelExchangeRateRepository
 from .file import S3FileRepository
 from .invoice import SQLModelInvoiceRepository
+from .parsed_document import SQLModelParsedDocumentRepository
 from .user import SQLModelUserRepository
 
 __all__ = [
@@ -10,4 +11,6 @@ __all__ = [
     "SQLModelInvoiceRepository",
     "SQLModelUserRepository",
     "InMemoryExchangeRateRepository",
+    "SQLModelParsedDocumentRepository",
+    "SQLModelExchangeRateRepository",
 ]
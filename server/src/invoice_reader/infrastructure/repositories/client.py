@@ -1,8 +1,11 @@
 from uuid import UUID
 
-from sqlmodel import Session, select
+from sqlalchemy import exists, tuple_
+from sqlmodel import Session, col, func, select
 
 from invoice_reader.domain.client import Client, ClientData
+from invoice_reader.domain.pagination import ClientCursor
+from invoice_reader.infrastructure.database import commit_unique
 from invoice_reader.infrastructure.models.client import ClientModel
 from invoice_reader.services.interfaces.repositories import IClientRepository
 
@@ -36,6 +39,35 @@ class InMemoryClientRepository(IClientRepository):
             if client.user_id == user_id and client.data.client_name == client_name:
                 return client
 
+    def exists_by_name(
+        self, user_id: UUID, client_name: str, exclude_client_id: UUID | None = None
+    ) -> bool:
+        client = self.get_by_name(user_id=user_id, client_name=client_name)
+        return client is not None and client.id_ != exclude_client_id
+
+    def get_page(
+        self,
+        user_id: UUID,
+        limit: int,
+        offset: int = 0,
+        after: ClientCursor | None = None,
+    ) -> list[Client]:
+        clients = sorted(
+            self.get_all(user_id=user_id),
+            key=lambda client: (client.data.client_name, client.id_),
+        )
+        if after:
+            clients = [
+                client
+                for client in clients
+                if (client.data.client_name, client.id_) > (after.client_name, after.client_id)
+            ]
+            offset = 0
+        return clients[offset : offset + limit]
+
+    def count(self, user_id: UUID) -> int:
+        return len(self.get_all(user_id=user_id))
+
 
 class SQLModelClientRepository(IClientRepository):
     def __init__(self, session: Session):
@@ -72,7 +104,7 @@ class SQLModelClientRepository(IClientRepository):
     def add(self, client: Client) -> None:
         client_model = self._to_model(client)
         self.session.add(client_model)
-        self.session.commit()
+        commit_unique(self.session, message="Client with this name already exists.")
 
     def get(self, client_id: UUID) -> Client | None:
         client_model = self.session.exec(
@@ -91,7 +123,9 @@ class SQLModelClientRepository(IClientRepository):
             setattr(existing_client_model, key, value)
 
         self.session.add(existing_client_model)
-        self.session.commit()
+        commit_unique(
+            self.session, message=f"Client with name {client.data.client_name} already exists."
+        )
 
     def delete(self, client_id: UUID) -> None:
         client_model = self.session.exec(
@@ -114,3 +148,42 @@ class SQLModelClientRepository(IClientRepository):
             )
         ).one_or_none()
         return self._to_entity(client_model) if client_model else None
+
+    def exists_by_name(
+        self, user_id: UUID, client_name: str, exclude_client_id: UUID | None = None
+    ) -> bool:
+        # Served by the (user_id, client_name) unique index
+        query = exists().where(
+            ClientModel.user_id == user_id, ClientModel.client_name == client_name
+        )
+        if exclude_client_id:
+            query = query.where(ClientModel.client_id != exclude_client_id)
+        return self.session.exec(select(query)).one()
+
+    def get_page(
+        self,
+        user_id: UUID,
+        limit: int,
+        offset: int = 0,
+        after: ClientCursor | None = None,
+    ) -> list[Client]:
+        query = (
+            select(ClientModel)
+            .where(ClientModel.user_id == user_id)
+            .order_by(col(ClientModel.client_name), col(ClientModel.client_id))
+            .limit(limit)
+        )
+        if after:
+            query = query.where(
+                tuple_(ClientModel.client_name, ClientModel.client_id)
+                > tuple_(after.client_name, after.client_id)
+            )
+        else:
+            query = query.offset(offset)
+        client_models = self.session.exec(query).all()
+        return [self._to_entity(model) for model in client_models]
+
+    def count(self, user_id: UUID) -> int:
+        return self.session.exec(
+            select(func.count()).select_from(ClientModel).where(ClientModel.user_id == user_id)
+        ).one()
@@ -1,20 +1,105 @@
+from collections.abc import Generator
+from contextlib import contextmanager
 from datetime import date
+from threading import Lock
+
+from sqlmodel import Session, col, func, select
 
 from invoice_reader.domain.exchange_rate import ExchangeRates
+from invoice_reader.domain.invoice import Currency
+from invoice_reader.infrastructure.models import ExchangeRateModel
 from invoice_reader.services.interfaces.repositories import IExchangeRateRepository
 
+# Postgres advisory lock key, shared by all the workers of the cluster
+REFRESH_LOCK_KEY = 8_421_017_003
+
 
 class InMemoryExchangeRateRepository(IExchangeRateRepository):
-    rates: dict[date, ExchangeRates]
+    rates: dict[tuple[date, Currency], ExchangeRates]
+    lock = Lock()
 
     @classmethod
     def init(cls):
         cls.rates = {}
 
-    def get(self, rate_date: date) -> ExchangeRates | None:
+    def get(self, rate_date: date, base_currency: Currency = Currency.EUR) -> ExchangeRates | None:
         """Retrieve exchange rates for a specific date and base currency."""
-        return self.rates.get(rate_date)
+        return self.rates.get((rate_date, base_currency))
+
+    def get_latest(self, base_currency: Currency = Currency.EUR) -> ExchangeRates | None:
+        rates = [rates for (_, base), rates in self.rates.items() if base == base_currency]
+        return max(rates, key=lambda rates: rates.rate_date, default=None)
 
     def add(self, exchange_rate: ExchangeRates) -> None:
         """Persist exchange rates."""
-        self.rates[exchange_rate.rate_date] = exchange_rate
+        self.rates[(exchange_rate.rate_date, exchange_rate.base_currency)] = exchange_rate
+
+    @contextmanager
+    def refresh_lock(self) -> Generator[bool, None, None]:
+        acquired = self.lock.acquire(blocking=False)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self.lock.release()
+
+
+class SQLModelExchangeRateRepository(IExchangeRateRepository):
+    def __init__(self, session: Session):
+        self.session = session
+
+    def _to_exchange_rates(self, model: ExchangeRateModel) -> ExchangeRates:
+        return ExchangeRates(
+            base_currency=model.base_currency,
+            rate_date=model.rate_date,
+            rates={Currency(currency): rate for currency, rate in model.rates.items()},
+            fetched_at=model.fetched_at,
+        )
+
+    def get(self, rate_date: date, base_currency: Currency = Currency.EUR) -> ExchangeRates | None:
+        model = self.session.exec(
+            select(ExchangeRateModel).where(
+                ExchangeRateModel.rate_date == rate_date,
+                ExchangeRateModel.base_currency == base_currency,
+            )
+        ).one_or_none()
+        return self._to_exchange_rates(model) if model else None
+
+    def get_latest(self, base_currency: Currency = Currency.EUR) -> ExchangeRates | None:
+        model = self.session.exec(
+            select(ExchangeRateModel)
+            .where(ExchangeRateModel.base_currency == base_currency)
+            .order_by(col(ExchangeRateModel.rate_date).desc())
+            .limit(1)
+        ).one_or_none()
+        return self._to_exchange_rates(model) if model else None
+
+    def add(self, exchange_rate: ExchangeRates) -> None:
+        model = ExchangeRateModel(
+            rate_date=exchange_rate.rate_date,
+            base_currency=exchange_rate.base_currency,
+            rates={str(currency): rate for currency, rate in exchange_rate.rates.items()},
+            fetched_at=exchange_rate.fetched_at,
+        )
+        self.session.merge(model)
+        self.session.commit()
+
+    @contextmanager
+    def refresh_lock(self) -> Generator[bool, None, None]:
+        """Postgres session-level advisory lock, shared by every worker of the cluster.
+        Held on a dedicated connection, since the session releases its own on commit.
+        Other databases fall back to a per-process lock."""
+        engine = self.session.get_bind()
+        if engine.dialect.name != "postgresql":
+            with InMemoryExchangeRateRepository().refresh_lock() as acquired:
+                yield acquired
+            return
+        with engine.connect() as connection:
+            acquired = bool(
+                connection.execute(select(func.pg_try_advisory_lock(REFRESH_LOCK_KEY))).scalar()
+            )
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    connection.execute(select(func.pg_advisory_unlock(REFRESH_LOCK_KEY)))
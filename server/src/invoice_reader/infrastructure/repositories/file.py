@@ -1,11 +1,15 @@
 # pyright: basic
 import io
+from typing import Any
 
 import boto3
+from anyio import to_thread
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 
 from invoice_reader.domain.invoice import File
-from invoice_reader.services.interfaces.repositories import IFileRepository
+from invoice_reader.infrastructure.cache import TTLCache
+from invoice_reader.services.interfaces.repositories import IAsyncFileRepository, IFileRepository
 
 
 class InMemoryFileRepository(IFileRepository):
@@ -28,16 +32,40 @@ class InMemoryFileRepository(IFileRepository):
         return self.storage.get(storage_path)
 
 
+def create_s3_client(max_pool_connections: int) -> Any:
+    """Create the S3 client. Client construction loads endpoint data and credentials,
+    so it is meant to be called once per worker, in the app lifespan.
+    The client is thread-safe and shared across requests."""
+    return boto3.client(
+        "s3",
+        config=Config(
+            signature_version="s3v4",
+            max_pool_connections=max_pool_connections,
+            tcp_keepalive=True,
+        ),
+    )
+
+
 class S3FileRepository(IFileRepository):
     bucket: str
     region: str
     presigned_url_expiration: int
 
-    def __init__(self, bucket: str, region: str, presigned_url_expiration: int) -> None:
+    def __init__(
+        self,
+        client: Any,
+        bucket: str,
+        region: str,
+        presigned_url_expiration: int,
+        transfer_config: TransferConfig | None = None,
+        url_cache: TTLCache[str, str] | None = None,
+    ) -> None:
+        self.client = client
         self.bucket = bucket
         self.region = region
         self.presigned_url_expiration = presigned_url_expiration
-        self.client = boto3.client("s3", config=Config(signature_version="s3v4"))
+        self.transfer_config = transfer_config
+        self.url_cache = url_cache
 
     @staticmethod
     def _get_suffix_from_s3_path(s3_path: str) -> str:
@@ -51,14 +79,21 @@ class S3FileRepository(IFileRepository):
             io.BytesIO(file.file),  # Require a readable file-like object
             self.bucket,
             self._get_suffix_from_s3_path(file.storage_path),
+            Config=self.transfer_config,
         )
 
     def delete(self, storage_path: str) -> None:
         self.client.delete_object(
             Bucket=self.bucket, Key=self._get_suffix_from_s3_path(storage_path)
         )
+        if self.url_cache is not None:
+            self.url_cache.delete(storage_path)
 
     def get_url(self, storage_path: str) -> str:
+        """Presigned URL of the file. With `url_cache`, a URL is reused until its TTL,
+        which should be set shorter than `presigned_url_expiration`."""
+        if self.url_cache is not None and (url := self.url_cache.get(storage_path)):
+            return url
         response: str = self.client.generate_presigned_url(
             "get_object",
             Params={
@@ -67,4 +102,22 @@ class S3FileRepository(IFileRepository):
             },
             ExpiresIn=self.presigned_url_expiration,
         )
+        if self.url_cache is not None:
+            self.url_cache.set(storage_path, response)
         return response
+
+
+class ThreadedFileRepository(IAsyncFileRepository):
+    """Run the transfers of a blocking file repository in the worker threadpool."""
+
+    def __init__(self, file_repository: IFileRepository) -> None:
+        self.file_repository = file_repository
+
+    def create_storage_path(self, initial_path: str) -> str:
+        return self.file_repository.create_storage_path(initial_path=initial_path)
+
+    async def store(self, file: File) -> None:
+        await to_thread.run_sync(self.file_repository.store, file)
+
+    async def delete(self, storage_path: str) -> None:
+        await to_thread.run_sync(self.file_repository.delete, storage_path)
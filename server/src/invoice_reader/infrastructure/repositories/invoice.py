@@ -1,9 +1,19 @@
 from datetime import date
 from uuid import UUID
 
-from sqlmodel import Session, select
+from sqlalchemy import ColumnElement, case, exists, extract, literal, tuple_, update
+from sqlmodel import Session, col, func, select
 
-from invoice_reader.domain.invoice import Invoice, InvoiceData
+from invoice_reader.domain.exchange_rate import BASE_CURRENCY, ExchangeRates
+from invoice_reader.domain.invoice import (
+    ClientRevenue,
+    Currency,
+    Invoice,
+    InvoiceData,
+    MonthlyRevenue,
+)
+from invoice_reader.domain.pagination import InvoiceCursor
+from invoice_reader.infrastructure.database import commit_unique
 from invoice_reader.infrastructure.models import InvoiceModel
 from invoice_reader.services.interfaces.repositories import IInvoiceRepository
 
@@ -18,6 +28,10 @@ class InMemoryInvoiceRepository(IInvoiceRepository):
     def add(self, invoice: Invoice) -> None:
         self.invoices[invoice.id_] = invoice
 
+    def add_many(self, invoices: list[Invoice]) -> None:
+        for invoice in invoices:
+            self.add(invoice)
+
     def get(self, invoice_id: UUID) -> Invoice | None:
         return self.invoices.get(invoice_id)
 
@@ -29,6 +43,13 @@ class InMemoryInvoiceRepository(IInvoiceRepository):
         if invoice_id in self.invoices:
             self.invoices.pop(invoice_id)
 
+    def get_by_ids(self, invoice_ids: list[UUID], user_id: UUID) -> list[Invoice]:
+        return [
+            invoice
+            for invoice_id in set(invoice_ids)
+            if (invoice := self.invoices.get(invoice_id)) and invoice.user_id == user_id
+        ]
+
     def get_all(self, user_id: UUID) -> list[Invoice]:
         return [invoice for invoice in self.invoices.values() if invoice.user_id == user_id]
 
@@ -37,6 +58,19 @@ class InMemoryInvoiceRepository(IInvoiceRepository):
             if invoice.user_id == user_id and invoice.data.invoice_number == invoice_number:
                 return invoice
 
+    def exists_by_invoice_number(
+        self, user_id: UUID, invoice_number: str, exclude_invoice_id: UUID | None = None
+    ) -> bool:
+        invoice = self.get_by_invoice_number(invoice_number=invoice_number, user_id=user_id)
+        return invoice is not None and invoice.id_ != exclude_invoice_id
+
+    def get_existing_invoice_numbers(self, user_id: UUID, invoice_numbers: list[str]) -> set[str]:
+        return {
+            invoice.data.invoice_number
+            for invoice in self.get_all(user_id=user_id)
+            if invoice.data.invoice_number in invoice_numbers
+        }
+
     def get_by_client_id(self, client_id: UUID) -> list[Invoice]:
         return [invoice for invoice in self.invoices.values() if invoice.client_id == client_id]
 
@@ -45,13 +79,93 @@ class InMemoryInvoiceRepository(IInvoiceRepository):
             invoice
             for invoice in self.invoices.values()
             if invoice.user_id == user_id
-            and (
-                invoice.data.paid_date.year == year
-                if invoice.data.paid_date
-                else invoice.data.issued_date.year == year
-            )
+            and (invoice.data.paid_date or invoice.data.issued_date).year == year
         ]
 
+    def get_page(
+        self,
+        user_id: UUID,
+        limit: int,
+        offset: int = 0,
+        after: InvoiceCursor | None = None,
+    ) -> list[Invoice]:
+        invoices = sorted(
+            self.get_all(user_id=user_id),
+            key=lambda invoice: (invoice.data.issued_date, invoice.id_),
+            reverse=True,
+        )
+        if after:
+            invoices = [
+                invoice
+                for invoice in invoices
+                if (invoice.data.issued_date, invoice.id_) < (after.issued_date, after.invoice_id)
+            ]
+            offset = 0
+        return invoices[offset : offset + limit]
+
+    def count(self, user_id: UUID) -> int:
+        return len(self.get_all(user_id=user_id))
+
+    def get_monthly_revenues(self, year: int, user_id: UUID) -> list[MonthlyRevenue]:
+        revenues: dict[tuple[int, UUID, Currency], MonthlyRevenue] = {}
+        for invoice in self.get_by_year(year=year, user_id=user_id):
+            month = (invoice.data.paid_date or invoice.data.issued_date).month
+            currency, amount = self._revenue(invoice)
+            revenue = revenues.setdefault(
+                (month, invoice.client_id, currency),
+                MonthlyRevenue(
+                    month=month,
+                    client_id=invoice.client_id,
+                    currency=currency,
+                    total_paid=0.0,
+                    total_pending=0.0,
+                ),
+            )
+            if invoice.data.paid_date:
+                revenue.total_paid += amount
+            else:
+                revenue.total_pending += amount
+        return list(revenues.values())
+
+    def get_client_revenues(
+        self, user_id: UUID, client_id: UUID | None = None
+    ) -> list[ClientRevenue]:
+        revenues: dict[tuple[UUID, Currency], ClientRevenue] = {}
+        for invoice in self.get_all(user_id=user_id):
+            if client_id and invoice.client_id != client_id:
+                continue
+            currency, amount = self._revenue(invoice)
+            revenue = revenues.setdefault(
+                (invoice.client_id, currency),
+                ClientRevenue(
+                    client_id=invoice.client_id, currency=currency, n_invoices=0, total=0.0
+                ),
+            )
+            revenue.n_invoices += 1
+            revenue.total += amount
+        return list(revenues.values())
+
+    def fill_base_amounts(self, exchange_rates: ExchangeRates) -> int:
+        n_invoices = 0
+        for invoice in self.invoices.values():
+            if invoice.base_amount is not None:
+                continue
+            currency = invoice.data.currency
+            if currency != BASE_CURRENCY and currency not in exchange_rates.rates:
+                continue
+            invoice.base_amount = exchange_rates.convert(
+                invoice.data.gross_amount, from_currency=currency, to_currency=BASE_CURRENCY
+            )
+            invoice.base_rate_date = exchange_rates.rate_date
+            n_invoices += 1
+        return n_invoices
+
+    @staticmethod
+    def _revenue(invoice: Invoice) -> tuple[Currency, float]:
+        if invoice.base_amount is not None:
+            return BASE_CURRENCY, invoice.base_amount
+        return invoice.data.currency, invoice.data.gross_amount
+
 
 class SQLModelInvoiceRepository(IInvoiceRepository):
     def __init__(self, session: Session):
@@ -70,6 +184,9 @@ class SQLModelInvoiceRepository(IInvoiceRepository):
             description=invoice.data.description,
             invoiced_date=invoice.data.issued_date,
             paid_date=invoice.data.paid_date,
+            revenue_date=invoice.data.paid_date or invoice.data.issued_date,
+            base_amount=invoice.base_amount,
+            base_rate_date=invoice.base_rate_date,
             storage_path=invoice.storage_path,
         )
 
@@ -89,12 +206,18 @@ class SQLModelInvoiceRepository(IInvoiceRepository):
                 gross_amount=model.gross_amount,
                 currency=model.currency,
             ),
+            base_amount=model.base_amount,
+            base_rate_date=model.base_rate_date,
         )
 
     def add(self, invoice: Invoice) -> None:
         invoice_model = self._to_model(invoice)
         self.session.add(invoice_model)
-        self.session.commit()
+        commit_unique(self.session, message="Invoice with this number already exists.")
+
+    def add_many(self, invoices: list[Invoice]) -> None:
+        self.session.add_all([self._to_model(invoice) for invoice in invoices])
+        commit_unique(self.session, message="Invoice with this number already exists.")
 
     def get(self, invoice_id: UUID) -> Invoice | None:
         invoice_model = self.session.exec(
@@ -105,9 +228,19 @@ class SQLModelInvoiceRepository(IInvoiceRepository):
     def delete(self, invoice_id: UUID) -> None:
         invoice_model = self.session.exec(
             select(InvoiceModel).where(InvoiceModel.invoice_id == invoice_id)
-        ).one()
-        self.session.delete(invoice_model)
-        self.session.commit()
+        ).one_or_none()
+        if invoice_model:  # Not stored yet when rolling back a failed add
+            self.session.delete(invoice_model)
+            self.session.commit()
+
+    def get_by_ids(self, invoice_ids: list[UUID], user_id: UUID) -> list[Invoice]:
+        invoice_models = self.session.exec(
+            select(InvoiceModel).where(
+                col(InvoiceModel.invoice_id).in_(invoice_ids),
+                InvoiceModel.user_id == user_id,
+            )
+        ).all()
+        return [self._to_invoice(model) for model in invoice_models]
 
     def get_all(self, user_id: UUID) -> list[Invoice]:
         invoice_models = self.session.exec(
@@ -124,13 +257,38 @@ class SQLModelInvoiceRepository(IInvoiceRepository):
         ).one_or_none()
         return self._to_invoice(invoice_model) if invoice_model else None
 
+    def exists_by_invoice_number(
+        self, user_id: UUID, invoice_number: str, exclude_invoice_id: UUID | None = None
+    ) -> bool:
+        # Served by the (user_id, invoice_number) unique index
+        query = exists().where(
+            InvoiceModel.user_id == user_id, InvoiceModel.invoice_number == invoice_number
+        )
+        if exclude_invoice_id:
+            query = query.where(InvoiceModel.invoice_id != exclude_invoice_id)
+        return self.session.exec(select(query)).one()
+
+    def get_existing_invoice_numbers(self, user_id: UUID, invoice_numbers: list[str]) -> set[str]:
+        # Served by the (user_id, invoice_number) unique index
+        return set(
+            self.session.exec(
+                select(InvoiceModel.invoice_number).where(
+                    InvoiceModel.user_id == user_id,
+                    col(InvoiceModel.invoice_number).in_(invoice_numbers),
+                )
+            ).all()
+        )
+
     def update(self, invoice: Invoice) -> None:
         existing_invoice_model = self.session.exec(
             select(InvoiceModel).where(InvoiceModel.invoice_id == invoice.id_)
         ).one()
         updated_invoice_model = existing_invoice_model.sqlmodel_update(self._to_model(invoice))
         self.session.add(updated_invoice_model)
-        self.session.commit()
+        commit_unique(
+            self.session,
+            message=f"Invoice with number {invoice.data.invoice_number} already exists.",
+        )
 
     def get_by_client_id(self, client_id: UUID) -> list[Invoice]:
         invoice_models = self.session.exec(
@@ -144,8 +302,123 @@ class SQLModelInvoiceRepository(IInvoiceRepository):
         invoice_models = self.session.exec(
             select(InvoiceModel).where(
                 InvoiceModel.user_id == user_id,
-                InvoiceModel.invoiced_date >= start_date,
-                InvoiceModel.invoiced_date < end_date,
+                InvoiceModel.revenue_date >= start_date,
+                InvoiceModel.revenue_date < end_date,
             )
         ).all()
         return [self._to_invoice(invoice_model) for invoice_model in invoice_models]
+
+    def get_page(
+        self,
+        user_id: UUID,
+        limit: int,
+        offset: int = 0,
+        after: InvoiceCursor | None = None,
+    ) -> list[Invoice]:
+        query = (
+            select(InvoiceModel)
+            .where(InvoiceModel.user_id == user_id)
+            .order_by(col(InvoiceModel.invoiced_date).desc(), col(InvoiceModel.invoice_id).desc())
+            .limit(limit)
+        )
+        if after:
+            query = query.where(
+                tuple_(InvoiceModel.invoiced_date, InvoiceModel.invoice_id)
+                < tuple_(after.issued_date, after.invoice_id)
+            )
+        else:
+            query = query.offset(offset)
+        invoice_models = self.session.exec(query).all()
+        return [self._to_invoice(invoice_model) for invoice_model in invoice_models]
+
+    def count(self, user_id: UUID) -> int:
+        return self.session.exec(
+            select(func.count()).select_from(InvoiceModel).where(InvoiceModel.user_id == user_id)
+        ).one()
+
+    def get_monthly_revenues(self, year: int, user_id: UUID) -> list[MonthlyRevenue]:
+        start_date = date(year, 1, 1)
+        end_date = date(year + 1, 1, 1)
+        month = extract("month", InvoiceModel.revenue_date).label("month")
+        currency, amount = self._revenue_columns()
+        is_paid = col(InvoiceModel.paid_date).is_not(None)
+        rows = self.session.exec(
+            select(
+                month,
+                InvoiceModel.client_id,
+                currency,
+                func.sum(case((is_paid, amount), else_=0.0)),
+                func.sum(case((is_paid, 0.0), else_=amount)),
+            )
+            .where(
+                InvoiceModel.user_id == user_id,
+                InvoiceModel.revenue_date >= start_date,
+                InvoiceModel.revenue_date < end_date,
+            )
+            .group_by(month, InvoiceModel.client_id, currency)
+        ).all()
+        return [
+            MonthlyRevenue(
+                month=row_month,
+                client_id=client_id,
+                currency=currency,
+                total_paid=total_paid,
+                total_pending=total_pending,
+            )
+            for row_month, client_id, currency, total_paid, total_pending in rows
+        ]
+
+    def get_client_revenues(
+        self, user_id: UUID, client_id: UUID | None = None
+    ) -> list[ClientRevenue]:
+        currency, amount = self._revenue_columns()
+        query = (
+            select(InvoiceModel.client_id, currency, func.count(), func.sum(amount))
+            .where(InvoiceModel.user_id == user_id)
+            .group_by(InvoiceModel.client_id, currency)
+        )
+        if client_id:
+            query = query.where(InvoiceModel.client_id == client_id)
+        rows = self.session.exec(query).all()
+        return [
+            ClientRevenue(
+                client_id=row_client_id,
+                currency=row_currency,
+                n_invoices=n_invoices,
+                total=total,
+            )
+            for row_client_id, row_currency, n_invoices, total in rows
+        ]
+
+    def fill_base_amounts(self, exchange_rates: ExchangeRates) -> int:
+        # Conversion factor into the base currency of every currency the rates cover
+        factors = {
+            currency: exchange_rates.convert(1.0, from_currency=currency, to_currency=BASE_CURRENCY)
+            for currency in Currency
+            if currency == BASE_CURRENCY or currency in exchange_rates.rates
+        }
+        result = self.session.execute(
+            update(InvoiceModel)
+            .where(
+                col(InvoiceModel.base_amount).is_(None),
+                col(InvoiceModel.currency).in_(factors),
+            )
+            .values(
+                base_amount=InvoiceModel.gross_amount * case(factors, value=InvoiceModel.currency),
+                base_rate_date=exchange_rates.rate_date,
+            )
+        )
+        self.session.commit()
+        return result.rowcount
+
+    @staticmethod
+    def _revenue_columns() -> tuple[ColumnElement[Currency], ColumnElement[float]]:
+        """Currency and amount to aggregate: the base amount when set, the gross amount in the
+        invoice currency otherwise. Once backfilled, every invoice falls in the base currency."""
+        has_base_amount = col(InvoiceModel.base_amount).is_not(None)
+        currency = case(
+            (has_base_amount, literal(BASE_CURRENCY, col(InvoiceModel.currency).type)),
+            else_=InvoiceModel.currency,
+        ).label("currency")
+        amount = func.coalesce(InvoiceModel.base_amount, InvoiceModel.gross_amount)
+        return currency, amount
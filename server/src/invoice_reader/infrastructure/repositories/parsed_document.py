@@ -0,0 +1,74 @@
+from datetime import datetime
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from invoice_reader.domain.client import ClientData
+from invoice_reader.domain.invoice import InvoiceData
+from invoice_reader.domain.parsed_document import ParsedDocument
+from invoice_reader.infrastructure.models import ParsedDocumentModel
+from invoice_reader.services.interfaces.repositories import IParsedDocumentRepository
+
+
+class InMemoryParsedDocumentRepository(IParsedDocumentRepository):
+    parsed_documents: dict[str, tuple[datetime, ParsedDocument]]
+
+    @classmethod
+    def init(cls):
+        cls.parsed_documents = {}
+
+    def get(
+        self, content_hash: str, parser_version: str, created_after: datetime
+    ) -> ParsedDocument | None:
+        created_at, parsed_document = self.parsed_documents.get(content_hash, (None, None))
+        if (
+            not parsed_document
+            or not created_at
+            or created_at < created_after
+            or parsed_document.parser_version != parser_version
+        ):
+            return None
+        return parsed_document
+
+    def add(self, parsed_document: ParsedDocument) -> None:
+        self.parsed_documents[parsed_document.content_hash] = (datetime.now(), parsed_document)
+
+
+class SQLModelParsedDocumentRepository(IParsedDocumentRepository):
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get(
+        self, content_hash: str, parser_version: str, created_after: datetime
+    ) -> ParsedDocument | None:
+        model = self.session.exec(
+            select(ParsedDocumentModel).where(
+                ParsedDocumentModel.content_hash == content_hash,
+                ParsedDocumentModel.parser_version == parser_version,
+                ParsedDocumentModel.created_at >= created_after,
+            )
+        ).one_or_none()
+        if not model:
+            return None
+        return ParsedDocument(
+            content_hash=model.content_hash,
+            parser_version=model.parser_version,
+            invoice_data=InvoiceData.model_validate(model.invoice_data),
+            client_data=ClientData.model_validate(model.client_data),
+        )
+
+    def add(self, parsed_document: ParsedDocument) -> None:
+        # Merged: overwrites the expired or outdated result of the same document
+        self.session.merge(
+            ParsedDocumentModel(
+                content_hash=parsed_document.content_hash,
+                parser_version=parsed_document.parser_version,
+                invoice_data=parsed_document.invoice_data.model_dump(mode="json"),
+                client_data=parsed_document.client_data.model_dump(mode="json"),
+            )
+        )
+        try:
+            self.session.commit()
+        except IntegrityError:
+            # Same document parsed concurrently: results are equivalent, keep the first one
+            self.session.rollback()
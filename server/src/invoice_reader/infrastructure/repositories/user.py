@@ -3,6 +3,7 @@ from uuid import UUID
 from sqlmodel import Session, select
 
 from invoice_reader.domain.user import User
+from invoice_reader.infrastructure.database import commit_unique
 from invoice_reader.infrastructure.models import UserModel
 from invoice_reader.services.interfaces.repositories import IUserRepository
 
@@ -62,7 +63,7 @@ class SQLModelUserRepository(IUserRepository):
     def add(self, user: User) -> None:
         user_model = self._to_model(user)
         self.session.add(user_model)
-        self.session.commit()
+        commit_unique(self.session, message="User with this email already exists.")
 
     def update(self, user: User) -> None:
         existing_user_model = self.session.exec(
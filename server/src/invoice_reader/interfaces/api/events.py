@@ -0,0 +1,54 @@
+"""Stream the progress of a parse job as server-sent events.
+
+Each change of the job is sent as a `status` event holding the `ParseJobResponse`, until the
+job succeeds or fails. Comments are sent in between to keep idle connections open.
+"""
+
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+import anyio
+from anyio import to_thread
+
+from invoice_reader.domain.parse_job import ParseJob
+from invoice_reader.interfaces.schemas.parser import ParseJobResponse
+from invoice_reader.services.interfaces.parse_job_queue import IParseJobQueue
+
+HEARTBEAT_INTERVAL = 15  # Seconds, below the idle timeout of proxies
+
+
+async def parse_job_events(
+    job: ParseJob,
+    queue: IParseJobQueue,
+    poll_interval: float,
+    is_disconnected: Callable[[], Awaitable[bool]],
+) -> AsyncIterator[str]:
+    job_id = job.id_
+    last_sent: ParseJob | None = None
+    last_sent_at = time.monotonic()
+    while not await is_disconnected():
+        if _has_changed(job, last_sent):
+            yield format_event("status", ParseJobResponse.from_job(job).model_dump_json())
+            last_sent, last_sent_at = job, time.monotonic()
+            if job.is_done:
+                return
+        elif time.monotonic() - last_sent_at >= HEARTBEAT_INTERVAL:
+            yield ": keep-alive\n\n"
+            last_sent_at = time.monotonic()
+        await anyio.sleep(poll_interval)
+        current = await to_thread.run_sync(lambda: queue.get(job_id=job_id))
+        if current is None:
+            # Purged in the meantime
+            return
+        job = current
+
+
+def format_event(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+def _has_changed(job: ParseJob, last_sent: ParseJob | None) -> bool:
+    return last_sent is None or (job.status, job.attempts) != (
+        last_sent.status,
+        last_sent.attempts,
+    )
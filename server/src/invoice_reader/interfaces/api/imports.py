@@ -0,0 +1,196 @@
+"""Read the files and the manifest of a bulk invoice import.
+
+An import is either many uploaded files or a single ZIP archive. In both cases, a
+`manifest.json` or `manifest.csv` file describes the invoices, each entry referencing one of
+the PDF files by name:
+
+- JSON: a list of `{"filename": ..., "client_id": ..., "data": {...}}`
+- CSV: the columns `filename`, `client_id` and the fields of `InvoiceData`
+"""
+
+import csv
+import io
+import json
+import os
+import zipfile
+import zlib
+from typing import Any
+
+from fastapi import HTTPException, UploadFile, status
+from pydantic import ValidationError
+
+from invoice_reader.domain.invoice import (
+    ImportStatus,
+    InvoiceData,
+    InvoiceImport,
+    InvoiceImportResult,
+)
+from invoice_reader.interfaces.schemas.invoice import InvoiceImportItem
+
+MANIFEST_FILENAMES = ("manifest.json", "manifest.csv")
+
+
+async def read_import_files(
+    upload_files: list[UploadFile], max_files: int, max_size: int
+) -> dict[str, bytes]:
+    """Content of the imported files per filename, extracted from the archive if a single
+    ZIP file is uploaded."""
+    if len(upload_files) == 1 and (upload_files[0].filename or "").lower().endswith(".zip"):
+        return read_zip(await upload_files[0].read(), max_files=max_files, max_size=max_size)
+    _check_limits(n_files=len(upload_files), size=0, max_files=max_files, max_size=max_size)
+    files: dict[str, bytes] = {}
+    size = 0
+    for upload_file in upload_files:
+        content = await upload_file.read()
+        size += len(content)
+        _check_limits(n_files=len(upload_files), size=size, max_files=max_files, max_size=max_size)
+        _add_file(files, filename=upload_file.filename or "", content=content)
+    return files
+
+
+def read_zip(content: bytes, max_files: int, max_size: int) -> dict[str, bytes]:
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(content))
+    except zipfile.BadZipFile as e:
+        raise HTTPException(
+            detail="Invalid ZIP archive.", status_code=status.HTTP_400_BAD_REQUEST
+        ) from e
+    with archive:
+        entries = [entry for entry in archive.infolist() if not entry.is_dir()]
+        # Checked on the declared sizes before decompressing anything
+        _check_limits(
+            n_files=len(entries),
+            size=sum(entry.file_size for entry in entries),
+            max_files=max_files,
+            max_size=max_size,
+        )
+        files: dict[str, bytes] = {}
+        for entry in entries:
+            try:
+                content = archive.read(entry)
+            # Corrupted data, encrypted entry, unsupported compression method
+            except (zipfile.BadZipFile, zlib.error, RuntimeError, NotImplementedError) as e:
+                raise HTTPException(
+                    detail=f"Cannot read {entry.filename} from the ZIP archive: {e}",
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                ) from e
+            _add_file(files, filename=entry.filename, content=content)
+        return files
+
+
+def read_manifest(
+    files: dict[str, bytes],
+) -> tuple[list[InvoiceImport], list[InvoiceImportResult]]:
+    """Invoices to import, and the failures already known: invalid manifest entries, missing
+    files and files without manifest entry."""
+    manifest_filename = next((name for name in MANIFEST_FILENAMES if name in files), None)
+    if not manifest_filename:
+        raise HTTPException(
+            detail=f"A manifest is required: {' or '.join(MANIFEST_FILENAMES)}.",
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    files = dict(files)
+    manifest = files.pop(manifest_filename)
+    entries = (
+        _read_json_manifest(manifest)
+        if manifest_filename.endswith(".json")
+        else _read_csv_manifest(manifest)
+    )
+
+    invoice_imports: list[InvoiceImport] = []
+    failures: list[InvoiceImportResult] = []
+    referenced: set[str] = set()
+    for i, entry in enumerate(entries):
+        filename = str(entry.get("filename") or f"manifest entry {i + 1}")
+        referenced.add(filename)
+        try:
+            item = InvoiceImportItem.model_validate(entry)
+        except ValidationError as e:
+            failures.append(_failure(filename, detail=f"Invalid manifest entry: {e}"))
+            continue
+        if item.filename not in files:
+            failures.append(
+                _failure(item.filename, item.data.invoice_number, detail="File not found.")
+            )
+            continue
+        invoice_imports.append(
+            InvoiceImport(
+                filename=item.filename,
+                file=files[item.filename],
+                client_id=item.client_id,
+                data=item.data,
+            )
+        )
+    failures.extend(
+        _failure(filename, detail="No manifest entry for this file.")
+        for filename in files
+        if filename not in referenced
+    )
+    return invoice_imports, failures
+
+
+def _read_json_manifest(manifest: bytes) -> list[dict[str, Any]]:
+    try:
+        entries = json.loads(manifest)
+    except json.JSONDecodeError as e:
+        raise HTTPException(
+            detail=f"Invalid JSON manifest: {e}",
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        ) from e
+    if not isinstance(entries, list) or not all(isinstance(entry, dict) for entry in entries):
+        raise HTTPException(
+            detail="The JSON manifest must be a list of objects.",
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    return entries
+
+
+def _read_csv_manifest(manifest: bytes) -> list[dict[str, Any]]:
+    try:
+        rows = list(csv.DictReader(io.StringIO(manifest.decode("utf-8-sig"))))
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(
+            detail=f"Invalid CSV manifest: {e}",
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        ) from e
+    data_fields = InvoiceData.model_fields.keys()
+    return [
+        {
+            "filename": row.get("filename"),
+            "client_id": row.get("client_id"),
+            # Empty cells stand for missing optional values, e.g. the paid date
+            "data": {field: row[field] or None for field in data_fields if field in row},
+        }
+        for row in rows
+    ]
+
+
+def _check_limits(n_files: int, size: int, max_files: int, max_size: int) -> None:
+    # The manifest comes on top of the invoice files
+    if n_files > max_files + 1 or size > max_size:
+        raise HTTPException(
+            detail=f"Imports are limited to {max_files} files and {max_size} bytes.",
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+
+
+def _add_file(files: dict[str, bytes], filename: str, content: bytes) -> None:
+    # The manifest references the files by name, regardless of the folders
+    basename = os.path.basename(filename)
+    if basename in files:
+        raise HTTPException(
+            detail=f"Several files are named {basename}.",
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    files[basename] = content
+
+
+def _failure(
+    filename: str, invoice_number: str | None = None, detail: str | None = None
+) -> InvoiceImportResult:
+    return InvoiceImportResult(
+        filename=filename,
+        invoice_number=invoice_number,
+        status=ImportStatus.FAILED,
+        detail=detail,
+    )
@@ -1,22 +1,33 @@
+import asyncio
 import traceback
 from contextlib import asynccontextmanager
 
+from anyio import to_thread
 from fastapi import (
     FastAPI,
     Request,
 )
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, Response
-from prometheus_fastapi_instrumentator import Instrumentator
+from prometheus_fastapi_instrumentator import Instrumentator, metrics
 
 from invoice_reader.domain.exceptions import CustomException
-from invoice_reader.infrastructure.repositories.exchange_rate import InMemoryExchangeRateRepository
+from invoice_reader.infrastructure.database import create_db_engine, pool_metrics
+from invoice_reader.infrastructure.http import create_async_http_client, create_http_client
+from invoice_reader.infrastructure.parse_job_queue import create_parse_job_queue
+from invoice_reader.infrastructure.password_hasher import ProcessPoolPasswordHasher
+from invoice_reader.infrastructure.repositories.file import create_s3_client
 from invoice_reader.interfaces.api.routers import (
     analytics_router,
     client_router,
     invoice_router,
     user_router,
 )
+from invoice_reader.interfaces.api.tasks import (
+    purge_parse_jobs_periodically,
+    refresh_exchange_rates_periodically,
+    run_parse_worker,
+)
 from invoice_reader.settings import get_settings
 from invoice_reader.utils.logger import get_logger
 
@@ -27,8 +38,67 @@ logger = get_logger()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    InMemoryExchangeRateRepository.init()
+    app.state.engine = create_db_engine(
+        database_url=settings.database_url,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_recycle=settings.db_pool_recycle,
+        pool_timeout=settings.db_pool_timeout,
+    )
+    app.state.s3_client = create_s3_client(max_pool_connections=settings.s3_max_pool_connections)
+    app.state.password_hasher = ProcessPoolPasswordHasher(
+        max_workers=settings.password_hashing_workers,
+        max_pending=settings.password_hashing_max_pending,
+        rounds=settings.bcrypt_rounds,
+    )
+    to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+    app.state.ml_server_client = create_http_client(
+        timeout=settings.ml_server_timeout,
+        max_connections=settings.ml_server_max_connections,
+        max_keepalive_connections=settings.ml_server_max_keepalive_connections,
+    )
+    app.state.http_client = create_async_http_client(
+        timeout=settings.ml_server_timeout,
+        max_connections=settings.ml_server_max_connections,
+        max_keepalive_connections=settings.ml_server_max_keepalive_connections,
+    )
+    exchange_rates_refresher = asyncio.create_task(
+        refresh_exchange_rates_periodically(
+            engine=app.state.engine, interval=settings.exchange_rates_refresh_interval
+        )
+    )
+    app.state.parse_job_queue = create_parse_job_queue(
+        backend=settings.parse_job_backend,
+        sqlite_path=settings.parse_job_sqlite_path,
+        engine=app.state.engine,
+    )
+    parse_tasks = [
+        asyncio.create_task(
+            run_parse_worker(
+                queue=app.state.parse_job_queue,
+                engine=app.state.engine,
+                ml_server_client=app.state.ml_server_client,
+                http_client=app.state.http_client,
+            )
+        )
+        for _ in range(settings.parse_job_workers)
+    ]
+    parse_tasks.append(
+        asyncio.create_task(purge_parse_jobs_periodically(app.state.parse_job_queue))
+    )
     yield
+    exchange_rates_refresher.cancel()
+    # Interrupted jobs are claimed again once their lease expires
+    for task in parse_tasks:
+        task.cancel()
+    # Let the tasks unwind before closing the resources they use
+    await asyncio.gather(exchange_rates_refresher, *parse_tasks, return_exceptions=True)
+    app.state.parse_job_queue.close()
+    await app.state.http_client.aclose()
+    app.state.ml_server_client.close()
+    app.state.s3_client.close()
+    app.state.password_hasher.shutdown()
+    app.state.engine.dispose()
 
 
 app = FastAPI(lifespan=lifespan, title="Invoice Reader API", version="1.0.0")
@@ -90,5 +160,6 @@ async def root(response: Response):
 
 
 # Monitoring
-instrumentator = Instrumentator().instrument(app)
+# Adding custom metrics replaces the defaults, which are therefore added explicitly
+instrumentator = Instrumentator().add(metrics.default(), pool_metrics()).instrument(app)
 instrumentator.expose(app)
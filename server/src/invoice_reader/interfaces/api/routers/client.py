@@ -4,6 +4,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, Query, Response
 
 from invoice_reader.domain.client import ClientData
+from invoice_reader.domain.pagination import ClientCursor
 from invoice_reader.interfaces.dependencies.auth import get_current_user_id
 from invoice_reader.interfaces.dependencies.exchange_rates import get_exchange_rates_service
 from invoice_reader.interfaces.dependencies.repository import (
@@ -15,6 +16,7 @@ from invoice_reader.interfaces.schemas.client import (
     ClientCreate,
     ClientResponse,
     ClientRevenueResponse,
+    ClientRevenuesResponse,
     ClientUpdate,
     PagedClientResponse,
 )
@@ -36,18 +38,52 @@ def get_clients(
     client_repository: Annotated[IClientRepository, Depends(get_client_repository)],
     page: int = Query(1, ge=1),
     per_page: int = Query(10, ge=1),
+    cursor: str | None = Query(None),
 ) -> PagedClientResponse:
-    clients = ClientService.get_paged_clients(
+    clients, total, next_cursor = ClientService.get_paged_clients(
         user_id=user_id,
         client_repository=client_repository,
         page=page,
         per_page=per_page,
+        cursor=ClientCursor.decode(cursor) if cursor else None,
     )
     return PagedClientResponse(
-        total=len(clients),
+        total=total,
         page=page,
         per_page=per_page,
         clients=[ClientResponse.from_client(client=client) for client in clients],
+        next_cursor=next_cursor.encode() if next_cursor else None,
+    )
+
+
+@router.get("/revenue")
+def get_clients_total_revenue(
+    user_id: Annotated[UUID, Depends(get_current_user_id)],
+    client_repository: Annotated[IClientRepository, Depends(get_client_repository)],
+    invoice_repository: Annotated[IInvoiceRepository, Depends(get_invoice_repository)],
+    exchange_rate_service: Annotated[IExchangeRateService, Depends(get_exchange_rates_service)],
+    exchange_rate_repository: Annotated[
+        IExchangeRateRepository, Depends(get_exchange_rate_repository)
+    ],
+) -> ClientRevenuesResponse:
+    """Revenue of every client of the user in one request.
+    Declared before `/{client_id}` so that "revenue" is not read as a client id."""
+    revenues = ClientService.get_revenues(
+        user_id=user_id,
+        client_repository=client_repository,
+        invoice_repository=invoice_repository,
+        exchange_rate_service=exchange_rate_service,
+        exchange_rate_repository=exchange_rate_repository,
+    )
+    return ClientRevenuesResponse(
+        revenues=[
+            ClientRevenueResponse(
+                client_id=client_id,
+                n_invoices=revenue["n_invoices"],
+                total_revenue=revenue["total_revenue"],
+            )
+            for client_id, revenue in revenues.items()
+        ]
     )
 
 
@@ -111,24 +147,25 @@ def update_client(
     return Response(status_code=204)
 
 
-@router.get("/{client_id}/revenue", dependencies=[Depends(get_current_user_id)])
+@router.get("/{client_id}/revenue")
 def get_client_total_revenue(
     client_id: UUID,
+    user_id: Annotated[UUID, Depends(get_current_user_id)],
     invoice_repository: Annotated[IInvoiceRepository, Depends(get_invoice_repository)],
     exchange_rate_service: Annotated[IExchangeRateService, Depends(get_exchange_rates_service)],
     exchange_rate_repository: Annotated[
         IExchangeRateRepository, Depends(get_exchange_rate_repository)
     ],
 ) -> ClientRevenueResponse:
-    total_revenue = ClientService.calculate_total_revenue(
+    revenue = ClientService.get_revenue(
         client_id=client_id,
+        user_id=user_id,
         invoice_repository=invoice_repository,
         exchange_rate_service=exchange_rate_service,
         exchange_rate_repository=exchange_rate_repository,
     )
-    n_invoices = ClientService.count_invoices(client_id, invoice_repository)
     return ClientRevenueResponse(
         client_id=client_id,
-        n_invoices=n_invoices,
-        total_revenue=total_revenue,
+        n_invoices=revenue["n_invoices"],
+        total_revenue=revenue["total_revenue"],
     )
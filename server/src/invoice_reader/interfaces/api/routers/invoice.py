@@ -1,34 +1,51 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, Form, Query, Response, UploadFile, status
+from anyio import to_thread
+from fastapi import APIRouter, Depends, File, Form, Query, Request, Response, UploadFile, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, ValidationError
 
+from invoice_reader.domain.pagination import InvoiceCursor
+from invoice_reader.interfaces.api.events import parse_job_events
+from invoice_reader.interfaces.api.imports import read_import_files, read_manifest
 from invoice_reader.interfaces.dependencies.auth import get_current_user_id
 from invoice_reader.interfaces.dependencies.exchange_rates import get_exchange_rates_service
-from invoice_reader.interfaces.dependencies.parser import get_parser
+from invoice_reader.interfaces.dependencies.parser import get_async_parser, get_parse_job_queue
 from invoice_reader.interfaces.dependencies.repository import (
+    get_async_file_repository,
     get_client_repository,
+    get_exchange_rate_repository,
     get_file_repository,
     get_invoice_repository,
 )
 from invoice_reader.interfaces.schemas.invoice import (
     InvoiceCreate,
+    InvoiceImportResponse,
     InvoiceResponse,
     InvoiceUpdate,
+    InvoiceUrlsRequest,
+    InvoiceUrlsResponse,
     PagedInvoiceResponse,
 )
-from invoice_reader.interfaces.schemas.parser import ParserResponse
+from invoice_reader.interfaces.schemas.parser import ParseJobResponse, ParserResponse
 from invoice_reader.services.interfaces.exchange_rates import IExchangeRateService
-from invoice_reader.services.interfaces.parser import IParser
+from invoice_reader.services.interfaces.parse_job_queue import IParseJobQueue
+from invoice_reader.services.interfaces.parser import IAsyncParser
 from invoice_reader.services.interfaces.repositories import (
+    IAsyncFileRepository,
+    IExchangeRateRepository,
     IFileRepository,
     IInvoiceRepository,
 )
 from invoice_reader.services.interfaces.repositories.client import IClientRepository
 from invoice_reader.services.invoice import InvoiceService
+from invoice_reader.services.parse_job import ParseJobService
+from invoice_reader.settings import get_settings
+
+settings = get_settings()
 
 router = APIRouter(
     prefix="/v1/invoices",
@@ -62,18 +79,21 @@ class Checker[T: BaseModel]:
 
 
 @router.post("")
-def add_invoice(
+async def add_invoice(
     upload_file: Annotated[UploadFile, File()],
     data: Annotated[
         InvoiceCreate,
         Depends(Checker(InvoiceCreate)),
     ],
     user_id: Annotated[UUID, Depends(get_current_user_id)],
-    file_repository: Annotated[IFileRepository, Depends(get_file_repository)],
+    file_repository: Annotated[IAsyncFileRepository, Depends(get_async_file_repository)],
     invoice_repository: Annotated[IInvoiceRepository, Depends(get_invoice_repository)],
     exchange_rate_service: Annotated[IExchangeRateService, Depends(get_exchange_rates_service)],
+    exchange_rate_repository: Annotated[
+        IExchangeRateRepository, Depends(get_exchange_rate_repository)
+    ],
 ):
-    InvoiceService.add_invoice(
+    await InvoiceService.add_invoice_async(
         user_id=user_id,
         client_id=data.client_id,
         file_bin=upload_file.file,
@@ -81,6 +101,8 @@ def add_invoice(
         invoice_data=data.data,
         file_repository=file_repository,
         invoice_repository=invoice_repository,
+        exchange_rate_repository=exchange_rate_repository,
+        exchange_rate_service=exchange_rate_service,
     )
     return Response(
         content="The file and its information were successfully stored.",
@@ -88,14 +110,46 @@ def add_invoice(
     )
 
 
+@router.post("/bulk")
+async def import_invoices(
+    upload_files: Annotated[list[UploadFile], File()],
+    user_id: Annotated[UUID, Depends(get_current_user_id)],
+    file_repository: Annotated[IAsyncFileRepository, Depends(get_async_file_repository)],
+    invoice_repository: Annotated[IInvoiceRepository, Depends(get_invoice_repository)],
+    exchange_rate_service: Annotated[IExchangeRateService, Depends(get_exchange_rates_service)],
+    exchange_rate_repository: Annotated[
+        IExchangeRateRepository, Depends(get_exchange_rate_repository)
+    ],
+) -> InvoiceImportResponse:
+    """Import many invoices at once: PDF files along with a manifest, or a ZIP archive of them.
+    Each invoice is reported as created or failed, failures not affecting the others."""
+    files = await read_import_files(
+        upload_files,
+        max_files=settings.bulk_import_max_files,
+        max_size=settings.bulk_import_max_size,
+    )
+    invoice_imports, failures = read_manifest(files)
+    results = await InvoiceService.import_invoices(
+        user_id=user_id,
+        invoice_imports=invoice_imports,
+        file_repository=file_repository,
+        invoice_repository=invoice_repository,
+        exchange_rate_repository=exchange_rate_repository,
+        exchange_rate_service=exchange_rate_service,
+        max_concurrency=settings.bulk_import_concurrency,
+        batch_size=settings.bulk_import_batch_size,
+    )
+    return InvoiceImportResponse.from_results(results + failures)
+
+
 @router.post("/parse")
-def parse_invoice(
+async def parse_invoice(
     upload_file: Annotated[UploadFile, File()],
-    parser: Annotated[IParser, Depends(get_parser)],
+    parser: Annotated[IAsyncParser, Depends(get_async_parser)],
     client_repository: Annotated[IClientRepository, Depends(get_client_repository)],
     user_id: Annotated[UUID, Depends(get_current_user_id)],
 ) -> ParserResponse:
-    invoice_data, client = InvoiceService.parse_invoice(
+    invoice_data, client = await InvoiceService.parse_invoice_async(
         file=upload_file.file,
         parser=parser,
         client_repository=client_repository,
@@ -104,6 +158,57 @@ def parse_invoice(
     return ParserResponse(invoice=invoice_data, client_id=client.id_ if client else None)
 
 
+@router.post("/parse/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_parse_job(
+    upload_file: Annotated[UploadFile, File()],
+    queue: Annotated[IParseJobQueue, Depends(get_parse_job_queue)],
+    user_id: Annotated[UUID, Depends(get_current_user_id)],
+) -> ParseJobResponse:
+    """Queue the document to be parsed in the background. The result is retrieved by polling
+    the job, or by streaming its events."""
+    file = await upload_file.read()
+    job = await to_thread.run_sync(
+        lambda: ParseJobService.submit(
+            file=file, user_id=user_id, queue=queue, max_pending=settings.parse_job_max_pending
+        )
+    )
+    return ParseJobResponse.from_job(job)
+
+
+@router.get("/parse/jobs/{job_id}")
+def get_parse_job(
+    job_id: UUID,
+    queue: Annotated[IParseJobQueue, Depends(get_parse_job_queue)],
+    user_id: Annotated[UUID, Depends(get_current_user_id)],
+) -> ParseJobResponse:
+    job = ParseJobService.get_job(job_id=job_id, user_id=user_id, queue=queue)
+    return ParseJobResponse.from_job(job)
+
+
+@router.get("/parse/jobs/{job_id}/events")
+async def stream_parse_job(
+    job_id: UUID,
+    request: Request,
+    queue: Annotated[IParseJobQueue, Depends(get_parse_job_queue)],
+    user_id: Annotated[UUID, Depends(get_current_user_id)],
+) -> StreamingResponse:
+    """Server-sent events of the job, until it succeeds or fails."""
+    job = await to_thread.run_sync(
+        lambda: ParseJobService.get_job(job_id=job_id, user_id=user_id, queue=queue)
+    )
+    return StreamingResponse(
+        parse_job_events(
+            job=job,
+            queue=queue,
+            poll_interval=settings.parse_job_poll_interval,
+            is_disconnected=request.is_disconnected,
+        ),
+        media_type="text/event-stream",
+        # Disable buffering by proxies, events are sent as they come
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{invoice_id}", dependencies=[Depends(get_current_user_id)])
 def get_invoice(
     invoice_id: UUID,
@@ -121,18 +226,21 @@ def get_invoices(
     invoice_repository: Annotated[IInvoiceRepository, Depends(get_invoice_repository)],
     page: int = Query(default=1, ge=1),
     per_page: int = Query(default=10, ge=1),
+    cursor: str | None = Query(default=None),
 ) -> PagedInvoiceResponse:
-    paged_invoices = InvoiceService.get_paged_invoices(
+    paged_invoices, total, next_cursor = InvoiceService.get_paged_invoices(
         user_id=user_id,
         invoice_repository=invoice_repository,
         page=page,
         per_page=per_page,
+        cursor=InvoiceCursor.decode(cursor) if cursor else None,
     )
     return PagedInvoiceResponse(
         page=page,
         per_page=per_page,
-        total=len(paged_invoices),
+        total=total,
         invoices=[InvoiceResponse.from_invoice(invoice) for invoice in paged_invoices],
+        next_cursor=next_cursor.encode() if next_cursor else None,
     )
 
 
@@ -156,6 +264,10 @@ def update_invoice(
     invoice_update: InvoiceUpdate,
     user_id: Annotated[UUID, Depends(get_current_user_id)],
     invoice_repository: Annotated[IInvoiceRepository, Depends(get_invoice_repository)],
+    exchange_rate_service: Annotated[IExchangeRateService, Depends(get_exchange_rates_service)],
+    exchange_rate_repository: Annotated[
+        IExchangeRateRepository, Depends(get_exchange_rate_repository)
+    ],
 ) -> Response:
     InvoiceService.update_invoice(
         user_id=user_id,
@@ -163,6 +275,8 @@ def update_invoice(
         update_client_id=invoice_update.client_id,
         update_invoice_data=invoice_update.data,
         invoice_repository=invoice_repository,
+        exchange_rate_repository=exchange_rate_repository,
+        exchange_rate_service=exchange_rate_service,
     )
     return Response(status_code=204)
 
@@ -179,3 +293,21 @@ def get_invoice_url(
         invoice_repository=invoice_repository,
     )
     return url
+
+
+@router.post("/urls")
+def get_invoice_urls(
+    request: InvoiceUrlsRequest,
+    user_id: Annotated[UUID, Depends(get_current_user_id)],
+    file_repository: Annotated[IFileRepository, Depends(get_file_repository)],
+    invoice_repository: Annotated[IInvoiceRepository, Depends(get_invoice_repository)],
+) -> InvoiceUrlsResponse:
+    """Return the URLs of several invoices in one round trip.
+    Invoices not found are left out of the response."""
+    urls = InvoiceService.get_invoice_urls(
+        invoice_ids=request.invoice_ids,
+        user_id=user_id,
+        file_repository=file_repository,
+        invoice_repository=invoice_repository,
+    )
+    return InvoiceUrlsResponse(urls=urls)
@@ -4,12 +4,20 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, Request, Response
 from fastapi.security import OAuth2PasswordRequestForm
 
-from invoice_reader.interfaces.dependencies.auth import get_current_user_id
+from invoice_reader.domain.auth import UserIdentity
+from invoice_reader.interfaces.dependencies.auth import (
+    get_current_user,
+    get_current_user_id,
+    get_password_hasher,
+    get_user_identity_cache,
+)
 from invoice_reader.interfaces.dependencies.repository import get_user_repository
 from invoice_reader.interfaces.schemas.auth import AuthToken
 from invoice_reader.interfaces.schemas.user import UserCreate, UserResponse
 from invoice_reader.services.auth import AuthService
 from invoice_reader.services.exceptions import AuthenticationException
+from invoice_reader.services.interfaces.cache import ICache
+from invoice_reader.services.interfaces.password_hasher import IPasswordHasher
 from invoice_reader.services.interfaces.repositories import IUserRepository
 from invoice_reader.services.user import UserService
 from invoice_reader.settings import get_settings
@@ -26,11 +34,15 @@ router = APIRouter(
 def signup(
     user_create: UserCreate,
     user_repository: Annotated[IUserRepository, Depends(get_user_repository)],
+    password_hasher: Annotated[IPasswordHasher, Depends(get_password_hasher)],
+    identity_cache: Annotated[ICache[str, UserIdentity], Depends(get_user_identity_cache)],
 ) -> Response:
     UserService.register_user(
         email=user_create.email,
         password=user_create.password,
         user_repository=user_repository,
+        password_hasher=password_hasher,
+        identity_cache=identity_cache,
     )
     return Response(content="User has been added to the database.", status_code=201)
 
@@ -40,11 +52,13 @@ def signin(
     response: Response,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     user_repository: Annotated[IUserRepository, Depends(get_user_repository)],
+    password_hasher: Annotated[IPasswordHasher, Depends(get_password_hasher)],
 ) -> AuthToken:
     access_token, refresh_token = UserService.authenticate_user(
         email=form_data.username,
         password=form_data.password,
         user_repository=user_repository,
+        password_hasher=password_hasher,
     )
     response.set_cookie(
         value=refresh_token,
@@ -62,16 +76,32 @@ def signin(
 def delete_user(
     user_id: Annotated[UUID, Depends(get_current_user_id)],
     user_repository: Annotated[IUserRepository, Depends(get_user_repository)],
+    identity_cache: Annotated[ICache[str, UserIdentity], Depends(get_user_identity_cache)],
 ) -> Response:
-    UserService.delete(user_id=user_id, user_repository=user_repository)
+    UserService.delete(
+        user_id=user_id, user_repository=user_repository, identity_cache=identity_cache
+    )
     return Response(status_code=204)
 
 
 @router.post("/refresh")
-def refresh(request: Request, response: Response) -> AuthToken:
+def refresh(
+    request: Request,
+    response: Response,
+    user_repository: Annotated[IUserRepository, Depends(get_user_repository)],
+    identity_cache: Annotated[ICache[str, UserIdentity], Depends(get_user_identity_cache)],
+) -> AuthToken:
     refresh_token = request.cookies.get("refresh_token")
     if not refresh_token:
         raise AuthenticationException(message="No refresh token found.")
+    # The user is looked up even with `jwt_user_id_claim`: deleted or disabled users do not
+    # get new tokens, which bounds the access of the claim to one access token lifetime.
+    identity = UserService.get_identity(
+        email=AuthService.decode_token(token=refresh_token).email,
+        user_repository=user_repository,
+        identity_cache=identity_cache,
+    )
+    UserService.check_access(identity)
     access_token, refresh_token = AuthService.refresh_token(token=refresh_token)
     response.set_cookie(
         value=refresh_token,
@@ -99,9 +129,5 @@ def signout(response: Response) -> Response:
 
 
 @router.get("/me")
-def get_current_user(
-    user_id: Annotated[UUID, Depends(get_current_user_id)],
-    user_repository: Annotated[IUserRepository, Depends(get_user_repository)],
-) -> UserResponse:
-    user = UserService.get_user(user_id=user_id, user_repository=user_repository)
-    return UserResponse.from_user(user)
+def get_me(identity: Annotated[UserIdentity, Depends(get_current_user)]) -> UserResponse:
+    return UserResponse(user_id=identity.user_id, email=identity.email)
@@ -0,0 +1,108 @@
+import anyio
+import httpx
+from anyio import to_thread
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from invoice_reader.domain.parse_job import ParseJob
+from invoice_reader.infrastructure.exchange_rates import ExchangeRatesUniRateAPI
+from invoice_reader.infrastructure.repositories import (
+    SQLModelClientRepository,
+    SQLModelExchangeRateRepository,
+    SQLModelInvoiceRepository,
+    SQLModelParsedDocumentRepository,
+)
+from invoice_reader.interfaces.dependencies.parser import create_async_parser
+from invoice_reader.services.exchange_rates import backfill_base_amounts, refresh_exchange_rates
+from invoice_reader.services.interfaces.parse_job_queue import IParseJobQueue
+from invoice_reader.services.parse_job import ParseJobService
+from invoice_reader.settings import get_settings
+from invoice_reader.utils.logger import get_logger
+
+settings = get_settings()
+
+logger = get_logger()
+
+PARSE_JOB_PURGE_INTERVAL = 60  # Seconds
+
+
+async def refresh_exchange_rates_periodically(engine: Engine, interval: int) -> None:
+    """Keep today's exchange rates stored, so requests never wait on the external service,
+    and backfill the base amount of invoices stored while no rates were available.
+    Started from the app lifespan of every worker; only one of them fetches at a time."""
+    while True:
+        try:
+            await to_thread.run_sync(_refresh_exchange_rates, engine, abandon_on_cancel=True)
+        except Exception as e:
+            logger.error("Exchange rates refresh failed: {}", e)
+        await anyio.sleep(interval)
+
+
+def _refresh_exchange_rates(engine: Engine) -> None:
+    with Session(engine) as session:
+        exchange_rates = refresh_exchange_rates(
+            exchange_rate_repository=SQLModelExchangeRateRepository(session=session),
+            exchange_rate_service=ExchangeRatesUniRateAPI(),
+        )
+        if exchange_rates:
+            backfill_base_amounts(
+                invoice_repository=SQLModelInvoiceRepository(session=session),
+                exchange_rates=exchange_rates,
+            )
+
+
+async def run_parse_worker(
+    queue: IParseJobQueue,
+    engine: Engine,
+    ml_server_client: httpx.Client,
+    http_client: httpx.AsyncClient,
+) -> None:
+    """Run parse jobs one at a time, checking the queue every poll interval when idle.
+    Started `parse_job_workers` times from the app lifespan of every worker."""
+    while True:
+        try:
+            job = await _run_next_parse_job(
+                queue=queue,
+                engine=engine,
+                ml_server_client=ml_server_client,
+                http_client=http_client,
+            )
+        except Exception as e:
+            logger.error("Parse worker failed: {}", e)
+            job = None
+        if job is None:
+            await anyio.sleep(settings.parse_job_poll_interval)
+
+
+async def purge_parse_jobs_periodically(queue: IParseJobQueue) -> None:
+    """Delete parse jobs and their results once done for longer than their TTL."""
+    while True:
+        try:
+            await to_thread.run_sync(
+                lambda: ParseJobService.purge_expired(queue=queue, ttl=settings.parse_job_ttl)
+            )
+        except Exception as e:
+            logger.error("Parse jobs purge failed: {}", e)
+        await anyio.sleep(PARSE_JOB_PURGE_INTERVAL)
+
+
+async def _run_next_parse_job(
+    queue: IParseJobQueue,
+    engine: Engine,
+    ml_server_client: httpx.Client,
+    http_client: httpx.AsyncClient,
+) -> ParseJob | None:
+    # The session only checks out a connection once a job is claimed
+    with Session(engine) as session:
+        return await ParseJobService.run_next(
+            queue=queue,
+            parser=create_async_parser(
+                ml_server_client=ml_server_client,
+                http_client=http_client,
+                parsed_document_repository=SQLModelParsedDocumentRepository(session=session),
+            ),
+            client_repository=SQLModelClientRepository(session=session),
+            lease=settings.parse_job_lease,
+            max_attempts=settings.parse_job_max_attempts,
+            retry_delay=settings.parse_job_retry_delay,
+        )
@@ -1,26 +1,54 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import Depends
+from fastapi import Depends, Request
 from fastapi.security import OAuth2PasswordBearer
 
+from invoice_reader.domain.auth import UserIdentity
+from invoice_reader.infrastructure.cache import TTLCache
 from invoice_reader.interfaces.dependencies.repository import get_user_repository
 from invoice_reader.services.auth import AuthService
-from invoice_reader.services.exceptions import EntityNotFoundException
+from invoice_reader.services.interfaces.cache import ICache
+from invoice_reader.services.interfaces.password_hasher import IPasswordHasher
 from invoice_reader.services.interfaces.repositories import IUserRepository
+from invoice_reader.services.user import UserService
 from invoice_reader.settings import get_settings
 
 settings = get_settings()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+USER_IDENTITY_CACHE = TTLCache[str, UserIdentity](
+    ttl=settings.user_identity_cache_ttl, maxsize=settings.user_identity_cache_size
+)
 
-def get_current_user_id(
+
+def get_user_identity_cache() -> ICache[str, UserIdentity]:
+    return USER_IDENTITY_CACHE
+
+
+def get_password_hasher(request: Request) -> IPasswordHasher:
+    return request.app.state.password_hasher
+
+
+def get_current_user(
     access_token: Annotated[str, Depends(oauth2_scheme)],
     user_repository: Annotated[IUserRepository, Depends(get_user_repository)],
-) -> UUID:
+    identity_cache: Annotated[ICache[str, UserIdentity], Depends(get_user_identity_cache)],
+) -> UserIdentity:
     payload = AuthService.decode_token(token=access_token)
-    user = user_repository.get_by_email(email=payload.email)
-    if not user:
-        raise EntityNotFoundException(message="User not found.")
-    return user.id_
+    identity = identity_cache.get(payload.email)
+    if not identity and settings.jwt_user_id_claim and payload.user_id:
+        identity = UserIdentity(user_id=payload.user_id, email=payload.email)
+    if not identity:
+        identity = UserService.get_identity(
+            email=payload.email, user_repository=user_repository, identity_cache=identity_cache
+        )
+    UserService.check_access(identity)
+    return identity
+
+
+def get_current_user_id(
+    identity: Annotated[UserIdentity, Depends(get_current_user)],
+) -> UUID:
+    return identity.user_id
@@ -1,11 +1,102 @@
-from invoice_reader.infrastructure.parser import MLServerParser
-from invoice_reader.services.interfaces.parser import IParser
+from typing import Annotated
+
+import httpx
+from fastapi import Depends, Request
+
+from invoice_reader.domain.parsed_document import ParsedDocument
+from invoice_reader.infrastructure.cache import TTLCache
+from invoice_reader.infrastructure.parser import (
+    AsyncCachedParser,
+    AsyncMLServerParser,
+    CachedParser,
+    MLServerParser,
+    ThreadedParser,
+)
+from invoice_reader.interfaces.dependencies.repository import get_parsed_document_repository
+from invoice_reader.services.interfaces.parse_job_queue import IParseJobQueue
+from invoice_reader.services.interfaces.parser import IAsyncParser, IParser
+from invoice_reader.services.interfaces.repositories import IParsedDocumentRepository
 from invoice_reader.settings import get_settings
 
 settings = get_settings()
 
+PARSE_CACHE = TTLCache[str, ParsedDocument](
+    ttl=settings.parse_cache_ttl, maxsize=settings.parse_cache_size
+)
+
+
+def get_parser(
+    request: Request,
+    parsed_document_repository: Annotated[
+        IParsedDocumentRepository, Depends(get_parsed_document_repository)
+    ],
+) -> IParser:
+    return create_parser(
+        ml_server_client=request.app.state.ml_server_client,
+        parsed_document_repository=parsed_document_repository,
+    )
+
+
+def get_async_parser(
+    request: Request,
+    parser: Annotated[IParser, Depends(get_parser)],
+    parsed_document_repository: Annotated[
+        IParsedDocumentRepository, Depends(get_parsed_document_repository)
+    ],
+) -> IAsyncParser:
+    if settings.async_io:
+        return create_async_parser(
+            ml_server_client=request.app.state.ml_server_client,
+            http_client=request.app.state.http_client,
+            parsed_document_repository=parsed_document_repository,
+        )
+    return ThreadedParser(parser=parser)
+
+
+def get_parse_job_queue(request: Request) -> IParseJobQueue:
+    """Return the parse job queue created once per worker in the app lifespan."""
+    return request.app.state.parse_job_queue
+
+
+def create_parser(
+    ml_server_client: httpx.Client, parsed_document_repository: IParsedDocumentRepository
+) -> IParser:
+    return CachedParser(
+        parser=MLServerParser(
+            client=ml_server_client,
+            parser_endpoint_url=settings.parser_endpoint_url,
+            max_retries=settings.ml_server_max_retries,
+            retry_backoff=settings.ml_server_retry_backoff,
+            retry_max_elapsed=settings.ml_server_retry_max_elapsed,
+        ),
+        cache=PARSE_CACHE,
+        repository=parsed_document_repository,
+        parser_version=settings.parser_version,
+    )
+
 
-def get_parser() -> IParser:
-    return MLServerParser(
-        parser_endpoint_url=settings.parser_endpoint_url,
+def create_async_parser(
+    ml_server_client: httpx.Client,
+    http_client: httpx.AsyncClient,
+    parsed_document_repository: IParsedDocumentRepository,
+) -> IAsyncParser:
+    """Also used outside of requests, by the parse workers."""
+    if settings.async_io:
+        return AsyncCachedParser(
+            parser=AsyncMLServerParser(
+                client=http_client,
+                parser_endpoint_url=settings.parser_endpoint_url,
+                max_retries=settings.ml_server_max_retries,
+                retry_backoff=settings.ml_server_retry_backoff,
+                retry_max_elapsed=settings.ml_server_retry_max_elapsed,
+            ),
+            cache=PARSE_CACHE,
+            repository=parsed_document_repository,
+            parser_version=settings.parser_version,
+        )
+    return ThreadedParser(
+        parser=create_parser(
+            ml_server_client=ml_server_client,
+            parsed_document_repository=parsed_document_repository,
+        )
     )
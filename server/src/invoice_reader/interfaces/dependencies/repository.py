@@ -1,22 +1,27 @@
 from typing import Annotated
 
 import sqlmodel
-from fastapi import Depends
+from boto3.s3.transfer import TransferConfig
+from fastapi import Depends, Request
 from sqlalchemy.engine import Engine
-from sqlalchemy.pool import QueuePool
 
+from invoice_reader.infrastructure.cache import TTLCache
 from invoice_reader.infrastructure.models import *  # noqa: F403
 from invoice_reader.infrastructure.repositories import (
     S3FileRepository,
     SQLModelClientRepository,
+    SQLModelExchangeRateRepository,
     SQLModelInvoiceRepository,
+    SQLModelParsedDocumentRepository,
     SQLModelUserRepository,
 )
-from invoice_reader.infrastructure.repositories.exchange_rate import InMemoryExchangeRateRepository
+from invoice_reader.infrastructure.repositories.file import ThreadedFileRepository
 from invoice_reader.services.interfaces.repositories import (
+    IAsyncFileRepository,
     IClientRepository,
     IFileRepository,
     IInvoiceRepository,
+    IParsedDocumentRepository,
     IUserRepository,
 )
 from invoice_reader.services.interfaces.repositories.exchange_rate import IExchangeRateRepository
@@ -24,22 +29,23 @@ from invoice_reader.settings import get_settings
 
 settings = get_settings()
 
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=settings.s3_multipart_threshold,
+    multipart_chunksize=settings.s3_multipart_chunksize,
+    max_concurrency=settings.s3_max_concurrency,
+)
+PRESIGNED_URL_CACHE = TTLCache[str, str](
+    ttl=settings.presigned_url_expiration - settings.presigned_url_cache_margin,
+    maxsize=settings.presigned_url_cache_size,
+)
+
 
-def get_engine() -> Engine:
+def get_engine(request: Request) -> Engine:
     """
-    Create database engine with connection pooling.
-    Uses lru_cache to create a singleton engine shared across all requests.
+    Return the database engine created once per worker in the app lifespan.
+    The engine, and therefore its connection pool, is shared across all requests.
     """
-    return sqlmodel.create_engine(
-        settings.database_url,
-        echo=False,
-        # Connection pooling configuration
-        poolclass=QueuePool,
-        pool_size=10,  # Maintain 10 connections per worker
-        max_overflow=20,  # Allow up to 20 additional connections under load
-        pool_pre_ping=True,  # Verify connections are alive before using
-        pool_recycle=3600,  # Recycle connections after 1 hour (3600 seconds)
-    )
+    return request.app.state.engine
 
 
 def get_session(engine: Annotated[Engine, Depends(get_engine)]):
@@ -47,14 +53,23 @@ def get_session(engine: Annotated[Engine, Depends(get_engine)]):
         yield session
 
 
-def get_file_repository() -> IFileRepository:
+def get_file_repository(request: Request) -> IFileRepository:
     return S3FileRepository(
+        client=request.app.state.s3_client,
+        transfer_config=S3_TRANSFER_CONFIG,
+        url_cache=PRESIGNED_URL_CACHE,
         bucket=settings.s3_bucket_name,
         region=settings.s3_region,
         presigned_url_expiration=settings.presigned_url_expiration,
     )
 
 
+def get_async_file_repository(
+    file_repository: Annotated[IFileRepository, Depends(get_file_repository)],
+) -> IAsyncFileRepository:
+    return ThreadedFileRepository(file_repository=file_repository)
+
+
 def get_invoice_repository(
     session: Annotated[sqlmodel.Session, Depends(get_session)],
 ) -> IInvoiceRepository:
@@ -73,5 +88,13 @@ def get_user_repository(
     return SQLModelUserRepository(session=session)
 
 
-def get_exchange_rate_repository() -> IExchangeRateRepository:
-    return InMemoryExchangeRateRepository()
+def get_parsed_document_repository(
+    session: Annotated[sqlmodel.Session, Depends(get_session)],
+) -> IParsedDocumentRepository:
+    return SQLModelParsedDocumentRepository(session=session)
+
+
+def get_exchange_rate_repository(
+    session: Annotated[sqlmodel.Session, Depends(get_session)],
+) -> IExchangeRateRepository:
+    return SQLModelExchangeRateRepository(session=session)
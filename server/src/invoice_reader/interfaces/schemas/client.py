@@ -31,9 +31,14 @@ class PagedClientResponse(BaseModel):
     per_page: int
     total: int
     clients: list[ClientResponse]
+    next_cursor: str | None = None
 
 
 class ClientRevenueResponse(BaseModel):
     client_id: UUID
     n_invoices: int
     total_revenue: dict[Currency, float] | None = None
+
+
+class ClientRevenuesResponse(BaseModel):
+    revenues: list[ClientRevenueResponse]
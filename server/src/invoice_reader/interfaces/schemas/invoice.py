@@ -1,6 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-from invoice_reader.domain.invoice import UUID, Invoice, InvoiceData
+from invoice_reader.domain.invoice import (
+    UUID,
+    ImportStatus,
+    Invoice,
+    InvoiceData,
+    InvoiceImportResult,
+)
 
 
 class InvoiceCreate(BaseModel):
@@ -34,3 +40,29 @@ class PagedInvoiceResponse(BaseModel):
     per_page: int
     total: int
     invoices: list[InvoiceResponse]
+    next_cursor: str | None = None
+
+
+class InvoiceUrlsRequest(BaseModel):
+    invoice_ids: list[UUID] = Field(min_length=1, max_length=100)
+
+
+class InvoiceUrlsResponse(BaseModel):
+    urls: dict[UUID, str]
+
+
+class InvoiceImportItem(InvoiceCreate):
+    """Manifest entry of a bulk import, referencing one of the uploaded files."""
+
+    filename: str
+
+
+class InvoiceImportResponse(BaseModel):
+    n_created: int
+    n_failed: int
+    results: list[InvoiceImportResult]
+
+    @classmethod
+    def from_results(cls, results: list[InvoiceImportResult]) -> "InvoiceImportResponse":
+        n_created = sum(result.status == ImportStatus.CREATED for result in results)
+        return cls(n_created=n_created, n_failed=len(results) - n_created, results=results)
@@ -1,8 +1,10 @@
+from datetime import datetime
 from uuid import UUID
 
 from pydantic import BaseModel
 
 from invoice_reader.domain.invoice import InvoiceData
+from invoice_reader.domain.parse_job import ParseJob, ParseJobStatus
 
 
 class ParserResponse(BaseModel):
@@ -10,3 +12,29 @@ class ParserResponse(BaseModel):
 
     invoice: InvoiceData
     client_id: UUID | None = None
+
+
+class ParseJobResponse(BaseModel):
+    """Status of a parse job, along with its result once succeeded."""
+
+    job_id: UUID
+    status: ParseJobStatus
+    attempts: int
+    result: ParserResponse | None = None
+    error: str | None = None
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_job(cls, job: ParseJob) -> "ParseJobResponse":
+        return cls(
+            job_id=job.id_,
+            status=job.status,
+            attempts=job.attempts,
+            result=ParserResponse(invoice=job.invoice_data, client_id=job.client_id)
+            if job.invoice_data
+            else None,
+            error=job.error,
+            created_at=job.created_at,
+            updated_at=job.updated_at,
+        )
@@ -43,7 +43,9 @@ class AnalyticsService:
             exchange_rate_service=exchange_rate_service,
         )
         clients = client_repository.get_all(user_id=user_id)
-        invoices = invoice_repository.get_by_year(year=year, user_id=user_id)
+        # Aggregated in the database: one row per (month, client), in the base currency once
+        # backfilled, plus one per currency of the invoices still missing their base amount
+        revenues = invoice_repository.get_monthly_revenues(year=year, user_id=user_id)
 
         client_lookup = {client.id_: client.data.client_name for client in clients}
 
@@ -52,13 +54,9 @@ class AnalyticsService:
             for month in range(1, 13)
         }
 
-        for invoice in invoices:
-            month = (
-                invoice.data.paid_date.month
-                if invoice.data.paid_date
-                else invoice.data.issued_date.month
-            )
-            client_id = invoice.client_id
+        for revenue in revenues:
+            month = revenue.month
+            client_id = revenue.client_id
             client_name = client_lookup.get(client_id)
 
             if not client_name:
@@ -70,23 +68,23 @@ class AnalyticsService:
                 )
                 client_name = "Unknown"
 
-            converted_amount = exchange_rates.convert(
-                invoice.data.gross_amount,
-                from_currency=invoice.data.currency,
-                to_currency=currency,
-            )
-
-            if invoice.client_id not in month_revenues[month]["clients"]:
+            if client_id not in month_revenues[month]["clients"]:
                 month_revenues[month]["clients"][client_id] = {
                     "client_name": client_name,
                     "total_invoiced": 0.0,
                     "total_pending": 0.0,
                 }
 
-            if invoice.data.paid_date:
-                month_revenues[month]["clients"][client_id]["total_invoiced"] += converted_amount
-            else:
-                month_revenues[month]["clients"][client_id]["total_pending"] += converted_amount
+            month_revenues[month]["clients"][client_id]["total_invoiced"] += exchange_rates.convert(
+                revenue.total_paid,
+                from_currency=revenue.currency,
+                to_currency=currency,
+            )
+            month_revenues[month]["clients"][client_id]["total_pending"] += exchange_rates.convert(
+                revenue.total_pending,
+                from_currency=revenue.currency,
+                to_currency=currency,
+            )
 
         for month, month_breakdown in month_revenues.items():
             total_invoiced = sum(
@@ -1,8 +1,8 @@
 from datetime import datetime, timedelta
+from uuid import UUID
 
 import jwt
 from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
-from passlib.context import CryptContext
 
 from invoice_reader.domain.auth import DecodedToken
 from invoice_reader.services.exceptions import AuthenticationException
@@ -10,18 +10,8 @@ from invoice_reader.settings import get_settings
 
 settings = get_settings()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 class AuthService:
-    @staticmethod
-    def verify_password(plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
-
-    @staticmethod
-    def get_password_hash(password: str) -> str:
-        return pwd_context.hash(password)
-
     @staticmethod
     def decode_token(token: str) -> DecodedToken:
         try:
@@ -50,27 +40,30 @@ class AuthService:
                 email=email,
                 expire=settings.access_token_expire,
                 token_type="access",
+                user_id=payload.user_id,
             )
             # We also re-update the refresh token to extend the login session
             refresh_token = cls.create_token(
                 email=email,
                 expire=settings.refresh_token_expire,
                 token_type="refresh",
+                user_id=payload.user_id,
             )
             return access_token, refresh_token
         else:
             raise AuthenticationException(status_code=401, message="Email not found in token.")
 
     @staticmethod
-    def create_token(email: str, expire: int, token_type: str) -> str:
+    def create_token(email: str, expire: int, token_type: str, user_id: UUID | None = None) -> str:
         exp = datetime.now() + timedelta(seconds=expire)
         payload = DecodedToken(
             email=email,
             exp=exp,
             type=token_type,
+            user_id=user_id,
         )
         encoded_jwt = jwt.encode(  # type: ignore
-            payload=payload.model_dump(),
+            payload=payload.model_dump(exclude_none=True),
             key=settings.jwt_secret_key,
             algorithm=settings.jwt_algorithm,
         )
@@ -1,7 +1,9 @@
+from typing import TypedDict
 from uuid import UUID
 
 from invoice_reader.domain.client import Client, ClientData
-from invoice_reader.domain.invoice import Currency
+from invoice_reader.domain.invoice import ClientRevenue, Currency
+from invoice_reader.domain.pagination import ClientCursor
 from invoice_reader.services.exceptions import (
     EntityNotFoundException,
     ExistingEntityException,
@@ -16,6 +18,11 @@ from invoice_reader.utils.logger import get_logger
 logger = get_logger()
 
 
+class ClientRevenues(TypedDict):
+    n_invoices: int
+    total_revenue: dict[Currency, float]
+
+
 class ClientService:
     @staticmethod
     def add_client(
@@ -23,8 +30,7 @@ class ClientService:
         client_data: ClientData,
         client_repository: IClientRepository,
     ) -> None:
-        existing_clients = client_repository.get_all(user_id=user_id)
-        if any(client.data.client_name == client_data.client_name for client in existing_clients):
+        if client_repository.exists_by_name(user_id=user_id, client_name=client_data.client_name):
             raise ExistingEntityException(message="Client with this name already exists.")
         client = Client(
             user_id=user_id,
@@ -48,11 +54,25 @@ class ClientService:
         client_repository: IClientRepository,
         page: int,
         per_page: int,
-    ) -> list[Client]:
-        clients = client_repository.get_all(user_id=user_id)
-        start = (page - 1) * per_page
-        end = start + per_page
-        return clients[start:end]
+        cursor: ClientCursor | None = None,
+    ) -> tuple[list[Client], int, ClientCursor | None]:
+        """Return the page, the total number of clients and the cursor of the next page.
+        If provided, the cursor is used instead of the page number."""
+        # Fetch one extra row to know whether a next page exists
+        clients = client_repository.get_page(
+            user_id=user_id,
+            limit=per_page + 1,
+            offset=(page - 1) * per_page,
+            after=cursor,
+        )
+        total = client_repository.count(user_id=user_id)
+        next_cursor = None
+        if len(clients) > per_page:
+            clients = clients[:per_page]
+            next_cursor = ClientCursor(
+                client_name=clients[-1].data.client_name, client_id=clients[-1].id_
+            )
+        return clients, total, next_cursor
 
     @staticmethod
     def delete_client(
@@ -71,19 +91,17 @@ class ClientService:
         client_update_data: ClientData,
         client_repository: IClientRepository,
     ) -> None:
-        existing_clients = client_repository.get_all(user_id=user_id)
-        if not existing_clients:
-            raise EntityNotFoundException(message=f"No existing clients found for user {user_id}.")
-        if any(
-            client.data.client_name == client_update_data.client_name and client.id_ != client_id
-            for client in existing_clients
+        client = client_repository.get(client_id=client_id)
+        if not client or client.user_id != user_id:
+            raise EntityNotFoundException(message=f"Client with id {client_id} not found.")
+        if client_repository.exists_by_name(
+            user_id=user_id,
+            client_name=client_update_data.client_name,
+            exclude_client_id=client_id,
         ):
             raise ExistingEntityException(
                 message=f"Client with name {client_update_data.client_name} already exists."
             )
-        client = next((client for client in existing_clients if client.id_ == client_id), None)
-        if not client:
-            raise EntityNotFoundException(message=f"Client with id {client_id} not found.")
         updated_client = Client(
             id_=client.id_,
             user_id=client.user_id,
@@ -92,36 +110,70 @@ class ClientService:
         client_repository.update(client=updated_client)
 
     @classmethod
-    def calculate_total_revenue(
+    def get_revenue(
         cls,
         client_id: UUID,
+        user_id: UUID,
         invoice_repository: IInvoiceRepository,
         exchange_rate_service: IExchangeRateService,
         exchange_rate_repository: IExchangeRateRepository,
-    ) -> dict[Currency, float] | None:
+    ) -> ClientRevenues:
         logger.info("Calculating total revenue for client: {}", client_id)
-        total_revenue = {currency: 0.0 for currency in Currency}
-        invoices = invoice_repository.get_by_client_id(client_id=client_id)
+        revenues = cls._convert_revenues(
+            revenues=invoice_repository.get_client_revenues(user_id=user_id, client_id=client_id),
+            exchange_rate_service=exchange_rate_service,
+            exchange_rate_repository=exchange_rate_repository,
+        )
+        return revenues.get(client_id) or cls._empty_revenues()
+
+    @classmethod
+    def get_revenues(
+        cls,
+        user_id: UUID,
+        client_repository: IClientRepository,
+        invoice_repository: IInvoiceRepository,
+        exchange_rate_service: IExchangeRateService,
+        exchange_rate_repository: IExchangeRateRepository,
+    ) -> dict[UUID, ClientRevenues]:
+        """Revenues of every client of the user, including the ones without invoices."""
+        clients = client_repository.get_all(user_id=user_id)
+        revenues = cls._convert_revenues(
+            revenues=invoice_repository.get_client_revenues(user_id=user_id),
+            exchange_rate_service=exchange_rate_service,
+            exchange_rate_repository=exchange_rate_repository,
+        )
+        return {client.id_: revenues.get(client.id_) or cls._empty_revenues() for client in clients}
+
+    @classmethod
+    def _convert_revenues(
+        cls,
+        revenues: list[ClientRevenue],
+        exchange_rate_service: IExchangeRateService,
+        exchange_rate_repository: IExchangeRateRepository,
+    ) -> dict[UUID, ClientRevenues]:
+        """Convert the per currency totals, aggregated in the database, into every currency.
+        Once invoices are backfilled, a client has a single total in the base currency."""
+        if not revenues:
+            return {}
         exchange_rates = get_exchange_rate(
             exchange_rate_repository=exchange_rate_repository,
             exchange_rate_service=exchange_rate_service,
         )
-        # Convert each invoice to all currencies and accumulate
-        for invoice in invoices:
+        client_revenues: dict[UUID, ClientRevenues] = {}
+        for revenue in revenues:
+            client_revenue = client_revenues.setdefault(revenue.client_id, cls._empty_revenues())
+            client_revenue["n_invoices"] += revenue.n_invoices
             for target_currency in Currency:
-                converted_amount = exchange_rates.convert(
-                    value=invoice.data.gross_amount,
-                    from_currency=invoice.data.currency,
+                client_revenue["total_revenue"][target_currency] += exchange_rates.convert(
+                    value=revenue.total,
+                    from_currency=revenue.currency,
                     to_currency=target_currency,
                 )
-                total_revenue[target_currency] += converted_amount
-
-        return total_revenue
+        return client_revenues
 
     @staticmethod
-    def count_invoices(
-        client_id: UUID,
-        invoice_repository: IInvoiceRepository,
-    ) -> int:
-        invoices = invoice_repository.get_by_client_id(client_id=client_id)
-        return len(invoices)
+    def _empty_revenues() -> ClientRevenues:
+        return {
+            "n_invoices": 0,
+            "total_revenue": {currency: 0.0 for currency in Currency},
+        }
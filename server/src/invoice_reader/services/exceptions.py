@@ -22,6 +22,11 @@ class AuthenticationException(CustomException):
         super().__init__(message, status_code=status_code)
 
 
+class TooManyRequestsException(CustomException):
+    def __init__(self, message: str):
+        super().__init__(message, status_code=429)
+
+
 class InfrastructureException(CustomException):
     """Exception for external infrastructure errors."""
 
@@ -1,10 +1,11 @@
-from datetime import datetime
+from datetime import date
 
-from invoice_reader.domain.exchange_rate import ExchangeRates
-from invoice_reader.domain.invoice import Currency
+from invoice_reader.domain.exchange_rate import BASE_CURRENCY, ExchangeRates
+from invoice_reader.domain.invoice import Invoice
 from invoice_reader.services.exceptions import EntityNotFoundException
 from invoice_reader.services.interfaces.exchange_rates import IExchangeRateService
 from invoice_reader.services.interfaces.repositories.exchange_rate import IExchangeRateRepository
+from invoice_reader.services.interfaces.repositories.invoice import IInvoiceRepository
 from invoice_reader.utils.logger import get_logger
 
 logger = get_logger()
@@ -14,30 +15,87 @@ def get_exchange_rate(
     exchange_rate_repository: IExchangeRateRepository,
     exchange_rate_service: IExchangeRateService,
 ) -> ExchangeRates:
-    today_date = datetime.now().date()
-    exchange_rate = exchange_rate_repository.get(
-        rate_date=today_date,
-    )
-    if not exchange_rate:
+    """Today's exchange rates, or the latest stored ones until they are refreshed.
+    Rates are only fetched inline when none were ever stored."""
+    today_date = date.today()
+    exchange_rate = exchange_rate_repository.get(rate_date=today_date)
+    if exchange_rate:
+        return exchange_rate
+    exchange_rate = exchange_rate_repository.get_latest()
+    if exchange_rate:
         logger.info(
-            "No cached exchange rates on {} , fetching from external service.",
-            today_date,
+            "No exchange rates on {}, using rates of {}.", today_date, exchange_rate.rate_date
         )
-        try:
-            # Fetch from the external service if not found in the repository
-            exchange_rate = exchange_rate_service.get_exchange_rates(base_currency=Currency.EUR)
-            # Persist the fetched exchange rates for future use
-            exchange_rate_repository.add(exchange_rate=exchange_rate)
-            logger.info(
-                "Fetched and cached exchange rates.",
-            )
+        return exchange_rate
+    exchange_rate = refresh_exchange_rates(
+        exchange_rate_repository=exchange_rate_repository,
+        exchange_rate_service=exchange_rate_service,
+    )
+    if not exchange_rate:
+        raise EntityNotFoundException(message="Exchange rates not available yet. Please retry.")
+    return exchange_rate
+
+
+def refresh_exchange_rates(
+    exchange_rate_repository: IExchangeRateRepository,
+    exchange_rate_service: IExchangeRateService,
+) -> ExchangeRates | None:
+    """Fetch and store today's exchange rates, unless already stored.
+    Single-flight: returns None without fetching if the rates are being refreshed elsewhere."""
+    today_date = date.today()
+    with exchange_rate_repository.refresh_lock() as acquired:
+        if not acquired:
+            logger.info("Exchange rates are already being refreshed.")
+            return None
+        exchange_rate = exchange_rate_repository.get(rate_date=today_date)
+        if exchange_rate:
             return exchange_rate
+        logger.info("No stored exchange rates on {}, fetching from external service.", today_date)
+        try:
+            exchange_rate = exchange_rate_service.get_exchange_rates(base_currency=BASE_CURRENCY)
         except Exception as e:
             raise EntityNotFoundException(message="Issue with exchange rate fetching.") from e
+        exchange_rate_repository.add(exchange_rate=exchange_rate)
+        logger.info("Fetched and stored exchange rates.")
+        return exchange_rate
 
-    else:
-        logger.info(
-            "Today exchange rates cached: {}",
-            exchange_rate.model_dump_json(),
+
+def find_exchange_rate(
+    exchange_rate_repository: IExchangeRateRepository,
+    exchange_rate_service: IExchangeRateService,
+) -> ExchangeRates | None:
+    """`get_exchange_rate`, returning None instead of raising when no rates are available."""
+    try:
+        return get_exchange_rate(
+            exchange_rate_repository=exchange_rate_repository,
+            exchange_rate_service=exchange_rate_service,
         )
-        return exchange_rate
+    except EntityNotFoundException as e:
+        logger.warning("Exchange rates not available: {}", e.message)
+        return None
+
+
+def with_base_amount(invoice: Invoice, exchange_rates: ExchangeRates | None) -> Invoice:
+    """Invoice carrying its gross amount converted into the base currency.
+    Left without base amount when no rates are available, to be backfilled later."""
+    currency = invoice.data.currency
+    if not exchange_rates or (currency != BASE_CURRENCY and currency not in exchange_rates.rates):
+        return invoice.model_copy(update={"base_amount": None, "base_rate_date": None})
+    base_amount = exchange_rates.convert(
+        invoice.data.gross_amount,
+        from_currency=currency,
+        to_currency=BASE_CURRENCY,
+    )
+    return invoice.model_copy(
+        update={"base_amount": base_amount, "base_rate_date": exchange_rates.rate_date}
+    )
+
+
+def backfill_base_amounts(
+    invoice_repository: IInvoiceRepository, exchange_rates: ExchangeRates
+) -> int:
+    """Convert into the base currency the invoices stored without base amount."""
+    n_invoices = invoice_repository.fill_base_amounts(exchange_rates=exchange_rates)
+    if n_invoices:
+        logger.info("Backfilled the base amount of {} invoices.", n_invoices)
+    return n_invoices
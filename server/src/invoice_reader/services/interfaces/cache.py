@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+
+
+class ICache[K, V](ABC):
+    """Port for an in-process key-value cache."""
+
+    @abstractmethod
+    def get(self, key: K) -> V | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Keep the entry `ttl` seconds, the cache default if None."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, key: K) -> None:
+        raise NotImplementedError
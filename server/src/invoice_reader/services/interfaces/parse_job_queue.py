@@ -0,0 +1,45 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from uuid import UUID
+
+from invoice_reader.domain.parse_job import ParseJob
+
+
+class IParseJobQueue(ABC):
+    """Port for the queue of parse jobs, shared by the API and the parse workers.
+
+    The queue keeps the document of a job until the job is done.
+    """
+
+    @abstractmethod
+    def submit(self, job: ParseJob, file: bytes) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def claim(self, lease: float) -> tuple[ParseJob, bytes] | None:
+        """Mark the oldest available job as running and return it along with its document.
+        Running jobs not updated for `lease` seconds are claimed again, as their worker is
+        considered gone."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def save(self, job: ParseJob) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get(self, job_id: UUID) -> ParseJob | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def count_pending(self) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def purge(self, done_before: datetime) -> int:
+        """Delete the jobs done (succeeded or failed) before the date, return the number of
+        deleted jobs. Jobs still pending or running are kept whatever their age."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def close(self) -> None:
+        raise NotImplementedError
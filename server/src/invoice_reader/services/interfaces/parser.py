@@ -9,3 +9,9 @@ class IParser(ABC):
     @abstractmethod
     def parse(self, file: BinaryIO) -> tuple[InvoiceData, ClientData]:
         raise NotImplementedError
+
+
+class IAsyncParser(ABC):
+    @abstractmethod
+    async def parse(self, file: BinaryIO) -> tuple[InvoiceData, ClientData]:
+        raise NotImplementedError
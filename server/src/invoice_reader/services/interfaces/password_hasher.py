@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+
+
+class IPasswordHasher(ABC):
+    @abstractmethod
+    def hash(self, password: str) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def verify(self, password: str, hashed_password: str) -> bool:
+        raise NotImplementedError
@@ -1,7 +1,8 @@
 from .client import IClientRepository
 from .exchange_rate import IExchangeRateRepository
-from .file import IFileRepository
+from .file import IAsyncFileRepository, IFileRepository
 from .invoice import IInvoiceRepository
+from .parsed_document import IParsedDocumentRepository
 from .user import IUserRepository
 
 __all__ = [
@@ -9,5 +10,7 @@ __all__ = [
     "IClientRepository",
     "IUserRepository",
     "IFileRepository",
+    "IAsyncFileRepository",
     "IExchangeRateRepository",
+    "IParsedDocumentRepository",
 ]
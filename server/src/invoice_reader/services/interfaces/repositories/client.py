@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 
 from invoice_reader.domain.client import UUID, Client
+from invoice_reader.domain.pagination import ClientCursor
 
 
 class IClientRepository(ABC):
@@ -27,3 +28,26 @@ class IClientRepository(ABC):
     @abstractmethod
     def get_by_name(self, user_id: UUID, client_name: str) -> Client | None:
         raise NotImplementedError
+
+    @abstractmethod
+    def exists_by_name(
+        self, user_id: UUID, client_name: str, exclude_client_id: UUID | None = None
+    ) -> bool:
+        """Whether the user has a client with this name, other than `exclude_client_id`."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_page(
+        self,
+        user_id: UUID,
+        limit: int,
+        offset: int = 0,
+        after: ClientCursor | None = None,
+    ) -> list[Client]:
+        """Clients ordered by name then id.
+        `after` switches to keyset pagination and takes precedence over `offset`."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def count(self, user_id: UUID) -> int:
+        raise NotImplementedError
@@ -1,16 +1,29 @@
 from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager
 from datetime import date
 
 from invoice_reader.domain.exchange_rate import ExchangeRates
+from invoice_reader.domain.invoice import Currency
 
 
 class IExchangeRateRepository(ABC):
     """Port for persisting and retrieving exchange rates."""
 
     @abstractmethod
-    def get(self, rate_date: date) -> ExchangeRates | None:
+    def get(self, rate_date: date, base_currency: Currency = Currency.EUR) -> ExchangeRates | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_latest(self, base_currency: Currency = Currency.EUR) -> ExchangeRates | None:
+        """Most recent exchange rates stored, whatever their date."""
         raise NotImplementedError
 
     @abstractmethod
     def add(self, exchange_rate: ExchangeRates) -> None:
         raise NotImplementedError
+
+    @abstractmethod
+    def refresh_lock(self) -> AbstractContextManager[bool]:
+        """Try to acquire the lock for fetching exchange rates, without waiting.
+        Yields whether the lock was acquired."""
+        raise NotImplementedError
@@ -19,3 +19,17 @@ class IFileRepository(ABC):
     @abstractmethod
     def create_storage_path(self, initial_path: str) -> str:
         raise NotImplementedError
+
+
+class IAsyncFileRepository(ABC):
+    @abstractmethod
+    async def store(self, file: File) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, storage_path: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def create_storage_path(self, initial_path: str) -> str:
+        raise NotImplementedError
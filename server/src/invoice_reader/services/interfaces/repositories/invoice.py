@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 
-from invoice_reader.domain.invoice import UUID, Invoice
+from invoice_reader.domain.exchange_rate import ExchangeRates
+from invoice_reader.domain.invoice import UUID, ClientRevenue, Invoice, MonthlyRevenue
+from invoice_reader.domain.pagination import InvoiceCursor
 
 
 class IInvoiceRepository(ABC):
@@ -8,6 +10,11 @@ class IInvoiceRepository(ABC):
     def add(self, invoice: Invoice) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    def add_many(self, invoices: list[Invoice]) -> None:
+        """Add the invoices in a single transaction: none is added if one fails."""
+        raise NotImplementedError
+
     @abstractmethod
     def update(self, invoice: Invoice) -> None:
         raise NotImplementedError
@@ -20,6 +27,11 @@ class IInvoiceRepository(ABC):
     def delete(self, invoice_id: UUID) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    def get_by_ids(self, invoice_ids: list[UUID], user_id: UUID) -> list[Invoice]:
+        """Invoices of the user among `invoice_ids`. Unknown ids are ignored."""
+        raise NotImplementedError
+
     @abstractmethod
     def get_all(self, user_id: UUID) -> list[Invoice]:
         raise NotImplementedError
@@ -28,10 +40,61 @@ class IInvoiceRepository(ABC):
     def get_by_invoice_number(self, invoice_number: str, user_id: UUID) -> Invoice | None:
         raise NotImplementedError
 
+    @abstractmethod
+    def exists_by_invoice_number(
+        self, user_id: UUID, invoice_number: str, exclude_invoice_id: UUID | None = None
+    ) -> bool:
+        """Whether the user has an invoice with this number, other than `exclude_invoice_id`."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_existing_invoice_numbers(self, user_id: UUID, invoice_numbers: list[str]) -> set[str]:
+        """Invoice numbers among `invoice_numbers` already used by the user."""
+        raise NotImplementedError
+
     @abstractmethod
     def get_by_client_id(self, client_id: UUID) -> list[Invoice]:
         raise NotImplementedError
 
     @abstractmethod
     def get_by_year(self, year: int, user_id: UUID) -> list[Invoice]:
+        """Invoices paid during the year, or issued during the year if not paid yet."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_page(
+        self,
+        user_id: UUID,
+        limit: int,
+        offset: int = 0,
+        after: InvoiceCursor | None = None,
+    ) -> list[Invoice]:
+        """Invoices ordered by issued date then id, most recent first.
+        `after` switches to keyset pagination and takes precedence over `offset`."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def count(self, user_id: UUID) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_monthly_revenues(self, year: int, user_id: UUID) -> list[MonthlyRevenue]:
+        """Sum of paid and pending gross amounts per (month, client, currency).
+        An invoice falls in the month it was paid, or issued if not paid yet.
+        Invoices having a base amount are summed in the base currency."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_client_revenues(
+        self, user_id: UUID, client_id: UUID | None = None
+    ) -> list[ClientRevenue]:
+        """Number of invoices and sum of gross amounts per (client, currency), for every client
+        of the user or `client_id` only. Invoices having a base amount are summed in the base
+        currency. Clients without invoices are omitted."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def fill_base_amounts(self, exchange_rates: ExchangeRates) -> int:
+        """Convert into the base currency the gross amount of the invoices stored without base
+        amount. Returns the number of invoices updated."""
         raise NotImplementedError
@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+from invoice_reader.domain.parsed_document import ParsedDocument
+
+
+class IParsedDocumentRepository(ABC):
+    """Port for persisting parser results, keyed by document content hash."""
+
+    @abstractmethod
+    def get(
+        self, content_hash: str, parser_version: str, created_after: datetime
+    ) -> ParsedDocument | None:
+        """Result of this parser version, if parsed after `created_after`."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def add(self, parsed_document: ParsedDocument) -> None:
+        """Replace the previous result of the document, expired or from another version."""
+        raise NotImplementedError
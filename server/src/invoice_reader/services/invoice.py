@@ -1,16 +1,35 @@
+from collections.abc import Callable
+from functools import partial
+from io import BytesIO
 from typing import BinaryIO
 from uuid import UUID, uuid4
 
-from invoice_reader.domain.client import Client
-from invoice_reader.domain.invoice import File, Invoice, InvoiceData
+import anyio
+from anyio import to_thread
+
+from invoice_reader.domain.client import Client, ClientData
+from invoice_reader.domain.exceptions import CustomException
+from invoice_reader.domain.invoice import (
+    File,
+    ImportStatus,
+    Invoice,
+    InvoiceData,
+    InvoiceImport,
+    InvoiceImportResult,
+)
+from invoice_reader.domain.pagination import InvoiceCursor
 from invoice_reader.services.exceptions import (
     EntityNotFoundException,
     ExistingEntityException,
     RollbackException,
 )
-from invoice_reader.services.interfaces.parser import IParser
+from invoice_reader.services.exchange_rates import find_exchange_rate, with_base_amount
+from invoice_reader.services.interfaces.exchange_rates import IExchangeRateService
+from invoice_reader.services.interfaces.parser import IAsyncParser, IParser
 from invoice_reader.services.interfaces.repositories import (
+    IAsyncFileRepository,
     IClientRepository,
+    IExchangeRateRepository,
     IFileRepository,
     IInvoiceRepository,
 )
@@ -30,30 +49,38 @@ class InvoiceService:
         invoice_data: InvoiceData,
         file_repository: IFileRepository,
         invoice_repository: IInvoiceRepository,
+        exchange_rate_repository: IExchangeRateRepository,
+        exchange_rate_service: IExchangeRateService,
     ) -> None:
-        existing_invoice = invoice_repository.get_by_invoice_number(
+        if invoice_repository.exists_by_invoice_number(
             user_id=user_id,
             invoice_number=invoice_data.invoice_number,
-        )
-        if existing_invoice:
+        ):
             raise ExistingEntityException(message="Invoice with this number already exists.")
 
-        invoice_id = uuid4()
-        initial_path = f"{user_id}/{invoice_id}.{filename.split('.')[-1]}"
-        storage_path = file_repository.create_storage_path(initial_path=initial_path)
-        file = File(file=file_bin.read(), filename=filename, storage_path=storage_path)
-
-        invoice = Invoice(
-            id_=invoice_id,
+        file, invoice = cls._create_invoice(
+            file_bin=file_bin,
+            filename=filename,
             user_id=user_id,
             client_id=client_id,
-            storage_path=storage_path,
-            data=invoice_data,
+            invoice_data=invoice_data,
+            storage_path_factory=file_repository.create_storage_path,
+        )
+        invoice = with_base_amount(
+            invoice=invoice,
+            exchange_rates=find_exchange_rate(
+                exchange_rate_repository=exchange_rate_repository,
+                exchange_rate_service=exchange_rate_service,
+            ),
         )
 
         try:
             file_repository.store(file=file)
             invoice_repository.add(invoice=invoice)
+        except ExistingEntityException:
+            # Same number added concurrently since the check above: only the file was stored
+            file_repository.delete(storage_path=file.storage_path)
+            raise
         except Exception as err:
             cls._rollback_add(
                 invoice=invoice,
@@ -62,6 +89,220 @@ class InvoiceService:
                 error=err,
             )
 
+    @classmethod
+    async def add_invoice_async(
+        cls,
+        file_bin: BinaryIO,
+        filename: str,
+        user_id: UUID,
+        client_id: UUID,
+        invoice_data: InvoiceData,
+        file_repository: IAsyncFileRepository,
+        invoice_repository: IInvoiceRepository,
+        exchange_rate_repository: IExchangeRateRepository,
+        exchange_rate_service: IExchangeRateService,
+    ) -> None:
+        """Same as `add_invoice`. Blocking database calls are run in the worker threadpool."""
+        invoice_exists = await to_thread.run_sync(
+            partial(
+                invoice_repository.exists_by_invoice_number,
+                user_id=user_id,
+                invoice_number=invoice_data.invoice_number,
+            )
+        )
+        if invoice_exists:
+            raise ExistingEntityException(message="Invoice with this number already exists.")
+
+        file, invoice = cls._create_invoice(
+            file_bin=file_bin,
+            filename=filename,
+            user_id=user_id,
+            client_id=client_id,
+            invoice_data=invoice_data,
+            storage_path_factory=file_repository.create_storage_path,
+        )
+        exchange_rates = await to_thread.run_sync(
+            partial(
+                find_exchange_rate,
+                exchange_rate_repository=exchange_rate_repository,
+                exchange_rate_service=exchange_rate_service,
+            )
+        )
+        invoice = with_base_amount(invoice=invoice, exchange_rates=exchange_rates)
+
+        try:
+            await file_repository.store(file=file)
+            await to_thread.run_sync(partial(invoice_repository.add, invoice=invoice))
+        except ExistingEntityException:
+            await file_repository.delete(storage_path=file.storage_path)
+            raise
+        except Exception as err:
+            await cls._rollback_add_async(
+                invoice=invoice,
+                invoice_repository=invoice_repository,
+                file_repository=file_repository,
+                error=err,
+            )
+
+    @classmethod
+    async def import_invoices(
+        cls,
+        user_id: UUID,
+        invoice_imports: list[InvoiceImport],
+        file_repository: IAsyncFileRepository,
+        invoice_repository: IInvoiceRepository,
+        exchange_rate_repository: IExchangeRateRepository,
+        exchange_rate_service: IExchangeRateService,
+        max_concurrency: int,
+        batch_size: int,
+    ) -> list[InvoiceImportResult]:
+        """Add many invoices at once and report the status of each of them.
+        Files are uploaded concurrently, then invoices are inserted in batches of `batch_size`
+        per transaction. Failed items are rolled back as in `add_invoice`, without affecting
+        the others."""
+        results: list[InvoiceImportResult] = [
+            InvoiceImportResult(
+                filename=invoice_import.filename,
+                invoice_number=invoice_import.data.invoice_number,
+                status=ImportStatus.FAILED,
+            )
+            for invoice_import in invoice_imports
+        ]
+        existing_numbers = await to_thread.run_sync(
+            partial(
+                invoice_repository.get_existing_invoice_numbers,
+                user_id=user_id,
+                invoice_numbers=[item.data.invoice_number for item in invoice_imports],
+            )
+        )
+        exchange_rates = await to_thread.run_sync(
+            partial(
+                find_exchange_rate,
+                exchange_rate_repository=exchange_rate_repository,
+                exchange_rate_service=exchange_rate_service,
+            )
+        )
+
+        pending: list[tuple[InvoiceImportResult, File, Invoice]] = []
+        for result, invoice_import in zip(results, invoice_imports, strict=True):
+            invoice_number = invoice_import.data.invoice_number
+            if invoice_number in existing_numbers:
+                result.detail = "Invoice with this number already exists."
+                continue
+            existing_numbers.add(invoice_number)  # Duplicates within the import
+            try:
+                file, invoice = cls._create_invoice(
+                    file_bin=BytesIO(invoice_import.file),
+                    filename=invoice_import.filename,
+                    user_id=user_id,
+                    client_id=invoice_import.client_id,
+                    invoice_data=invoice_import.data,
+                    storage_path_factory=file_repository.create_storage_path,
+                )
+            except CustomException as e:
+                result.detail = e.message
+                continue
+            invoice = with_base_amount(invoice=invoice, exchange_rates=exchange_rates)
+            pending.append((result, file, invoice))
+
+        limiter = anyio.CapacityLimiter(max_concurrency)
+        stored: list[tuple[InvoiceImportResult, Invoice]] = []
+
+        async def store(result: InvoiceImportResult, file: File, invoice: Invoice) -> None:
+            async with limiter:
+                try:
+                    await file_repository.store(file=file)
+                except Exception as err:
+                    await cls._rollback_import(
+                        result, invoice, file_repository, invoice_repository, err
+                    )
+                    return
+            stored.append((result, invoice))
+
+        async with anyio.create_task_group() as task_group:
+            for result, file, invoice in pending:
+                task_group.start_soon(store, result, file, invoice)
+
+        for start in range(0, len(stored), batch_size):
+            batch = stored[start : start + batch_size]
+            try:
+                await to_thread.run_sync(
+                    partial(invoice_repository.add_many, invoices=[invoice for _, invoice in batch])
+                )
+            except Exception as err:
+                logger.warning("Batch insert failed, inserting invoices one by one: {}", err)
+                await cls._add_one_by_one(batch, file_repository, invoice_repository)
+                continue
+            for result, invoice in batch:
+                cls._mark_created(result, invoice)
+
+        return results
+
+    @classmethod
+    async def _add_one_by_one(
+        cls,
+        batch: list[tuple[InvoiceImportResult, Invoice]],
+        file_repository: IAsyncFileRepository,
+        invoice_repository: IInvoiceRepository,
+    ) -> None:
+        """Isolate the invoices of a failed batch, rolling back the ones that fail again."""
+        for result, invoice in batch:
+            try:
+                await to_thread.run_sync(partial(invoice_repository.add, invoice=invoice))
+            except Exception as err:
+                await cls._rollback_import(
+                    result, invoice, file_repository, invoice_repository, err
+                )
+            else:
+                cls._mark_created(result, invoice)
+
+    @classmethod
+    async def _rollback_import(
+        cls,
+        result: InvoiceImportResult,
+        invoice: Invoice,
+        file_repository: IAsyncFileRepository,
+        invoice_repository: IInvoiceRepository,
+        error: Exception,
+    ) -> None:
+        try:
+            await cls._rollback_add_async(
+                invoice=invoice,
+                invoice_repository=invoice_repository,
+                file_repository=file_repository,
+                error=error,
+            )
+        except RollbackException as e:
+            result.detail = e.message
+
+    @staticmethod
+    def _mark_created(result: InvoiceImportResult, invoice: Invoice) -> None:
+        result.status = ImportStatus.CREATED
+        result.invoice_id = invoice.id_
+
+    @staticmethod
+    def _create_invoice(
+        file_bin: BinaryIO,
+        filename: str,
+        user_id: UUID,
+        client_id: UUID,
+        invoice_data: InvoiceData,
+        storage_path_factory: Callable[[str], str],
+    ) -> tuple[File, Invoice]:
+        invoice_id = uuid4()
+        initial_path = f"{user_id}/{invoice_id}.{filename.split('.')[-1]}"
+        storage_path = storage_path_factory(initial_path)
+        file = File(file=file_bin.read(), filename=filename, storage_path=storage_path)
+
+        invoice = Invoice(
+            id_=invoice_id,
+            user_id=user_id,
+            client_id=client_id,
+            storage_path=storage_path,
+            data=invoice_data,
+        )
+        return file, invoice
+
     @staticmethod
     def _rollback_add(
         invoice: Invoice,
@@ -79,6 +320,23 @@ class InvoiceService:
         except Exception as e:
             raise RollbackException(message=f"Rollback failed. Error: {e}") from e
 
+    @staticmethod
+    async def _rollback_add_async(
+        invoice: Invoice,
+        file_repository: IAsyncFileRepository,
+        invoice_repository: IInvoiceRepository,
+        error: Exception,
+    ) -> None:
+        logger.error("Issue when storing invoice.\nError: {}\nStarting rollback.", error)
+        try:
+            await file_repository.delete(storage_path=invoice.storage_path)
+            await to_thread.run_sync(partial(invoice_repository.delete, invoice_id=invoice.id_))
+        except Exception as e:
+            raise RollbackException(message=f"Rollback failed. Error: {e}") from e
+        raise RollbackException(
+            message=f"Invoice not properly uploaded. Rollback successful. Error: {error}"
+        )
+
     @staticmethod
     def get_invoice(invoice_id: UUID, invoice_repository: IInvoiceRepository) -> Invoice:
         invoice = invoice_repository.get(invoice_id=invoice_id)
@@ -89,13 +347,29 @@ class InvoiceService:
 
     @staticmethod
     def get_paged_invoices(
-        user_id: UUID, invoice_repository: IInvoiceRepository, page: int, per_page: int
-    ) -> list[Invoice]:
-        # NOTE: Can also perfom the pagination at the DB level for better performance
-        invoices = invoice_repository.get_all(user_id=user_id)
-        start = (page - 1) * per_page
-        end = start + per_page
-        return invoices[start:end]
+        user_id: UUID,
+        invoice_repository: IInvoiceRepository,
+        page: int,
+        per_page: int,
+        cursor: InvoiceCursor | None = None,
+    ) -> tuple[list[Invoice], int, InvoiceCursor | None]:
+        """Return the page, the total number of invoices and the cursor of the next page.
+        If provided, the cursor is used instead of the page number."""
+        # Fetch one extra row to know whether a next page exists
+        invoices = invoice_repository.get_page(
+            user_id=user_id,
+            limit=per_page + 1,
+            offset=(page - 1) * per_page,
+            after=cursor,
+        )
+        total = invoice_repository.count(user_id=user_id)
+        next_cursor = None
+        if len(invoices) > per_page:
+            invoices = invoices[:per_page]
+            next_cursor = InvoiceCursor(
+                issued_date=invoices[-1].data.issued_date, invoice_id=invoices[-1].id_
+            )
+        return invoices, total, next_cursor
 
     @classmethod
     def delete_invoice(
@@ -118,28 +392,22 @@ class InvoiceService:
         update_client_id: UUID,
         update_invoice_data: InvoiceData,
         invoice_repository: IInvoiceRepository,
+        exchange_rate_repository: IExchangeRateRepository,
+        exchange_rate_service: IExchangeRateService,
     ) -> None:
+        invoice = invoice_repository.get(invoice_id=invoice_id)
+        if not invoice or invoice.user_id != user_id:
+            raise EntityNotFoundException(message=f"Invoice with id {invoice_id} not found.")
         # Check for duplicate invoice numbers (excluding the current invoice)
-        existing_invoices = invoice_repository.get_all(user_id=user_id)
-        if not existing_invoices:
-            raise EntityNotFoundException(message=f"No existing invoices found for user {user_id}.")
-        if any(
-            update_invoice_data.invoice_number == invoice.data.invoice_number
-            and invoice.id_ != invoice_id
-            for invoice in existing_invoices
+        if invoice_repository.exists_by_invoice_number(
+            user_id=user_id,
+            invoice_number=update_invoice_data.invoice_number,
+            exclude_invoice_id=invoice_id,
         ):
             raise ExistingEntityException(
                 message=f"Invoice with number {update_invoice_data.invoice_number} already exists."
             )
 
-        # Update invoice
-        invoice = next(
-            (invoice for invoice in existing_invoices if invoice.id_ == invoice_id),
-            None,  # Pick the invoice to update from the already fetched invoices
-        )
-        if not invoice:
-            raise EntityNotFoundException(message=f"Invoice with id {invoice_id} not found.")
-
         updated_invoice = Invoice(
             id_=invoice.id_,
             user_id=invoice.user_id,
@@ -147,6 +415,13 @@ class InvoiceService:
             storage_path=invoice.storage_path,
             data=update_invoice_data,
         )
+        updated_invoice = with_base_amount(
+            invoice=updated_invoice,
+            exchange_rates=find_exchange_rate(
+                exchange_rate_repository=exchange_rate_repository,
+                exchange_rate_service=exchange_rate_service,
+            ),
+        )
         invoice_repository.update(invoice=updated_invoice)
 
     @staticmethod
@@ -161,6 +436,21 @@ class InvoiceService:
         url = file_repository.get_url(storage_path=invoice.storage_path)
         return url
 
+    @staticmethod
+    def get_invoice_urls(
+        invoice_ids: list[UUID],
+        user_id: UUID,
+        file_repository: IFileRepository,
+        invoice_repository: IInvoiceRepository,
+    ) -> dict[UUID, str]:
+        """URLs of the user invoices among `invoice_ids`, fetched in a single query.
+        Invoices not found are left out."""
+        invoices = invoice_repository.get_by_ids(invoice_ids=invoice_ids, user_id=user_id)
+        return {
+            invoice.id_: file_repository.get_url(storage_path=invoice.storage_path)
+            for invoice in invoices
+        }
+
     @staticmethod
     def parse_invoice(
         file: BinaryIO,
@@ -169,6 +459,33 @@ class InvoiceService:
         user_id: UUID,
     ) -> tuple[InvoiceData, Client | None]:
         invoice_data, client_data = parser.parse(file=file)
+        client = InvoiceService._find_client(
+            client_data=client_data, client_repository=client_repository, user_id=user_id
+        )
+        return invoice_data, client
+
+    @staticmethod
+    async def parse_invoice_async(
+        file: BinaryIO,
+        parser: IAsyncParser,
+        client_repository: IClientRepository,
+        user_id: UUID,
+    ) -> tuple[InvoiceData, Client | None]:
+        invoice_data, client_data = await parser.parse(file=file)
+        client = await to_thread.run_sync(
+            partial(
+                InvoiceService._find_client,
+                client_data=client_data,
+                client_repository=client_repository,
+                user_id=user_id,
+            )
+        )
+        return invoice_data, client
+
+    @staticmethod
+    def _find_client(
+        client_data: ClientData, client_repository: IClientRepository, user_id: UUID
+    ) -> Client | None:
         client = (
             client_repository.get_by_name(client_name=client_data.client_name, user_id=user_id)
             if client_data.client_name
@@ -179,4 +496,4 @@ class InvoiceService:
                 "Client with the name {} not found in the database during parsing.",
                 client_data.client_name,
             )
-        return invoice_data, client
+        return client
@@ -0,0 +1,119 @@
+from datetime import timedelta
+from io import BytesIO
+from uuid import UUID
+
+from anyio import to_thread
+
+from invoice_reader.domain.exceptions import CustomException
+from invoice_reader.domain.parse_job import ParseJob, ParseJobStatus, utcnow
+from invoice_reader.services.exceptions import EntityNotFoundException, TooManyRequestsException
+from invoice_reader.services.interfaces.parse_job_queue import IParseJobQueue
+from invoice_reader.services.interfaces.parser import IAsyncParser
+from invoice_reader.services.interfaces.repositories import IClientRepository
+from invoice_reader.services.invoice import InvoiceService
+from invoice_reader.utils.logger import get_logger
+
+logger = get_logger()
+
+
+class ParseJobService:
+    @staticmethod
+    def submit(file: bytes, user_id: UUID, queue: IParseJobQueue, max_pending: int) -> ParseJob:
+        if queue.count_pending() >= max_pending:
+            raise TooManyRequestsException(
+                "Too many documents waiting to be parsed. Please try again later."
+            )
+        job = ParseJob(user_id=user_id)
+        queue.submit(job=job, file=file)
+        return job
+
+    @staticmethod
+    def get_job(job_id: UUID, user_id: UUID, queue: IParseJobQueue) -> ParseJob:
+        job = queue.get(job_id=job_id)
+        if not job or job.user_id != user_id:
+            raise EntityNotFoundException(f"Parse job {job_id} not found.")
+        return job
+
+    @staticmethod
+    def purge_expired(queue: IParseJobQueue, ttl: float) -> int:
+        return queue.purge(done_before=utcnow() - timedelta(seconds=ttl))
+
+    @staticmethod
+    async def run_next(
+        queue: IParseJobQueue,
+        parser: IAsyncParser,
+        client_repository: IClientRepository,
+        lease: float,
+        max_attempts: int,
+        retry_delay: float,
+    ) -> ParseJob | None:
+        """Claim the next available job and run it. Return None if no job is available."""
+        claimed = await to_thread.run_sync(lambda: queue.claim(lease=lease))
+        if not claimed:
+            return None
+        job, file = claimed
+        job = await ParseJobService.run(
+            job=job,
+            file=file,
+            parser=parser,
+            client_repository=client_repository,
+            max_attempts=max_attempts,
+            retry_delay=retry_delay,
+        )
+        await to_thread.run_sync(lambda: queue.save(job=job))
+        return job
+
+    @staticmethod
+    async def run(
+        job: ParseJob,
+        file: bytes,
+        parser: IAsyncParser,
+        client_repository: IClientRepository,
+        max_attempts: int,
+        retry_delay: float,
+    ) -> ParseJob:
+        """Parse the document of a claimed job and return the updated job.
+
+        Failed attempts are retried with an exponential delay, up to `max_attempts`, unless the
+        error comes from the document itself (4xx).
+        """
+        if job.attempts > max_attempts:
+            # Claimed again after its worker went away while running the last attempt
+            return _failed(job, error="The parsing did not complete.")
+        try:
+            invoice_data, client = await InvoiceService.parse_invoice_async(
+                file=BytesIO(file),
+                parser=parser,
+                client_repository=client_repository,
+                user_id=job.user_id,
+            )
+        except Exception as e:
+            error = e.message if isinstance(e, CustomException) else repr(e)
+            logger.warning("Parse job {} attempt {} failed: {}", job.id_, job.attempts, error)
+            is_client_error = isinstance(e, CustomException) and e.status_code < 500
+            if is_client_error or job.attempts >= max_attempts:
+                return _failed(job, error=error)
+            now = utcnow()
+            return job.model_copy(
+                update={
+                    "status": ParseJobStatus.PENDING,
+                    "error": error,
+                    "updated_at": now,
+                    "available_at": now + timedelta(seconds=retry_delay * 2 ** (job.attempts - 1)),
+                }
+            )
+        return job.model_copy(
+            update={
+                "status": ParseJobStatus.SUCCEEDED,
+                "invoice_data": invoice_data,
+                "client_id": client.id_ if client else None,
+                "error": None,
+                "updated_at": utcnow(),
+            }
+        )
+
+
+def _failed(job: ParseJob, error: str) -> ParseJob:
+    return job.model_copy(
+        update={"status": ParseJobStatus.FAILED, "error": error, "updated_at": utcnow()}
+    )
@@ -1,5 +1,6 @@
 from uuid import UUID
 
+from invoice_reader.domain.auth import UserIdentity
 from invoice_reader.domain.user import User
 from invoice_reader.services.auth import AuthService
 from invoice_reader.services.exceptions import (
@@ -7,6 +8,8 @@ from invoice_reader.services.exceptions import (
     EntityNotFoundException,
     ExistingEntityException,
 )
+from invoice_reader.services.interfaces.cache import ICache
+from invoice_reader.services.interfaces.password_hasher import IPasswordHasher
 from invoice_reader.services.interfaces.repositories import IUserRepository
 from invoice_reader.settings import get_settings
 
@@ -22,44 +25,91 @@ class UserService:
         return user
 
     @staticmethod
-    def register_user(email: str, password: str, user_repository: IUserRepository) -> None:
+    def get_identity(
+        email: str,
+        user_repository: IUserRepository,
+        identity_cache: ICache[str, UserIdentity],
+    ) -> UserIdentity:
+        """Identity of the user authenticated with `email`.
+        Served from the cache when possible, to spare a database lookup per request."""
+        identity = identity_cache.get(email)
+        if identity:
+            return identity
+        user = user_repository.get_by_email(email=email)
+        if not user:
+            raise EntityNotFoundException(message="User not found.")
+        identity = UserIdentity(user_id=user.id_, email=user.email, is_disabled=user.is_disabled)
+        identity_cache.set(email, identity)
+        return identity
+
+    @staticmethod
+    def register_user(
+        email: str,
+        password: str,
+        user_repository: IUserRepository,
+        password_hasher: IPasswordHasher,
+        identity_cache: ICache[str, UserIdentity] | None = None,
+    ) -> None:
         existing_user = user_repository.get_by_email(email=email)
         if existing_user:
             raise ExistingEntityException(message="User with this email already exists.")
-        hashed_password = AuthService.get_password_hash(password)
+        hashed_password = password_hasher.hash(password)
         user = User(
             email=email,
             hashed_password=hashed_password,
         )
         user_repository.add(user=user)
+        if identity_cache is not None:
+            identity_cache.delete(email)  # Tombstone of a deleted account with the same email
 
     @staticmethod
     def authenticate_user(
         email: str,
         password: str,
         user_repository: IUserRepository,
+        password_hasher: IPasswordHasher,
     ) -> tuple[str, str]:
         user = user_repository.get_by_email(email=email)
         if not user:
             raise EntityNotFoundException(message="User not found.")
-        is_valid_password = AuthService.verify_password(password, user.hashed_password)
+        is_valid_password = password_hasher.verify(password, user.hashed_password)
         if not is_valid_password:
             raise AuthenticationException(message="Invalid credentials.", status_code=401)
+        user_id_claim = user.id_ if settings.jwt_user_id_claim else None
         access_token = AuthService.create_token(
             email=user.email,
             expire=settings.access_token_expire,
             token_type="access",
+            user_id=user_id_claim,
         )
         refresh_token = AuthService.create_token(
             email=user.email,
             expire=settings.refresh_token_expire,
             token_type="refresh",
+            user_id=user_id_claim,
         )
         return access_token, refresh_token
 
     @staticmethod
-    def delete(user_id: UUID, user_repository: IUserRepository) -> None:
+    def check_access(identity: UserIdentity) -> None:
+        if identity.is_deleted:
+            raise EntityNotFoundException(message="User not found.")
+        if identity.is_disabled:
+            raise AuthenticationException(message="User is disabled.", status_code=403)
+
+    @staticmethod
+    def delete(
+        user_id: UUID,
+        user_repository: IUserRepository,
+        identity_cache: ICache[str, UserIdentity] | None = None,
+    ) -> None:
         user = user_repository.get(user_id=user_id)
         if not user:
             raise EntityNotFoundException(message="User not found. Deletion cancelled.")
         user_repository.delete(user_id=user_id)
+        if identity_cache is not None:
+            # A tombstone rather than an eviction: with `jwt_user_id_claim`, a cache miss would
+            # trust the token claim. Kept as long as the access tokens issued before deletion.
+            tombstone = UserIdentity(user_id=user.id_, email=user.email, is_deleted=True)
+            ttl = max(settings.user_identity_cache_ttl, settings.access_token_expire)
+            identity_cache.set(user.email, tombstone, ttl=ttl)
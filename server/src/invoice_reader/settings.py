@@ -10,10 +10,26 @@ class Settings(BaseSettings):
     postgres_password: str = "postgres"
     postgres_db: str = "postgres"
 
+    db_pool_size: int = 10  # Connections kept open per worker
+    db_max_overflow: int = 20  # Additional connections allowed under load
+    db_pool_recycle: int = 3600  # Recycle connections after 1 hour
+    db_pool_timeout: int = 30  # Seconds to wait for a connection before failing
+
     jwt_secret_key: str = "1234"
     jwt_algorithm: str = "HS256"
     access_token_expire: int = 60
     refresh_token_expire: int = 60 * 60 * 24
+    # Trust the user id signed in the token, without looking up the user on cache misses.
+    # Refreshing the token still looks the user up. A user deleted through the API is denied
+    # on the worker handling the deletion, but keeps access on the other workers and replicas,
+    # as does a user disabled in the database everywhere, until their access token expires.
+    jwt_user_id_claim: bool = False
+    user_identity_cache_ttl: int = 60  # Seconds
+    user_identity_cache_size: int = 10_000
+
+    bcrypt_rounds: int = 12  # Cost factor of new password hashes
+    password_hashing_workers: int = 2  # Processes per worker dedicated to bcrypt
+    password_hashing_max_pending: int = 8  # Queued operations before answering 429
 
     per_page: int = 10
 
@@ -22,10 +38,48 @@ class Settings(BaseSettings):
     frontend_subdomain: str = "app"
 
     presigned_url_expiration: int = 3600
+    presigned_url_cache_margin: int = 300  # Stop serving a cached URL this long before expiry
+    presigned_url_cache_size: int = 10_000
     s3_bucket_name: str = "bucket"
     s3_region: str = "eu-central-1"
+    s3_max_pool_connections: int = 50  # Shared by all request threads of a worker
+    s3_multipart_threshold: int = 8 * 1024 * 1024  # Bytes
+    s3_multipart_chunksize: int = 8 * 1024 * 1024  # Bytes
+    s3_max_concurrency: int = 4  # Parts uploaded concurrently per file
 
     ml_server_url: str = "http://ml-server:5000"
+    ml_server_timeout: float = 60.0
+    ml_server_max_connections: int = 20  # Per worker
+    ml_server_max_keepalive_connections: int = 10
+    ml_server_max_retries: int = 2  # Retries on 502, 503, 504 and connection errors
+    ml_server_retry_backoff: float = 0.5  # Seconds, doubled on each retry
+    ml_server_retry_max_elapsed: float = 10.0  # Seconds, no retry starts past this
+
+    bulk_import_max_files: int = 500  # Invoices per import request
+    bulk_import_max_size: int = 200 * 1024 * 1024  # Bytes, uncompressed
+    bulk_import_concurrency: int = 8  # Files uploaded concurrently per import
+    bulk_import_batch_size: int = 100  # Invoices inserted per transaction
+
+    parse_cache_size: int = 1024  # Parser results kept in memory per worker
+    parse_cache_ttl: int = 7 * 24 * 3600  # Seconds
+    # Bump on ML server model or prompt changes: results of other versions are not served
+    parser_version: str = "1"
+
+    # "database" shares the queue between all the replicas, "sqlite" only between the workers
+    # of a host, "memory" is per worker: the last two fit a single host or development
+    parse_job_backend: str = "database"
+    parse_job_sqlite_path: str = "/tmp/parse_jobs.sqlite"
+    parse_job_workers: int = 4  # Jobs parsed concurrently per worker
+    parse_job_max_pending: int = 1000  # Queued jobs before answering 429
+    parse_job_max_attempts: int = 3
+    parse_job_retry_delay: float = 5.0  # Seconds, doubled on each retry
+    parse_job_lease: int = 300  # Seconds before a running job is considered abandoned
+    parse_job_ttl: int = 24 * 3600  # Seconds done jobs and their results are kept
+    parse_job_poll_interval: float = 0.5  # Seconds between queue checks when idle
+
+    # Serve upload and parsing with async HTTP calls instead of blocking worker threads
+    async_io: bool = False
+    threadpool_size: int = 40  # Worker threads for sync endpoints and blocking calls
 
     @property
     def frontend_url(self) -> str:
@@ -40,6 +94,7 @@ class Settings(BaseSettings):
         return f"{self.ml_server_url}/v1/parse"
 
     exchange_rates_api_key: str = ""
+    exchange_rates_refresh_interval: int = 3600  # Seconds between checks for today's rates
 
 
 @lru_cache
@@ -0,0 +1,25 @@
+import os
+from collections.abc import Generator
+
+import pytest
+from sqlalchemy import StaticPool
+from sqlalchemy.engine import Engine
+from sqlmodel import SQLModel, create_engine
+
+# In-memory SQLite by default, can point to an empty Postgres database, see the benchmarks
+DATABASE_URL = os.getenv("BENCHMARK_DATABASE_URL", "sqlite://")
+
+
+@pytest.fixture(scope="module")
+def engine() -> Generator[Engine, None, None]:
+    if DATABASE_URL.startswith("sqlite"):
+        engine = create_engine(
+            DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+    else:
+        engine = create_engine(DATABASE_URL)
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    SQLModel.metadata.drop_all(engine)
+    engine.dispose()
@@ -0,0 +1,96 @@
+"""Fire a burst of concurrent parse requests and compare the blocking and async parser paths.
+
+The parser latency is simulated. With a small worker threadpool, the blocking parser queues
+behind the available threads while the async parser only waits on the event loop, e.g.:
+
+    BENCHMARK_N_REQUESTS=200 uv run pytest tests/benchmarks/test_concurrency.py -m benchmark -s
+"""
+
+import asyncio
+import os
+import time
+from typing import BinaryIO
+from uuid import uuid4
+
+import anyio
+import httpx
+import pytest
+from anyio import to_thread
+
+from invoice_reader.domain.client import ClientData
+from invoice_reader.domain.invoice import InvoiceData
+from invoice_reader.infrastructure.parser import TestParser
+from invoice_reader.infrastructure.repositories.client import InMemoryClientRepository
+from invoice_reader.infrastructure.repositories.parsed_document import (
+    InMemoryParsedDocumentRepository,
+)
+from invoice_reader.interfaces.api.main import app
+from invoice_reader.interfaces.dependencies.auth import get_current_user_id
+from invoice_reader.interfaces.dependencies.parser import get_async_parser, get_parser
+from invoice_reader.interfaces.dependencies.repository import (
+    get_client_repository,
+    get_parsed_document_repository,
+)
+from invoice_reader.services.interfaces.parser import IAsyncParser, IParser
+
+pytestmark = pytest.mark.benchmark
+
+N_REQUESTS = int(os.getenv("BENCHMARK_N_REQUESTS", "40"))
+THREADPOOL_SIZE = 4
+PARSER_LATENCY = 0.1  # seconds
+
+
+class BlockingParser(IParser):
+    def parse(self, file: BinaryIO) -> tuple[InvoiceData, ClientData]:
+        time.sleep(PARSER_LATENCY)
+        return TestParser().parse(file=file)
+
+
+class AsyncParser(IAsyncParser):
+    async def parse(self, file: BinaryIO) -> tuple[InvoiceData, ClientData]:
+        await anyio.sleep(PARSER_LATENCY)
+        return TestParser().parse(file=file)
+
+
+async def burst(n_requests: int) -> float:
+    """Send `n_requests` concurrent parse requests and return the throughput in req/s."""
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            *(
+                client.post(
+                    "/v1/invoices/parse",
+                    files={"upload_file": ("invoice.pdf", b"%PDF-1.4", "application/pdf")},
+                )
+                for _ in range(n_requests)
+            )
+        )
+        elapsed = time.perf_counter() - start
+    assert all(response.status_code == 200 for response in responses)
+    return n_requests / elapsed
+
+
+def test_async_parser_increases_throughput():
+    user_id = uuid4()
+    app.dependency_overrides[get_current_user_id] = lambda: user_id
+    app.dependency_overrides[get_client_repository] = lambda: InMemoryClientRepository()
+    app.dependency_overrides[get_parsed_document_repository] = lambda: (
+        InMemoryParsedDocumentRepository()
+    )
+    try:
+        app.dependency_overrides[get_parser] = lambda: BlockingParser()
+        blocking_throughput = asyncio.run(burst(N_REQUESTS))
+
+        app.dependency_overrides[get_async_parser] = lambda: AsyncParser()
+        async_throughput = asyncio.run(burst(N_REQUESTS))
+    finally:
+        app.dependency_overrides.clear()
+
+    print(
+        f"\n{N_REQUESTS} concurrent parse requests, {THREADPOOL_SIZE} worker threads:"
+        f"\nblocking parser: {blocking_throughput:.1f} req/s"
+        f"\nasync parser: {async_throughput:.1f} req/s"
+    )
+    assert async_throughput > 2 * blocking_throughput
@@ -0,0 +1,85 @@
+"""Compare the upload latency of a per-request S3 client against the shared client.
+
+Runs against moto's in-process S3 stand-in, which is not a project dependency:
+
+    uv run --with "moto[s3]" pytest tests/benchmarks/test_s3_client.py -m benchmark -s
+"""
+
+import os
+import statistics
+import time
+from collections.abc import Callable, Generator
+
+import pytest
+from boto3.s3.transfer import TransferConfig
+
+from invoice_reader.domain.invoice import File
+from invoice_reader.infrastructure.repositories.file import S3FileRepository, create_s3_client
+
+pytestmark = pytest.mark.benchmark
+
+moto = pytest.importorskip("moto")
+
+N_UPLOADS = int(os.getenv("BENCHMARK_N_UPLOADS", "30"))
+BUCKET = "benchmark-bucket"
+FILE = File(filename="invoice.pdf", file=b"%PDF-1.4" + b"0" * 200_000, storage_path="")
+
+
+@pytest.fixture
+def mocked_s3() -> Generator[None, None, None]:
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    with moto.mock_aws():
+        create_s3_client(max_pool_connections=10).create_bucket(Bucket=BUCKET)
+        yield
+
+
+def upload_latencies(get_repository: Callable[[], S3FileRepository]) -> list[float]:
+    """Upload latencies in ms, the repository being resolved per upload as in a request."""
+    latencies = []
+    for i in range(N_UPLOADS):
+        start = time.perf_counter()
+        repository = get_repository()
+        repository.store(
+            File(
+                filename=FILE.filename,
+                file=FILE.file,
+                storage_path=repository.create_storage_path(f"user/{i}.pdf"),
+            )
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def test_shared_client_reduces_upload_latency(mocked_s3: None):
+    transfer_config = TransferConfig(multipart_threshold=8 * 1024 * 1024)
+
+    def per_request_repository() -> S3FileRepository:
+        return S3FileRepository(
+            client=create_s3_client(max_pool_connections=10),
+            bucket=BUCKET,
+            region="us-east-1",
+            presigned_url_expiration=3600,
+            transfer_config=transfer_config,
+        )
+
+    shared_client = create_s3_client(max_pool_connections=10)
+
+    def shared_repository() -> S3FileRepository:
+        return S3FileRepository(
+            client=shared_client,
+            bucket=BUCKET,
+            region="us-east-1",
+            presigned_url_expiration=3600,
+            transfer_config=transfer_config,
+        )
+
+    per_request = statistics.median(upload_latencies(per_request_repository))
+    shared = statistics.median(upload_latencies(shared_repository))
+    print(
+        f"\nMedian upload latency over {N_UPLOADS} uploads:"
+        f"\nper-request client: {per_request:.2f} ms"
+        f"\nshared client: {shared:.2f} ms"
+    )
+    assert shared < per_request
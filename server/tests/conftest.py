@@ -1,6 +1,9 @@
 from invoice_reader.infrastructure.repositories.client import InMemoryClientRepository
 from invoice_reader.infrastructure.repositories.exchange_rate import InMemoryExchangeRateRepository
 from invoice_reader.infrastructure.repositories.invoice import InMemoryInvoiceRepository
+from invoice_reader.infrastructure.repositories.parsed_document import (
+    InMemoryParsedDocumentRepository,
+)
 from invoice_reader.infrastructure.repositories.user import InMemoryUserRepository
 
 pytest_plugins = [
@@ -16,3 +19,4 @@ InMemoryInvoiceRepository.init()
 InMemoryClientRepository.init()
 InMemoryUserRepository.init()
 InMemoryExchangeRateRepository.init()
+InMemoryParsedDocumentRepository.init()
@@ -1,6 +1,7 @@
 import pytest
 
 from invoice_reader.domain.user import User
+from invoice_reader.infrastructure.password_hasher import BcryptPasswordHasher
 from invoice_reader.infrastructure.repositories.user import InMemoryUserRepository
 from invoice_reader.interfaces.schemas.auth import AuthToken
 from invoice_reader.interfaces.schemas.user import UserCreate
@@ -16,7 +17,7 @@ def user_password() -> str:
 def user(user_password: str) -> User:
     return User(
         email="user@example.com",
-        hashed_password=AuthService.get_password_hash(user_password),
+        hashed_password=BcryptPasswordHasher(rounds=4).hash(user_password),
         is_disabled=False,
     )
 
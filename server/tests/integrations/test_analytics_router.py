@@ -0,0 +1,52 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from invoice_reader.domain.client import Client
+from invoice_reader.domain.invoice import Currency, Invoice
+from invoice_reader.domain.user import User
+from invoice_reader.infrastructure.exchange_rates import TestExchangeRatesService
+from invoice_reader.infrastructure.repositories.client import InMemoryClientRepository
+from invoice_reader.infrastructure.repositories.exchange_rate import InMemoryExchangeRateRepository
+from invoice_reader.infrastructure.repositories.invoice import InMemoryInvoiceRepository
+from invoice_reader.interfaces.api.main import app
+from invoice_reader.interfaces.dependencies.auth import get_current_user_id
+from invoice_reader.interfaces.dependencies.exchange_rates import get_exchange_rates_service
+from invoice_reader.interfaces.dependencies.repository import (
+    get_client_repository,
+    get_exchange_rate_repository,
+    get_invoice_repository,
+)
+from invoice_reader.interfaces.schemas.analytics import MonthlyRevenueResponse
+
+
+@pytest.fixture
+def test_client(user: User):
+    client = TestClient(app)
+    app.dependency_overrides[get_client_repository] = lambda: InMemoryClientRepository()
+    app.dependency_overrides[get_invoice_repository] = lambda: InMemoryInvoiceRepository()
+    app.dependency_overrides[get_current_user_id] = lambda: user.id_
+    app.dependency_overrides[get_exchange_rates_service] = lambda: TestExchangeRatesService()
+    app.dependency_overrides[get_exchange_rate_repository] = lambda: (
+        InMemoryExchangeRateRepository()
+    )
+    yield client
+    app.dependency_overrides.clear()
+
+
+def test_get_monthly_revenues(
+    test_client: TestClient, existing_client: Client, existing_invoices: list[Invoice]
+):
+    invoice_date = existing_invoices[0].data.issued_date
+    response = test_client.get(
+        "/v1/analytics/revenues/monthly",
+        params={"year": invoice_date.year, "currency": Currency.CZK},
+    )
+    assert response.status_code == 200
+    monthly_revenues = MonthlyRevenueResponse.model_validate(response.json())
+    assert len(monthly_revenues.revenues) == 12
+    month_revenue = monthly_revenues.revenues[invoice_date.month - 1]
+    expected_pending = sum(invoice.data.gross_amount for invoice in existing_invoices)
+    assert month_revenue.total_pending == expected_pending
+    assert month_revenue.total_invoiced == 0
+    assert month_revenue.clients[0].client_name == existing_client.data.client_name
+    assert month_revenue.clients[0].total_pending == expected_pending
@@ -4,6 +4,7 @@ import pytest
 from fastapi.testclient import TestClient
 
 from invoice_reader.domain.client import Client
+from invoice_reader.domain.invoice import Currency, Invoice
 from invoice_reader.domain.user import User
 from invoice_reader.infrastructure.exchange_rates import TestExchangeRatesService
 from invoice_reader.infrastructure.repositories.client import InMemoryClientRepository
@@ -20,6 +21,8 @@ from invoice_reader.interfaces.dependencies.repository import (
 from invoice_reader.interfaces.schemas.client import (
     ClientCreate,
     ClientResponse,
+    ClientRevenueResponse,
+    ClientRevenuesResponse,
     ClientUpdate,
     PagedClientResponse,
 )
@@ -91,6 +94,33 @@ def test_get_paged_clients(test_client: TestClient, existing_client: Client):
     assert paged_clients.clients[0].client_id == existing_client.id_
 
 
+def test_get_paged_clients_with_cursor(test_client: TestClient, existing_client: Client):
+    for name in ("Other Client", "Another Client"):
+        InMemoryClientRepository().add(
+            existing_client.model_copy(
+                update={
+                    "id_": uuid4(),
+                    "data": existing_client.data.model_copy(update={"client_name": name}),
+                }
+            )
+        )
+    response = test_client.get("/v1/clients", params={"per_page": 2})
+    first_page = PagedClientResponse.model_validate(response.json())
+    assert first_page.total == 3
+    assert [client.data.client_name for client in first_page.clients] == [
+        "Another Client",
+        "Other Client",
+    ]
+    assert first_page.next_cursor
+
+    response = test_client.get(
+        "/v1/clients", params={"per_page": 2, "cursor": first_page.next_cursor}
+    )
+    last_page = PagedClientResponse.model_validate(response.json())
+    assert [client.client_id for client in last_page.clients] == [existing_client.id_]
+    assert last_page.next_cursor is None
+
+
 def test_get_client_not_found(test_client: TestClient):
     response = test_client.get(f"/v1/clients/{uuid4()}")
     assert response.status_code == 404
@@ -99,3 +129,36 @@ def test_get_client_not_found(test_client: TestClient):
 def test_delete_client_not_found(test_client: TestClient):
     response = test_client.delete(f"/v1/clients/{uuid4()}")
     assert response.status_code == 404
+
+
+def test_get_client_revenue(
+    test_client: TestClient, existing_client: Client, existing_invoices: list[Invoice]
+):
+    response = test_client.get(f"/v1/clients/{existing_client.id_}/revenue")
+    assert response.status_code == 200
+    revenue = ClientRevenueResponse.model_validate(response.json())
+    assert revenue.n_invoices == 3
+    assert revenue.total_revenue
+    assert revenue.total_revenue[Currency.CZK] == pytest.approx(30000)
+    assert revenue.total_revenue[Currency.EUR] == pytest.approx(30000 / 24.0)
+
+
+def test_get_clients_revenue(
+    test_client: TestClient,
+    existing_client: Client,
+    existing_invoices: list[Invoice],
+):
+    client_without_invoices = existing_client.model_copy(update={"id_": uuid4()})
+    InMemoryClientRepository().add(client_without_invoices)
+
+    response = test_client.get("/v1/clients/revenue")
+    assert response.status_code == 200
+    revenues = {
+        revenue.client_id: revenue
+        for revenue in ClientRevenuesResponse.model_validate(response.json()).revenues
+    }
+    assert revenues.keys() == {existing_client.id_, client_without_invoices.id_}
+    assert revenues[existing_client.id_].n_invoices == 3
+    assert revenues[existing_client.id_].total_revenue
+    assert revenues[existing_client.id_].total_revenue[Currency.CZK] == pytest.approx(30000)
+    assert revenues[client_without_invoices.id_].n_invoices == 0
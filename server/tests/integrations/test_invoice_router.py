@@ -1,41 +1,73 @@
+import csv
+import io
+import json
+import zipfile
+from functools import partial
 from typing import Any
 from uuid import uuid4
 
+import anyio
 import pytest
 from fastapi.testclient import TestClient
 
 from invoice_reader.domain.client import Client
-from invoice_reader.domain.invoice import Invoice
+from invoice_reader.domain.invoice import File, ImportStatus, Invoice, InvoiceData
+from invoice_reader.domain.parse_job import ParseJob, ParseJobStatus
 from invoice_reader.domain.user import User
-from invoice_reader.infrastructure.parser import TestParser
+from invoice_reader.infrastructure.exchange_rates import TestExchangeRatesService
+from invoice_reader.infrastructure.parse_job_queue import InMemoryParseJobQueue
+from invoice_reader.infrastructure.parser import TestParser, ThreadedParser
 from invoice_reader.infrastructure.repositories.client import InMemoryClientRepository
+from invoice_reader.infrastructure.repositories.exchange_rate import InMemoryExchangeRateRepository
 from invoice_reader.infrastructure.repositories.file import InMemoryFileRepository
 from invoice_reader.infrastructure.repositories.invoice import InMemoryInvoiceRepository
+from invoice_reader.infrastructure.repositories.parsed_document import (
+    InMemoryParsedDocumentRepository,
+)
 from invoice_reader.interfaces.api.main import app
 from invoice_reader.interfaces.dependencies.auth import get_current_user_id
-from invoice_reader.interfaces.dependencies.parser import get_parser
+from invoice_reader.interfaces.dependencies.exchange_rates import get_exchange_rates_service
+from invoice_reader.interfaces.dependencies.parser import get_parse_job_queue, get_parser
 from invoice_reader.interfaces.dependencies.repository import (
     get_client_repository,
+    get_exchange_rate_repository,
     get_file_repository,
     get_invoice_repository,
+    get_parsed_document_repository,
 )
 from invoice_reader.interfaces.schemas.invoice import (
     InvoiceCreate,
+    InvoiceImportResponse,
     InvoiceResponse,
     InvoiceUpdate,
+    InvoiceUrlsResponse,
     PagedInvoiceResponse,
 )
-from invoice_reader.interfaces.schemas.parser import ParserResponse
+from invoice_reader.interfaces.schemas.parser import ParseJobResponse, ParserResponse
+from invoice_reader.services.parse_job import ParseJobService
 
 
 @pytest.fixture
-def test_client(user: User):
+def parse_job_queue() -> InMemoryParseJobQueue:
+    return InMemoryParseJobQueue()
+
+
+@pytest.fixture
+def test_client(user: User, parse_job_queue: InMemoryParseJobQueue):
     client = TestClient(app)
     app.dependency_overrides[get_invoice_repository] = lambda: InMemoryInvoiceRepository()
     app.dependency_overrides[get_parser] = lambda: TestParser()
     app.dependency_overrides[get_current_user_id] = lambda: user.id_
     app.dependency_overrides[get_file_repository] = lambda: InMemoryFileRepository()
     app.dependency_overrides[get_client_repository] = lambda: InMemoryClientRepository()
+    app.dependency_overrides[get_parsed_document_repository] = lambda: (
+        InMemoryParsedDocumentRepository()
+    )
+    app.dependency_overrides[get_exchange_rates_service] = lambda: TestExchangeRatesService()
+    app.dependency_overrides[get_exchange_rate_repository] = lambda: (
+        InMemoryExchangeRateRepository()
+    )
+    app.dependency_overrides[get_parse_job_queue] = lambda: parse_job_queue
     yield client
     app.dependency_overrides.clear()
 
@@ -54,6 +86,9 @@ def test_add_invoice(
     )
     assert invoice
     assert invoice.data.invoice_number == invoice_create.data.invoice_number
+    # Stored along with its amount in the base currency (EUR), 24 CZK per EUR in tests
+    assert invoice.base_amount == pytest.approx(invoice_create.data.gross_amount / 24.0)
+    assert invoice.base_rate_date
 
 
 def test_add_exisiting_invoice(
@@ -76,7 +111,6 @@ def test_get_invoice(test_client: TestClient, existing_invoice: Invoice):
     assert invoice_response.data.invoice_number == existing_invoice.data.invoice_number
 
 
-# TODO: Get invoices
 # TODO: Update with existing invoice number (require several invoices already stored)
 
 
@@ -112,12 +146,47 @@ def test_get_paged_invoices(test_client: TestClient, existing_invoice: Invoice):
     assert paged_invoices.invoices[0].invoice_id == existing_invoice.id_
 
 
+def test_get_paged_invoices_with_cursor(test_client: TestClient, existing_invoices: list[Invoice]):
+    response = test_client.get("/v1/invoices", params={"per_page": 2})
+    first_page = PagedInvoiceResponse.model_validate(response.json())
+    assert response.status_code == 200
+    assert first_page.total == len(existing_invoices)
+    assert len(first_page.invoices) == 2
+    assert first_page.next_cursor
+
+    response = test_client.get(
+        "/v1/invoices", params={"per_page": 2, "cursor": first_page.next_cursor}
+    )
+    last_page = PagedInvoiceResponse.model_validate(response.json())
+    assert response.status_code == 200
+    assert len(last_page.invoices) == 1
+    assert last_page.next_cursor is None
+    returned_ids = {invoice.invoice_id for invoice in first_page.invoices + last_page.invoices}
+    assert returned_ids == {invoice.id_ for invoice in existing_invoices}
+
+
+def test_get_paged_invoices_invalid_cursor(test_client: TestClient):
+    response = test_client.get("/v1/invoices", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
 def test_file_storage_url(test_client: TestClient, existing_invoice: Invoice):
     response = test_client.get(f"/v1/invoices/{existing_invoice.id_}/url")
     assert response.status_code == 200
     assert response.json() == "fake_url"
 
 
+def test_get_invoice_urls(test_client: TestClient, existing_invoices: list[Invoice]):
+    invoice_ids = [str(invoice.id_) for invoice in existing_invoices]
+    response = test_client.post(
+        "/v1/invoices/urls", json={"invoice_ids": [*invoice_ids, str(uuid4())]}
+    )
+    assert response.status_code == 200
+    urls = InvoiceUrlsResponse.model_validate(response.json()).urls
+    assert {str(invoice_id) for invoice_id in urls} == set(invoice_ids)
+    assert all(url == "fake_url" for url in urls.values())
+
+
 def test_get_invoice_not_found(test_client: TestClient):
     response = test_client.get(f"/v1/invoices/{uuid4()}")
     assert response.status_code == 404
@@ -145,6 +214,53 @@ def test_parser_with_client_found(
     assert parser_response.client_id == existing_client.id_
 
 
+def test_parse_job(
+    test_client: TestClient,
+    upload_files: Any,
+    existing_client: Client,
+    parse_job_queue: InMemoryParseJobQueue,
+):
+    response = test_client.post("/v1/invoices/parse/jobs", files=upload_files)
+    assert response.status_code == 202
+    job_response = ParseJobResponse.model_validate(response.json())
+    assert job_response.status == ParseJobStatus.PENDING
+
+    # Run by the parse workers, not started along with the test client
+    anyio.run(
+        partial(
+            ParseJobService.run_next,
+            queue=parse_job_queue,
+            parser=ThreadedParser(TestParser()),
+            client_repository=InMemoryClientRepository(),
+            lease=60,
+            max_attempts=1,
+            retry_delay=0,
+        )
+    )
+    response = test_client.get(f"/v1/invoices/parse/jobs/{job_response.job_id}")
+    assert response.status_code == 200
+    job_response = ParseJobResponse.model_validate(response.json())
+    assert job_response.status == ParseJobStatus.SUCCEEDED
+    assert job_response.result
+    assert job_response.result.client_id == existing_client.id_
+
+    response = test_client.get(f"/v1/invoices/parse/jobs/{job_response.job_id}/events")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    event, data = response.text.strip().split("\n")
+    assert event == "event: status"
+    assert ParseJobResponse.model_validate_json(data.removeprefix("data: ")) == job_response
+
+
+def test_parse_job_of_other_user(test_client: TestClient, parse_job_queue: InMemoryParseJobQueue):
+    job = ParseJob(user_id=uuid4())
+    parse_job_queue.submit(job, file=b"file")
+    response = test_client.get(f"/v1/invoices/parse/jobs/{job.id_}")
+    assert response.status_code == 404
+    response = test_client.get(f"/v1/invoices/parse/jobs/{job.id_}/events")
+    assert response.status_code == 404
+
+
 def test_invoice_not_pdf(test_client: TestClient, invoice_create: InvoiceCreate):
     response = test_client.post(
         "/v1/invoices",
@@ -152,3 +268,125 @@ def test_invoice_not_pdf(test_client: TestClient, invoice_create: InvoiceCreate)
         data={"data": invoice_create.model_dump_json()},
     )
     assert response.status_code == 400
+
+
+def test_import_invoices(
+    test_client: TestClient,
+    file: File,
+    client: Client,
+    invoice_data: InvoiceData,
+    existing_invoice: Invoice,
+):
+    manifest = [
+        {
+            "filename": f"{number}.pdf",
+            "client_id": str(client.id_),
+            "data": invoice_data.model_copy(update={"invoice_number": number}).model_dump(
+                mode="json"
+            ),
+        }
+        for number in ("INV-1", "INV-2", existing_invoice.data.invoice_number)
+    ]
+    response = test_client.post(
+        "/v1/invoices/bulk",
+        files=[
+            ("upload_files", ("manifest.json", json.dumps(manifest), "application/json")),
+            *[
+                ("upload_files", (f"{name}.pdf", file.file, "application/pdf"))
+                for name in ("INV-1", "INV-2", existing_invoice.data.invoice_number, "unknown")
+            ],
+        ],
+    )
+    assert response.status_code == 200
+    import_response = InvoiceImportResponse.model_validate(response.json())
+    assert import_response.n_created == 2
+    assert import_response.n_failed == 2
+    statuses = {result.filename: result.status for result in import_response.results}
+    assert statuses == {
+        "INV-1.pdf": ImportStatus.CREATED,
+        "INV-2.pdf": ImportStatus.CREATED,
+        f"{existing_invoice.data.invoice_number}.pdf": ImportStatus.FAILED,
+        "unknown.pdf": ImportStatus.FAILED,
+    }
+    for result in import_response.results:
+        if result.status == ImportStatus.CREATED:
+            assert result.invoice_id
+            invoice = InMemoryInvoiceRepository().get(result.invoice_id)
+            assert invoice
+            assert InMemoryFileRepository().get(invoice.storage_path) == file.file
+
+
+def test_import_invoices_from_zip(
+    test_client: TestClient, file: File, client: Client, invoice_data: InvoiceData
+):
+    manifest = io.StringIO()
+    fieldnames = ["filename", "client_id", *InvoiceData.model_fields]
+    writer = csv.DictWriter(manifest, fieldnames=fieldnames)
+    writer.writeheader()
+    writer.writerow(
+        {"filename": "invoice.pdf", "client_id": client.id_, **invoice_data.model_dump()}
+    )
+    # Invalid entry: missing gross amount
+    writer.writerow({"filename": "other.pdf", "client_id": client.id_, "invoice_number": "INV-2"})
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        zip_file.writestr("manifest.csv", manifest.getvalue())
+        zip_file.writestr("invoices/invoice.pdf", file.file)
+        zip_file.writestr("invoices/other.pdf", file.file)
+
+    response = test_client.post(
+        "/v1/invoices/bulk",
+        files={"upload_files": ("import.zip", archive.getvalue(), "application/zip")},
+    )
+    assert response.status_code == 200
+    import_response = InvoiceImportResponse.model_validate(response.json())
+    assert import_response.n_created == 1
+    assert [result.filename for result in import_response.results] == [
+        "invoice.pdf",
+        "other.pdf",
+    ]
+    assert import_response.results[1].detail
+    assert "Invalid manifest entry" in import_response.results[1].detail
+
+
+def test_import_invoices_without_manifest(test_client: TestClient, upload_files: Any):
+    response = test_client.post(
+        "/v1/invoices/bulk", files={"upload_files": upload_files["upload_file"]}
+    )
+    assert response.status_code == 422
+
+
+def test_import_invoices_from_corrupted_zip(test_client: TestClient, file: File):
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        zip_file.writestr("manifest.json", "[]")
+        zip_file.writestr("invoice.pdf", file.file)
+    # Stored uncompressed: altering the content fails the CRC check on read
+    content = archive.getvalue().replace(file.file[:16], bytes(16), 1)
+    response = test_client.post(
+        "/v1/invoices/bulk", files={"upload_files": ("import.zip", content, "application/zip")}
+    )
+    assert response.status_code == 400
+
+
+def test_import_invoices_duplicate_filenames(test_client: TestClient, file: File):
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        zip_file.writestr("manifest.json", "[]")
+        zip_file.writestr("january/invoice.pdf", file.file)
+        zip_file.writestr("february/invoice.pdf", file.file)
+    response = test_client.post(
+        "/v1/invoices/bulk",
+        files={"upload_files": ("import.zip", archive.getvalue(), "application/zip")},
+    )
+    assert response.status_code == 422
+
+    response = test_client.post(
+        "/v1/invoices/bulk",
+        files=[
+            ("upload_files", ("manifest.json", "[]", "application/json")),
+            ("upload_files", ("invoice.pdf", file.file, "application/pdf")),
+            ("upload_files", ("invoice.pdf", file.file, "application/pdf")),
+        ],
+    )
+    assert response.status_code == 422
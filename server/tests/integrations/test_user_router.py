@@ -2,13 +2,20 @@ import pytest
 from fastapi.testclient import TestClient
 
 from invoice_reader.domain.user import User
+from invoice_reader.infrastructure.password_hasher import BcryptPasswordHasher
 from invoice_reader.infrastructure.repositories.user import InMemoryUserRepository
 from invoice_reader.interfaces.api.main import app
-from invoice_reader.interfaces.dependencies.auth import get_current_user_id
+from invoice_reader.interfaces.dependencies import auth
+from invoice_reader.interfaces.dependencies.auth import (
+    USER_IDENTITY_CACHE,
+    get_current_user_id,
+    get_password_hasher,
+)
 from invoice_reader.interfaces.dependencies.repository import get_user_repository
 from invoice_reader.interfaces.schemas.auth import AuthToken
 from invoice_reader.interfaces.schemas.user import UserCreate
 from invoice_reader.services.auth import AuthService
+from invoice_reader.services.user import UserService
 
 
 @pytest.fixture
@@ -16,10 +23,22 @@ def test_client(user: User):
     client = TestClient(app)
     app.dependency_overrides[get_user_repository] = lambda: InMemoryUserRepository()
     app.dependency_overrides[get_current_user_id] = lambda: user.id_
+    app.dependency_overrides[get_password_hasher] = lambda: BcryptPasswordHasher(rounds=4)
     yield client
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def auth_client():
+    """Client authenticating with actual tokens."""
+    InMemoryUserRepository.init()
+    USER_IDENTITY_CACHE.clear()
+    app.dependency_overrides[get_user_repository] = lambda: InMemoryUserRepository()
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    USER_IDENTITY_CACHE.clear()
+
+
 def test_register_user(test_client: TestClient, user_create: UserCreate):
     response = test_client.post("/v1/users/signup/", json=user_create.model_dump())
     assert response.status_code == 201
@@ -49,3 +68,84 @@ def test_user_login_wrong_password(test_client: TestClient, existing_user: User)
         "/v1/users/signin/", data={"username": existing_user.email, "password": "wrong_password"}
     )
     assert response.status_code == 401
+
+
+def test_get_me(auth_client: TestClient, auth_token: AuthToken, existing_user: User):
+    headers = {"Authorization": f"Bearer {auth_token.access_token}"}
+    response = auth_client.get("/v1/users/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {"user_id": str(existing_user.id_), "email": existing_user.email}
+
+
+def test_user_identity_cached(auth_client: TestClient, auth_token: AuthToken, existing_user: User):
+    headers = {"Authorization": f"Bearer {auth_token.access_token}"}
+    assert auth_client.get("/v1/users/me", headers=headers).status_code == 200
+    # Removed behind the service back: still served from the cache
+    InMemoryUserRepository().delete(user_id=existing_user.id_)
+    assert auth_client.get("/v1/users/me", headers=headers).status_code == 200
+
+    InMemoryUserRepository().add(existing_user)
+    UserService.delete(
+        user_id=existing_user.id_,
+        user_repository=InMemoryUserRepository(),
+        identity_cache=USER_IDENTITY_CACHE,
+    )
+    assert auth_client.get("/v1/users/me", headers=headers).status_code == 404
+
+
+def test_disabled_user_forbidden(
+    auth_client: TestClient, auth_token: AuthToken, existing_user: User
+):
+    headers = {"Authorization": f"Bearer {auth_token.access_token}"}
+    assert auth_client.get("/v1/users/me", headers=headers).status_code == 200
+    InMemoryUserRepository().update(existing_user.model_copy(update={"is_disabled": True}))
+    USER_IDENTITY_CACHE.clear()  # Cached identity expired
+    assert auth_client.get("/v1/users/me", headers=headers).status_code == 403
+
+
+def test_deleted_user_denied_with_user_id_claim(
+    auth_client: TestClient, existing_user: User, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(auth.settings, "jwt_user_id_claim", True)
+    token = AuthService.create_token(
+        email=existing_user.email, expire=3600, token_type="access", user_id=existing_user.id_
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+    assert auth_client.get("/v1/users/me", headers=headers).status_code == 200
+    assert auth_client.delete("/v1/users", headers=headers).status_code == 204
+    # The claim alone would let the user in: the tombstone denies it
+    assert auth_client.get("/v1/users/me", headers=headers).status_code == 404
+
+
+def test_refresh_denied_to_deleted_user(auth_client: TestClient, existing_user: User):
+    token = AuthService.create_token(
+        email=existing_user.email, expire=3600, token_type="refresh", user_id=existing_user.id_
+    )
+    auth_client.cookies.set("refresh_token", token)
+    assert auth_client.post("/v1/users/refresh").status_code == 200
+    InMemoryUserRepository().delete(user_id=existing_user.id_)
+    USER_IDENTITY_CACHE.clear()
+    assert auth_client.post("/v1/users/refresh").status_code == 404
+
+
+def test_signup_clears_tombstone(
+    auth_client: TestClient, existing_user: User, user_create: UserCreate
+):
+    UserService.delete(
+        user_id=existing_user.id_,
+        user_repository=InMemoryUserRepository(),
+        identity_cache=USER_IDENTITY_CACHE,
+    )
+    assert USER_IDENTITY_CACHE.get(existing_user.email)
+    app.dependency_overrides[get_password_hasher] = lambda: BcryptPasswordHasher(rounds=4)
+    auth_client.post("/v1/users/signup/", json=user_create.model_dump())
+    assert USER_IDENTITY_CACHE.get(existing_user.email) is None
+
+
+def test_user_id_claim(existing_user: User):
+    token = AuthService.create_token(
+        email=existing_user.email, expire=3600, token_type="access", user_id=existing_user.id_
+    )
+    assert AuthService.decode_token(token).user_id == existing_user.id_
+    token = AuthService.create_token(email=existing_user.email, expire=3600, token_type="access")
+    assert AuthService.decode_token(token).user_id is None
@@ -4,7 +4,9 @@ import pytest
 from sqlmodel import Session
 
 from invoice_reader.domain.client import Client, ClientData
+from invoice_reader.domain.pagination import ClientCursor
 from invoice_reader.infrastructure.repositories.client import SQLModelClientRepository
+from invoice_reader.services.exceptions import ExistingEntityException
 
 
 @pytest.fixture
@@ -50,6 +52,24 @@ def test_get_by_name(repository: SQLModelClientRepository, client: Client):
     assert result.id_ == client.id_
 
 
+def test_exists_by_name(repository: SQLModelClientRepository, client: Client):
+    repository.add(client)
+    name = client.data.client_name
+    assert repository.exists_by_name(user_id=client.user_id, client_name=name)
+    assert not repository.exists_by_name(
+        user_id=client.user_id, client_name=name, exclude_client_id=client.id_
+    )
+    assert not repository.exists_by_name(user_id=uuid4(), client_name=name)
+
+
+def test_add_duplicate_name_raises(repository: SQLModelClientRepository, client: Client):
+    repository.add(client)
+    with pytest.raises(ExistingEntityException):
+        repository.add(client.model_copy(update={"id_": uuid4()}))
+    # The session is usable after the rollback
+    assert repository.count(user_id=client.user_id) == 1
+
+
 def test_update_client(repository: SQLModelClientRepository, client: Client):
     repository.add(client)
     client.data.street_address = "456 New Address"
@@ -64,3 +84,26 @@ def test_delete_client(repository: SQLModelClientRepository, client: Client):
     repository.delete(client.id_)
     result = repository.get(client.id_)
     assert result is None
+
+
+def test_get_page_and_count(repository: SQLModelClientRepository, client: Client):
+    clients = [
+        client.model_copy(
+            update={
+                "id_": uuid4(),
+                "data": client.data.model_copy(update={"client_name": f"Client {letter}"}),
+            }
+        )
+        for letter in "ECADB"
+    ]
+    for item in clients:
+        repository.add(item)
+
+    first_page = repository.get_page(user_id=client.user_id, limit=2)
+    assert [item.data.client_name for item in first_page] == ["Client A", "Client B"]
+    after = ClientCursor(client_name=first_page[-1].data.client_name, client_id=first_page[-1].id_)
+    keyset_page = repository.get_page(user_id=client.user_id, limit=2, after=after)
+    assert [item.data.client_name for item in keyset_page] == ["Client C", "Client D"]
+    offset_page = repository.get_page(user_id=client.user_id, limit=2, offset=4)
+    assert [item.data.client_name for item in offset_page] == ["Client E"]
+    assert repository.count(user_id=client.user_id) == 5
@@ -0,0 +1,49 @@
+from datetime import date
+
+import pytest
+from sqlmodel import Session
+
+from invoice_reader.domain.exchange_rate import ExchangeRates
+from invoice_reader.domain.invoice import Currency
+from invoice_reader.infrastructure.repositories.exchange_rate import (
+    SQLModelExchangeRateRepository,
+)
+
+
+@pytest.fixture
+def repository(session: Session) -> SQLModelExchangeRateRepository:
+    return SQLModelExchangeRateRepository(session)
+
+
+def exchange_rates(rate_date: date) -> ExchangeRates:
+    return ExchangeRates(
+        base_currency=Currency.EUR,
+        rate_date=rate_date,
+        rates={Currency.EUR: 1.0, Currency.USD: 1.1, Currency.GBP: 0.9, Currency.CZK: 24.0},
+    )
+
+
+def test_add_and_get(repository: SQLModelExchangeRateRepository):
+    rates = exchange_rates(date(2025, 9, 10))
+    repository.add(rates)
+    assert repository.get(rate_date=date(2025, 9, 10)) == rates
+    assert repository.get(rate_date=date(2025, 9, 10), base_currency=Currency.USD) is None
+    assert repository.get(rate_date=date(2025, 9, 11)) is None
+
+
+def test_get_latest(repository: SQLModelExchangeRateRepository):
+    assert repository.get_latest() is None
+    repository.add(exchange_rates(date(2025, 9, 10)))
+    repository.add(exchange_rates(date(2025, 9, 12)))
+    repository.add(exchange_rates(date(2025, 9, 11)))
+    latest = repository.get_latest()
+    assert latest and latest.rate_date == date(2025, 9, 12)
+
+
+def test_refresh_lock_single_holder(repository: SQLModelExchangeRateRepository):
+    with repository.refresh_lock() as acquired:
+        assert acquired
+        with repository.refresh_lock() as acquired_again:
+            assert not acquired_again
+    with repository.refresh_lock() as acquired:
+        assert acquired
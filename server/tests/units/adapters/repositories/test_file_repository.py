@@ -1,25 +1,26 @@
 import io
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
 
 from invoice_reader.domain.invoice import File
+from invoice_reader.infrastructure.cache import TTLCache
 from invoice_reader.infrastructure.repositories.file import S3FileRepository
 
 
-@pytest.fixture(scope="session")
-def s3_client_mock():
-    with patch("boto3.client") as mock_client:
-        client_instance = MagicMock()
-        mock_client.return_value = client_instance
-        yield client_instance
+@pytest.fixture
+def s3_client_mock() -> MagicMock:
+    return MagicMock()
 
 
 @pytest.fixture
 def repository(s3_client_mock: MagicMock) -> S3FileRepository:
-    repo = S3FileRepository(bucket="test-bucket", region="us-east-1", presigned_url_expiration=3600)
-    repo.client = s3_client_mock
-    return repo
+    return S3FileRepository(
+        client=s3_client_mock,
+        bucket="test-bucket",
+        region="us-east-1",
+        presigned_url_expiration=3600,
+    )
 
 
 @pytest.fixture
@@ -58,3 +59,20 @@ def test_get_url(repository: S3FileRepository, s3_client_mock: MagicMock):
     url = repository.get_url("s3://test-bucket/test.pdf")
     assert s3_client_mock.generate_presigned_url.called
     assert url == "https://presigned-url"
+
+
+def test_get_url_cached(s3_client_mock: MagicMock):
+    s3_client_mock.generate_presigned_url.side_effect = ["https://url-1", "https://url-2"]
+    repository = S3FileRepository(
+        client=s3_client_mock,
+        bucket="test-bucket",
+        region="us-east-1",
+        presigned_url_expiration=3600,
+        url_cache=TTLCache(ttl=3300, maxsize=10),
+    )
+    assert repository.get_url("s3://test-bucket/test.pdf") == "https://url-1"
+    assert repository.get_url("s3://test-bucket/test.pdf") == "https://url-1"
+    assert s3_client_mock.generate_presigned_url.call_count == 1
+
+    repository.delete("s3://test-bucket/test.pdf")
+    assert repository.get_url("s3://test-bucket/test.pdf") == "https://url-2"
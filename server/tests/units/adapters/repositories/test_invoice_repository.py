@@ -4,8 +4,11 @@ from uuid import uuid4
 import pytest
 from sqlmodel import Session
 
+from invoice_reader.domain.exchange_rate import ExchangeRates
 from invoice_reader.domain.invoice import Currency, Invoice, InvoiceData
+from invoice_reader.domain.pagination import InvoiceCursor
 from invoice_reader.infrastructure.repositories.invoice import SQLModelInvoiceRepository
+from invoice_reader.services.exceptions import ExistingEntityException
 
 
 @pytest.fixture
@@ -54,6 +57,33 @@ def test_get_by_invoice_number(repository: SQLModelInvoiceRepository, invoice: I
     assert result.id_ == invoice.id_
 
 
+def test_exists_by_invoice_number(repository: SQLModelInvoiceRepository, invoice: Invoice):
+    repository.add(invoice)
+    number = invoice.data.invoice_number
+    assert repository.exists_by_invoice_number(user_id=invoice.user_id, invoice_number=number)
+    assert not repository.exists_by_invoice_number(
+        user_id=invoice.user_id, invoice_number=number, exclude_invoice_id=invoice.id_
+    )
+    assert not repository.exists_by_invoice_number(user_id=uuid4(), invoice_number=number)
+
+
+def test_update_to_duplicate_number_raises(repository: SQLModelInvoiceRepository, invoice: Invoice):
+    other = invoice.model_copy(
+        update={
+            "id_": uuid4(),
+            "data": invoice.data.model_copy(update={"invoice_number": "INV-002"}),
+        }
+    )
+    repository.add(invoice)
+    repository.add(other)
+    other.data.invoice_number = invoice.data.invoice_number
+    with pytest.raises(ExistingEntityException):
+        repository.update(other)
+    stored = repository.get(other.id_)
+    assert stored
+    assert stored.data.invoice_number == "INV-002"
+
+
 def test_update_invoice(repository: SQLModelInvoiceRepository, invoice: Invoice):
     repository.add(invoice)
     invoice.data.description = "Updated description"
@@ -70,3 +100,140 @@ def test_delete_invoice(repository: SQLModelInvoiceRepository, invoice: Invoice)
     repository.delete(invoice.id_)
     result = repository.get(invoice.id_)
     assert result is None
+
+
+def test_get_page_and_count(repository: SQLModelInvoiceRepository, invoice: Invoice):
+    invoices = [
+        invoice.model_copy(
+            update={
+                "id_": uuid4(),
+                "data": invoice.data.model_copy(
+                    update={"issued_date": date(2025, 1, day), "invoice_number": f"INV-{day}"}
+                ),
+            }
+        )
+        for day in range(1, 6)
+    ]
+    for item in invoices:
+        repository.add(item)
+    expected_ids = [item.id_ for item in reversed(invoices)]  # Most recent first
+
+    first_page = repository.get_page(user_id=invoice.user_id, limit=2)
+    assert [item.id_ for item in first_page] == expected_ids[:2]
+    second_page = repository.get_page(user_id=invoice.user_id, limit=2, offset=2)
+    assert [item.id_ for item in second_page] == expected_ids[2:4]
+    after = InvoiceCursor(
+        issued_date=first_page[-1].data.issued_date, invoice_id=first_page[-1].id_
+    )
+    keyset_page = repository.get_page(user_id=invoice.user_id, limit=2, after=after)
+    assert [item.id_ for item in keyset_page] == expected_ids[2:4]
+    assert repository.count(user_id=invoice.user_id) == 5
+    assert repository.count(user_id=uuid4()) == 0
+
+
+def test_get_monthly_revenues(repository: SQLModelInvoiceRepository, invoice: Invoice):
+    pending = invoice.model_copy(
+        update={
+            "id_": uuid4(),
+            "data": invoice.data.model_copy(
+                update={"invoice_number": "INV-002", "paid_date": None}
+            ),
+        }
+    )
+    paid_in_eur = invoice.model_copy(
+        update={
+            "id_": uuid4(),
+            "data": invoice.data.model_copy(
+                update={"invoice_number": "INV-003", "currency": Currency.EUR}
+            ),
+        }
+    )
+    for item in (invoice, pending, paid_in_eur):
+        repository.add(item)
+
+    revenues = repository.get_monthly_revenues(year=2025, user_id=invoice.user_id)
+    by_currency = {revenue.currency: revenue for revenue in revenues}
+    assert len(revenues) == 2
+    assert by_currency[Currency.USD].month == 9
+    assert by_currency[Currency.USD].client_id == invoice.client_id
+    assert by_currency[Currency.USD].total_paid == 120.0
+    assert by_currency[Currency.USD].total_pending == 120.0
+    assert by_currency[Currency.EUR].total_paid == 120.0
+    assert by_currency[Currency.EUR].total_pending == 0.0
+    assert repository.get_monthly_revenues(year=2024, user_id=invoice.user_id) == []
+
+
+def test_get_by_year_uses_paid_date(repository: SQLModelInvoiceRepository, invoice: Invoice):
+    invoice.data.issued_date = date(2024, 12, 20)
+    invoice.data.paid_date = None
+    repository.add(invoice)
+    assert [item.id_ for item in repository.get_by_year(2024, invoice.user_id)] == [invoice.id_]
+
+    # Paid the following year: the revenue date is updated along with the invoice
+    invoice.data.paid_date = date(2025, 1, 5)
+    repository.update(invoice)
+    assert repository.get_by_year(2024, invoice.user_id) == []
+    assert [item.id_ for item in repository.get_by_year(2025, invoice.user_id)] == [invoice.id_]
+    revenues = repository.get_monthly_revenues(year=2025, user_id=invoice.user_id)
+    assert [(revenue.month, revenue.total_paid) for revenue in revenues] == [(1, 120.0)]
+
+
+def test_get_by_ids(repository: SQLModelInvoiceRepository, invoice: Invoice):
+    other_user_invoice = invoice.model_copy(update={"id_": uuid4(), "user_id": uuid4()})
+    repository.add(invoice)
+    repository.add(other_user_invoice)
+    invoices = repository.get_by_ids(
+        invoice_ids=[invoice.id_, other_user_invoice.id_, uuid4()], user_id=invoice.user_id
+    )
+    assert [result.id_ for result in invoices] == [invoice.id_]
+
+
+def test_base_amounts_are_aggregated_and_backfilled(
+    repository: SQLModelInvoiceRepository, invoice: Invoice
+):
+    exchange_rates = ExchangeRates(
+        base_currency=Currency.EUR,
+        rate_date=date(2025, 9, 1),
+        rates={Currency.EUR: 1.0, Currency.USD: 1.2},
+    )
+    converted = invoice.model_copy(
+        update={"base_amount": 100.0, "base_rate_date": exchange_rates.rate_date}
+    )
+    # Stored while no exchange rates were available
+    unconverted = invoice.model_copy(
+        update={
+            "id_": uuid4(),
+            "data": invoice.data.model_copy(update={"invoice_number": "INV-002"}),
+        }
+    )
+    without_rate = invoice.model_copy(
+        update={
+            "id_": uuid4(),
+            "data": invoice.data.model_copy(
+                update={"invoice_number": "INV-003", "currency": Currency.CZK}
+            ),
+        }
+    )
+    for item in (converted, unconverted, without_rate):
+        repository.add(item)
+
+    client_revenues = repository.get_client_revenues(user_id=invoice.user_id)
+    assert {
+        revenue.currency: (revenue.n_invoices, revenue.total) for revenue in client_revenues
+    } == {
+        Currency.EUR: (1, 100.0),
+        Currency.USD: (1, 120.0),
+        Currency.CZK: (1, 120.0),
+    }
+    assert repository.get_client_revenues(user_id=invoice.user_id, client_id=uuid4()) == []
+
+    assert repository.fill_base_amounts(exchange_rates=exchange_rates) == 1
+    backfilled = repository.get(unconverted.id_)
+    assert backfilled
+    assert backfilled.base_amount == pytest.approx(100.0)
+    assert backfilled.base_rate_date == exchange_rates.rate_date
+    assert repository.fill_base_amounts(exchange_rates=exchange_rates) == 0
+
+    revenues = repository.get_monthly_revenues(year=2025, user_id=invoice.user_id)
+    by_currency = {revenue.currency: revenue.total_paid for revenue in revenues}
+    assert by_currency == {Currency.EUR: pytest.approx(200.0), Currency.CZK: 120.0}
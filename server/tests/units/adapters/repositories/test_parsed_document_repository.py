@@ -0,0 +1,80 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlmodel import Session
+
+from invoice_reader.domain.client import ClientData
+from invoice_reader.domain.invoice import Currency, InvoiceData
+from invoice_reader.domain.parsed_document import ParsedDocument
+from invoice_reader.infrastructure.repositories.parsed_document import (
+    SQLModelParsedDocumentRepository,
+)
+
+
+@pytest.fixture
+def repository(session: Session) -> SQLModelParsedDocumentRepository:
+    return SQLModelParsedDocumentRepository(session)
+
+
+@pytest.fixture
+def parsed_document() -> ParsedDocument:
+    return ParsedDocument(
+        content_hash="a" * 64,
+        parser_version="1",
+        invoice_data=InvoiceData(
+            invoice_number="INV-001",
+            vat=20,
+            description="Test invoice",
+            issued_date=date(2025, 9, 10),
+            gross_amount=120.0,
+            currency=Currency.USD,
+        ),
+        client_data=ClientData(
+            client_name="Test Client",
+            street_number="1",
+            street_address="Test St",
+            zipcode="12345",
+            city="Paris",
+            country="France",
+        ),
+    )
+
+
+def get(
+    repository: SQLModelParsedDocumentRepository,
+    content_hash: str,
+    parser_version: str = "1",
+    max_age: int = 60,
+) -> ParsedDocument | None:
+    return repository.get(
+        content_hash=content_hash,
+        parser_version=parser_version,
+        created_after=datetime.now() - timedelta(seconds=max_age),
+    )
+
+
+def test_add_and_get(repository: SQLModelParsedDocumentRepository, parsed_document: ParsedDocument):
+    repository.add(parsed_document)
+    assert get(repository, parsed_document.content_hash) == parsed_document
+    assert get(repository, "b" * 64) is None
+
+
+def test_add_existing_is_ignored(
+    repository: SQLModelParsedDocumentRepository, parsed_document: ParsedDocument
+):
+    repository.add(parsed_document)
+    repository.add(parsed_document)
+    assert get(repository, parsed_document.content_hash) == parsed_document
+
+
+def test_expired_or_other_version_not_served(
+    repository: SQLModelParsedDocumentRepository, parsed_document: ParsedDocument
+):
+    repository.add(parsed_document)
+    assert get(repository, parsed_document.content_hash, max_age=-1) is None
+    assert get(repository, parsed_document.content_hash, parser_version="2") is None
+
+    # The next parse replaces the outdated result
+    updated = parsed_document.model_copy(update={"parser_version": "2"})
+    repository.add(updated)
+    assert get(repository, parsed_document.content_hash, parser_version="2") == updated
@@ -1,23 +1,56 @@
 import io
 from datetime import date
 from typing import BinaryIO
-from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
 
-from invoice_reader.domain.invoice import Currency
-from invoice_reader.infrastructure.parser import MLServerParser
+from invoice_reader.domain.client import ClientData
+from invoice_reader.domain.invoice import Currency, InvoiceData
+from invoice_reader.domain.parsed_document import ParsedDocument
+from invoice_reader.infrastructure.cache import TTLCache
+from invoice_reader.infrastructure.parser import (
+    PARSE_CACHE_HITS,
+    CachedParser,
+    MLServerParser,
+    TestParser,
+)
+from invoice_reader.infrastructure.repositories.parsed_document import (
+    InMemoryParsedDocumentRepository,
+)
 from invoice_reader.infrastructure.schemas.parser import (
     ParsedClientData,
     ParsedData,
     ParsedInvoiceData,
 )
 from invoice_reader.services.exceptions import InfrastructureException
-
-
-@pytest.fixture
-def parser():
-    return MLServerParser(parser_endpoint_url="http://mocked-endpoint/api/v1/parse")
+from invoice_reader.services.interfaces.parser import IParser
+
+
+def mock_parser(
+    *responses: httpx.Response | type[httpx.TransportError], retry_max_elapsed: float = 10
+) -> tuple[MLServerParser, list[httpx.Request]]:
+    """Parser whose ML server answers with `responses` in order, or fails with the transport
+    errors among them. Returns the sent requests."""
+    requests: list[httpx.Request] = []
+    remaining = list(responses)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        request.read()
+        requests.append(request)
+        response = remaining.pop(0)
+        if not isinstance(response, httpx.Response):
+            raise response("error", request=request)
+        return response
+
+    parser = MLServerParser(
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+        parser_endpoint_url="http://mocked-endpoint/api/v1/parse",
+        max_retries=2,
+        retry_backoff=0,
+        retry_max_elapsed=retry_max_elapsed,
+    )
+    return parser, requests
 
 
 @pytest.fixture
@@ -79,49 +112,131 @@ def file() -> BinaryIO:
     return io.BytesIO(b"dummy data")
 
 
-def test_parse_success(parser: MLServerParser, file: BinaryIO, mock_parsed_data: ParsedData):
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = mock_parsed_data.model_dump()
-    with patch("httpx.post", return_value=mock_response):
-        invoice_data, client_data = parser.parse(file)
-        assert invoice_data.gross_amount == mock_parsed_data.invoice.gross_amount
-        assert invoice_data.vat == mock_parsed_data.invoice.vat
-        assert invoice_data.issued_date == mock_parsed_data.invoice.issued_date
-        assert client_data.client_name == mock_parsed_data.client.client_name
-        assert client_data.street_address == mock_parsed_data.client.street_address
-        assert client_data.zipcode == mock_parsed_data.client.zipcode
-
-
-def test_parse_http_error(parser: MLServerParser, file: BinaryIO):
-    mock_response = MagicMock()
-    mock_response.status_code = 500
-    with patch("httpx.post", return_value=mock_response), pytest.raises(InfrastructureException):
+def test_parse_success(file: BinaryIO, mock_parsed_data: ParsedData):
+    parser, _ = mock_parser(httpx.Response(200, json=mock_parsed_data.model_dump(mode="json")))
+    invoice_data, client_data = parser.parse(file)
+    assert invoice_data.gross_amount == mock_parsed_data.invoice.gross_amount
+    assert invoice_data.vat == mock_parsed_data.invoice.vat
+    assert invoice_data.issued_date == mock_parsed_data.invoice.issued_date
+    assert client_data.client_name == mock_parsed_data.client.client_name
+    assert client_data.street_address == mock_parsed_data.client.street_address
+    assert client_data.zipcode == mock_parsed_data.client.zipcode
+
+
+def test_parse_http_error(file: BinaryIO):
+    parser, requests = mock_parser(*[httpx.Response(503)] * 3)
+    with pytest.raises(InfrastructureException):
+        parser.parse(file)
+    assert len(requests) == 3
+
+
+@pytest.mark.parametrize("status_code", [400, 500])
+def test_parse_error_not_retried(file: BinaryIO, status_code: int):
+    parser, requests = mock_parser(httpx.Response(status_code))
+    with pytest.raises(InfrastructureException):
+        parser.parse(file)
+    assert len(requests) == 1
+
+
+def test_parse_connect_error_retried(file: BinaryIO, mock_parsed_data: ParsedData):
+    parser, requests = mock_parser(
+        httpx.ConnectError, httpx.Response(200, json=mock_parsed_data.model_dump(mode="json"))
+    )
+    parser.parse(file)
+    assert len(requests) == 2
+
+
+def test_parse_read_timeout_not_retried(file: BinaryIO):
+    parser, requests = mock_parser(httpx.ReadTimeout)
+    with pytest.raises(InfrastructureException) as exc:
+        parser.parse(file)
+    assert exc.value.status_code == 503
+    assert len(requests) == 1
+
+
+def test_parse_retries_capped_in_time(file: BinaryIO):
+    parser, requests = mock_parser(httpx.Response(503), retry_max_elapsed=0)
+    with pytest.raises(InfrastructureException):
         parser.parse(file)
+    assert len(requests) == 1
 
 
-def test_parse_validation_error(parser: MLServerParser, file: BinaryIO):
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {"invoice_number": "12345"}
-    with (
-        patch("httpx.post", return_value=mock_response),
-        pytest.raises(InfrastructureException) as exc,
-    ):
+def test_parse_retries_then_success(file: BinaryIO, mock_parsed_data: ParsedData):
+    parser, requests = mock_parser(
+        httpx.Response(503),
+        httpx.Response(200, json=mock_parsed_data.model_dump(mode="json")),
+    )
+    invoice_data, _ = parser.parse(file)
+    assert invoice_data.invoice_number == mock_parsed_data.invoice.invoice_number
+    assert len(requests) == 2
+    # The file is rewound and fully sent on each attempt
+    assert all(b"dummy data" in request.content for request in requests)
+
+
+def test_parse_validation_error(file: BinaryIO):
+    parser, _ = mock_parser(httpx.Response(200, json={"invoice_number": "12345"}))
+    with pytest.raises(InfrastructureException) as exc:
         parser.parse(file)
-        assert exc.value.status_code == 422
+    assert exc.value.status_code == 422
 
 
 def test_parse_success_with_uncomplete_data(
-    parser: MLServerParser, file: BinaryIO, mock_uncomplete_parsed_data: ParsedData
+    file: BinaryIO, mock_uncomplete_parsed_data: ParsedData
 ):
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = mock_uncomplete_parsed_data.model_dump()
-    with patch("httpx.post", return_value=mock_response):
-        invoice_data, client_data = parser.parse(file)
-        assert invoice_data.gross_amount == 0
-        assert invoice_data.vat == 0
-        assert invoice_data.issued_date == mock_uncomplete_parsed_data.invoice.issued_date
-        assert client_data.client_name == ""
-        assert client_data.street_address == ""
+    parser, _ = mock_parser(
+        httpx.Response(200, json=mock_uncomplete_parsed_data.model_dump(mode="json"))
+    )
+    invoice_data, client_data = parser.parse(file)
+    assert invoice_data.gross_amount == 0
+    assert invoice_data.vat == 0
+    assert invoice_data.issued_date == mock_uncomplete_parsed_data.invoice.issued_date
+    assert client_data.client_name == ""
+    assert client_data.street_address == ""
+
+
+class CountingParser(IParser):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def parse(self, file: BinaryIO) -> tuple[InvoiceData, ClientData]:
+        self.calls += 1
+        return TestParser().parse(file=file)
+
+
+def test_cached_parser_parses_same_content_once(file: BinaryIO):
+    counting_parser = CountingParser()
+    repository = InMemoryParsedDocumentRepository()
+    parser = CachedParser(
+        parser=counting_parser, cache=TTLCache(ttl=60, maxsize=10), repository=repository
+    )
+    memory_hits = PARSE_CACHE_HITS.labels(tier="memory")._value.get()  # type: ignore
+    first = parser.parse(file)
+    assert parser.parse(io.BytesIO(b"dummy data")) == first
+    assert counting_parser.calls == 1
+    assert PARSE_CACHE_HITS.labels(tier="memory")._value.get() - memory_hits == 1  # type: ignore
+
+    # A new worker, with an empty in-memory tier, is served by the persistent tier
+    parser = CachedParser(
+        parser=counting_parser, cache=TTLCache(ttl=60, maxsize=10), repository=repository
+    )
+    assert parser.parse(io.BytesIO(b"dummy data")) == first
+    assert counting_parser.calls == 1
+
+    parser.parse(io.BytesIO(b"other data"))
+    assert counting_parser.calls == 2
+
+
+def test_cached_parser_ignores_other_parser_versions(file: BinaryIO):
+    counting_parser = CountingParser()
+    repository = InMemoryParsedDocumentRepository()
+    cache = TTLCache[str, ParsedDocument](ttl=60, maxsize=10)
+    CachedParser(
+        parser=counting_parser, cache=cache, repository=repository, parser_version="1"
+    ).parse(file)
+    parser = CachedParser(
+        parser=counting_parser, cache=cache, repository=repository, parser_version="2"
+    )
+    parser.parse(io.BytesIO(b"dummy data"))
+    assert counting_parser.calls == 2
+    parser.parse(io.BytesIO(b"dummy data"))
+    assert counting_parser.calls == 2
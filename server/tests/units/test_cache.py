@@ -0,0 +1,22 @@
+import time
+
+from invoice_reader.infrastructure.cache import TTLCache
+
+
+def test_entries_expire():
+    cache = TTLCache[str, str](ttl=0.05, maxsize=10)
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+    time.sleep(0.06)
+    assert cache.get("key") is None
+
+
+def test_least_recently_used_evicted():
+    cache = TTLCache[str, int](ttl=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
@@ -0,0 +1,90 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import Histogram
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from invoice_reader.infrastructure.database import (
+    POOL_CHECKOUT_WAIT,
+    POOL_CHECKOUTS,
+    POOL_CONNECTIONS,
+    create_db_engine,
+)
+from invoice_reader.interfaces.api import main
+from invoice_reader.interfaces.api.main import app
+
+
+def test_engine_reuses_pooled_connections(tmp_path: Path):
+    engine = create_db_engine(
+        database_url=f"sqlite:///{tmp_path / 'db.sqlite'}",
+        pool_size=2,
+        max_overflow=0,
+        pool_recycle=3600,
+        pool_timeout=1,
+    )
+    checkouts = POOL_CHECKOUTS._value.get()  # type: ignore
+    connections = POOL_CONNECTIONS._value.get()  # type: ignore
+    waits = _count(POOL_CHECKOUT_WAIT)
+    with Session(engine):
+        pass  # Lazy: no query, no checkout
+    assert POOL_CHECKOUTS._value.get() == checkouts  # type: ignore
+    for _ in range(5):
+        with Session(engine) as session:
+            session.exec(text("SELECT 1"))  # type: ignore
+    assert POOL_CHECKOUTS._value.get() - checkouts == 5  # type: ignore
+    assert _count(POOL_CHECKOUT_WAIT) - waits == 5
+    assert POOL_CONNECTIONS._value.get() - connections == 1  # type: ignore
+    engine.dispose()
+
+
+def test_lifespan_creates_single_engine():
+    with TestClient(app):
+        engine = app.state.engine
+        assert isinstance(engine, Engine)
+        assert engine.pool.size() == 10  # type: ignore
+
+
+def test_lifespan_creates_shared_http_clients():
+    with TestClient(app):
+        assert isinstance(app.state.ml_server_client, httpx.Client)
+        assert isinstance(app.state.http_client, httpx.AsyncClient)
+    assert app.state.ml_server_client.is_closed
+    assert app.state.http_client.is_closed
+
+
+def test_lifespan_waits_for_parse_workers(monkeypatch: pytest.MonkeyPatch):
+    clients_open_on_cancel: list[bool] = []
+
+    async def run_parse_worker(**kwargs: Any) -> None:
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            await asyncio.sleep(0.01)  # Job unwinding
+            clients_open_on_cancel.append(not kwargs["http_client"].is_closed)
+            raise
+
+    monkeypatch.setattr(main, "run_parse_worker", run_parse_worker)
+    with TestClient(app):
+        pass
+    assert clients_open_on_cancel and all(clients_open_on_cancel)
+
+
+def test_lifespan_creates_single_s3_client():
+    with TestClient(app):
+        client = app.state.s3_client
+        assert client.meta.config.max_pool_connections == 50
+
+
+def _count(histogram: Histogram) -> float:
+    return next(
+        sample.value
+        for metric in histogram.collect()
+        for sample in metric.samples
+        if sample.name.endswith("_count")
+    )
@@ -0,0 +1,56 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from invoice_reader.domain.exchange_rate import ExchangeRates
+from invoice_reader.domain.invoice import Currency
+from invoice_reader.infrastructure.exchange_rates import TestExchangeRatesService
+from invoice_reader.infrastructure.repositories.exchange_rate import (
+    InMemoryExchangeRateRepository,
+)
+from invoice_reader.services.exchange_rates import get_exchange_rate, refresh_exchange_rates
+
+
+class SlowExchangeRatesService(TestExchangeRatesService):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def get_exchange_rates(self, base_currency: Currency) -> ExchangeRates:
+        self.calls += 1
+        time.sleep(0.1)
+        return super().get_exchange_rates(base_currency=base_currency)
+
+
+def test_refresh_is_single_flight():
+    InMemoryExchangeRateRepository.init()
+    service = SlowExchangeRatesService()
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        results = list(
+            executor.map(
+                lambda _: refresh_exchange_rates(
+                    exchange_rate_repository=InMemoryExchangeRateRepository(),
+                    exchange_rate_service=service,
+                ),
+                range(10),
+            )
+        )
+    assert service.calls == 1
+    assert sum(result is not None for result in results) >= 1
+    assert InMemoryExchangeRateRepository().get(rate_date=date.today())
+
+
+def test_get_exchange_rate_serves_latest_without_fetching():
+    InMemoryExchangeRateRepository.init()
+    yesterday_rates = ExchangeRates(
+        base_currency=Currency.EUR,
+        rate_date=date.today() - timedelta(days=1),
+        rates={Currency.EUR: 1.0, Currency.USD: 1.2},
+    )
+    InMemoryExchangeRateRepository().add(yesterday_rates)
+    service = SlowExchangeRatesService()
+    rates = get_exchange_rate(
+        exchange_rate_repository=InMemoryExchangeRateRepository(),
+        exchange_rate_service=service,
+    )
+    assert rates == yesterday_rates
+    assert service.calls == 0
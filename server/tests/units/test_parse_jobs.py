@@ -0,0 +1,148 @@
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+from typing import BinaryIO
+from uuid import uuid4
+
+import anyio
+import pytest
+from sqlalchemy.engine import Engine
+from sqlmodel import SQLModel
+
+from invoice_reader.domain.client import ClientData
+from invoice_reader.domain.invoice import InvoiceData
+from invoice_reader.domain.parse_job import ParseJob, ParseJobStatus, utcnow
+from invoice_reader.infrastructure.parse_job_queue import (
+    InMemoryParseJobQueue,
+    SQLiteParseJobQueue,
+    SQLModelParseJobQueue,
+)
+from invoice_reader.infrastructure.parser import TestParser, ThreadedParser
+from invoice_reader.infrastructure.repositories.client import InMemoryClientRepository
+from invoice_reader.services.exceptions import InfrastructureException, TooManyRequestsException
+from invoice_reader.services.interfaces.parse_job_queue import IParseJobQueue
+from invoice_reader.services.interfaces.parser import IAsyncParser
+from invoice_reader.services.parse_job import ParseJobService
+
+
+@pytest.fixture(params=["memory", "sqlite", "database"])
+def queue(request: pytest.FixtureRequest, tmp_path: Path, engine: Engine):
+    match request.param:
+        case "memory":
+            queue = InMemoryParseJobQueue()
+        case "sqlite":
+            queue = SQLiteParseJobQueue(path=str(tmp_path / "parse_jobs.sqlite"))
+        case _:
+            SQLModel.metadata.create_all(engine)
+            queue = SQLModelParseJobQueue(engine=engine)
+    yield queue
+    queue.close()
+
+
+class FailingParser(IAsyncParser):
+    def __init__(self, error: Exception) -> None:
+        self.error = error
+
+    async def parse(self, file: BinaryIO) -> tuple[InvoiceData, ClientData]:
+        raise self.error
+
+
+def run_next(queue: IParseJobQueue, parser: IAsyncParser, **kwargs) -> ParseJob | None:
+    return anyio.run(
+        partial(
+            ParseJobService.run_next,
+            queue=queue,
+            parser=parser,
+            client_repository=InMemoryClientRepository(),
+            **{"lease": 60, "max_attempts": 2, "retry_delay": 0, **kwargs},
+        )
+    )
+
+
+def test_claim_oldest_job_once(queue: IParseJobQueue):
+    first, second = ParseJob(user_id=uuid4()), ParseJob(user_id=uuid4())
+    queue.submit(first, file=b"first")
+    queue.submit(second, file=b"second")
+
+    claimed = queue.claim(lease=60)
+    assert claimed
+    job, file = claimed
+    assert (job.id_, file) == (first.id_, b"first")
+    assert job.status == ParseJobStatus.RUNNING
+    assert job.attempts == 1
+    claimed = queue.claim(lease=60)
+    assert claimed and claimed[0].id_ == second.id_
+    assert queue.claim(lease=60) is None
+
+
+def test_abandoned_job_claimed_again(queue: IParseJobQueue):
+    queue.submit(ParseJob(user_id=uuid4()), file=b"file")
+    assert queue.claim(lease=60)
+    claimed = queue.claim(lease=0)
+    assert claimed
+    assert claimed[0].attempts == 2
+
+
+def test_purge(queue: IParseJobQueue):
+    two_hours_ago = utcnow() - timedelta(hours=2)
+    done = ParseJob(user_id=uuid4(), created_at=two_hours_ago)
+    queue.submit(done, file=b"file")
+    queue.save(
+        done.model_copy(update={"status": ParseJobStatus.SUCCEEDED, "updated_at": two_hours_ago})
+    )
+    recently_done = ParseJob(user_id=uuid4(), created_at=two_hours_ago)
+    queue.submit(recently_done, file=b"file")
+    queue.save(recently_done.model_copy(update={"status": ParseJobStatus.FAILED}))
+    pending = ParseJob(user_id=uuid4(), created_at=two_hours_ago)
+    queue.submit(pending, file=b"file")
+
+    assert queue.purge(done_before=utcnow() - timedelta(hours=1)) == 1
+    assert queue.get(done.id_) is None
+    assert queue.get(recently_done.id_)
+    assert queue.get(pending.id_)  # Still waiting for a worker, whatever its age
+
+
+def test_submit_rejected_when_queue_full(queue: IParseJobQueue):
+    ParseJobService.submit(file=b"file", user_id=uuid4(), queue=queue, max_pending=1)
+    with pytest.raises(TooManyRequestsException):
+        ParseJobService.submit(file=b"file", user_id=uuid4(), queue=queue, max_pending=1)
+
+
+def test_run_job(queue: IParseJobQueue):
+    job = ParseJobService.submit(file=b"file", user_id=uuid4(), queue=queue, max_pending=10)
+    run_next(queue, parser=ThreadedParser(TestParser()))
+
+    stored = queue.get(job.id_)
+    assert stored
+    assert stored.status == ParseJobStatus.SUCCEEDED
+    assert stored.invoice_data and stored.invoice_data.invoice_number == "INV-1000"
+    assert queue.claim(lease=0) is None  # The document is not kept once done
+
+
+def test_failed_attempts_retried(queue: IParseJobQueue):
+    job = ParseJobService.submit(file=b"file", user_id=uuid4(), queue=queue, max_pending=10)
+    parser = FailingParser(InfrastructureException("ML server unreachable.", status_code=503))
+
+    retried = run_next(queue, parser=parser)
+    assert retried and retried.status == ParseJobStatus.PENDING
+    assert retried.error == "ML server unreachable."
+    failed = run_next(queue, parser=parser)
+    assert failed and failed.status == ParseJobStatus.FAILED
+    assert failed.attempts == 2
+    stored = queue.get(job.id_)
+    assert stored and stored.status == ParseJobStatus.FAILED
+
+
+def test_retry_delayed(queue: IParseJobQueue):
+    ParseJobService.submit(file=b"file", user_id=uuid4(), queue=queue, max_pending=10)
+    parser = FailingParser(InfrastructureException("ML server unreachable.", status_code=503))
+    run_next(queue, parser=parser, retry_delay=60)
+    assert queue.claim(lease=60) is None
+
+
+def test_document_errors_not_retried(queue: IParseJobQueue):
+    ParseJobService.submit(file=b"file", user_id=uuid4(), queue=queue, max_pending=10)
+    parser = FailingParser(InfrastructureException("Invalid document.", status_code=422))
+    failed = run_next(queue, parser=parser)
+    assert failed and failed.status == ParseJobStatus.FAILED
+    assert failed.attempts == 1
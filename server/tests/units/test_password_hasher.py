@@ -0,0 +1,32 @@
+import pytest
+
+from invoice_reader.infrastructure.password_hasher import (
+    PASSWORD_HASHING_REJECTED,
+    ProcessPoolPasswordHasher,
+)
+from invoice_reader.services.exceptions import TooManyRequestsException
+
+
+@pytest.fixture
+def password_hasher():
+    password_hasher = ProcessPoolPasswordHasher(max_workers=1, max_pending=0, rounds=4)
+    yield password_hasher
+    password_hasher.shutdown()
+
+
+def test_hash_and_verify(password_hasher: ProcessPoolPasswordHasher):
+    hashed_password = password_hasher.hash("securepassword")
+    assert hashed_password.startswith("$2b$04$")  # bcrypt with cost factor 4
+    assert password_hasher.verify("securepassword", hashed_password)
+    assert not password_hasher.verify("wrong_password", hashed_password)
+
+
+def test_saturated_pool_rejects(password_hasher: ProcessPoolPasswordHasher):
+    rejected = PASSWORD_HASHING_REJECTED._value.get()  # type: ignore
+    password_hasher.slots.acquire()  # Simulate an operation in flight
+    with pytest.raises(TooManyRequestsException) as exc:
+        password_hasher.hash("securepassword")
+    assert exc.value.status_code == 429
+    assert PASSWORD_HASHING_REJECTED._value.get() - rejected == 1  # type: ignore
+    password_hasher.slots.release()
+    assert password_hasher.hash("securepassword")
@@ -1,7 +1,15 @@
+from functools import partial
+
+import anyio
 import pytest
 
-from invoice_reader.domain.invoice import File, Invoice
-from invoice_reader.infrastructure.repositories.file import InMemoryFileRepository
+from invoice_reader.domain.invoice import File, ImportStatus, Invoice, InvoiceImport
+from invoice_reader.infrastructure.exchange_rates import TestExchangeRatesService
+from invoice_reader.infrastructure.repositories.exchange_rate import InMemoryExchangeRateRepository
+from invoice_reader.infrastructure.repositories.file import (
+    InMemoryFileRepository,
+    ThreadedFileRepository,
+)
 from invoice_reader.infrastructure.repositories.invoice import InMemoryInvoiceRepository
 from invoice_reader.services.exceptions import RollbackException
 from invoice_reader.services.invoice import InvoiceService
@@ -32,3 +40,49 @@ def test_rollback_add(
         )
     assert InMemoryInvoiceRepository().get(invoice_id=existing_invoice.id_) is None
     assert InMemoryFileRepository().get(storage_path=existing_file.storage_path) is None
+
+
+class FlakyInvoiceRepository(InMemoryInvoiceRepository):
+    """Fails batch inserts, and single inserts of the invoice numbered `INV-2`."""
+
+    def add_many(self, invoices: list[Invoice]) -> None:
+        raise Exception("Batch insert failed.")
+
+    def add(self, invoice: Invoice) -> None:
+        if invoice.data.invoice_number == "INV-2":
+            raise Exception("Insert failed.")
+        super().add(invoice)
+
+
+def test_rollback_import(file_repository: InMemoryFileRepository, file: File, invoice: Invoice):
+    invoice_imports = [
+        InvoiceImport(
+            filename=file.filename,
+            file=file.file,
+            client_id=invoice.client_id,
+            data=invoice.data.model_copy(update={"invoice_number": number}),
+        )
+        for number in ("INV-1", "INV-2")
+    ]
+    results = anyio.run(
+        partial(
+            InvoiceService.import_invoices,
+            user_id=invoice.user_id,
+            invoice_imports=invoice_imports,
+            file_repository=ThreadedFileRepository(file_repository),
+            invoice_repository=FlakyInvoiceRepository(),
+            exchange_rate_repository=InMemoryExchangeRateRepository(),
+            exchange_rate_service=TestExchangeRatesService(),
+            max_concurrency=2,
+            batch_size=10,
+        )
+    )
+    assert [result.status for result in results] == [ImportStatus.CREATED, ImportStatus.FAILED]
+    assert results[1].detail
+    created = InMemoryInvoiceRepository().get(invoice_id=results[0].invoice_id)  # type: ignore
+    assert created
+    # Only the file of the created invoice is kept
+    user_files = [
+        path for path in InMemoryFileRepository.storage if path.startswith(str(invoice.user_id))
+    ]
+    assert user_files == [created.storage_path]
@@ -9,3 +9,11 @@ export interface ParsedInvoice {
     };
     client_id?: string;
 }
+
+export interface ParseJob {
+    job_id: string;
+    status: "pending" | "running" | "succeeded" | "failed";
+    attempts: number;
+    result?: ParsedInvoice;
+    error?: string;
+}
@@ -4,7 +4,7 @@ import type {
     GetPagedInvoices,
     UpdateInvoice,
 } from "@/schemas/invoice";
-import type { ParsedInvoice } from "@/schemas/parser";
+import type { ParsedInvoice, ParseJob } from "@/schemas/parser";
 import { api } from "@/services/api/main";
 
 export const addInvoice = async (file: File, data: CreateInvoicePayload) => {
@@ -53,15 +53,28 @@ export const fetchInvoiceUrl = async (id: string): Promise<string> => {
     const response = await api.get("invoices/" + id + "/url");
     return response.data;
 };
+const PARSE_JOB_POLL_INTERVAL = 1000; // ms
+
+// The document is parsed in the background: the job is polled until done
 export const parseInvoice = async (file: File): Promise<ParsedInvoice> => {
     const formData = new FormData();
     formData.append("upload_file", file);
 
-    const response = await api.post("invoices/parse", formData, {
+    const response = await api.post("invoices/parse/jobs", formData, {
         headers: {
             "Content-Type": "multipart/form-data",
         },
     });
 
-    return response.data;
+    let job: ParseJob = response.data;
+    while (job.status === "pending" || job.status === "running") {
+        await new Promise((resolve) =>
+            setTimeout(resolve, PARSE_JOB_POLL_INTERVAL)
+        );
+        job = (await api.get("invoices/parse/jobs/" + job.job_id)).data;
+    }
+    if (job.status === "failed" || !job.result) {
+        throw new Error(job.error || "Failed to parse the invoice.");
+    }
+    return job.result;
 };